@@ -0,0 +1,228 @@
+# Hogwarts Analytics
+# --------------------------
+# This script computes reports over the whole student body with NumPy.
+# Features: Students, HogwartAdmin and Enrollments columns are loaded a primary-key range at a
+# time into compact arrays (one uint8 code per student for house and year, int32 course IDs),
+# and every report is a handful of vectorized operations (bincount, unique, cumsum) on those
+# arrays, so 10M students take a few seconds and one byte each in memory. NumPy is
+# optional; the rest of the application runs without it.
+
+import time
+from collections import namedtuple
+from datetime import date
+import database_design as d
+import logger as l
+import repository as r
+
+try:
+    import numpy as np
+except ImportError:                 # Analytics is optional; everything else needs only the standard library
+    np = None
+
+DEFAULT_CHUNK_SIZE = 100_000        # Primary-key values (IDs) covered by each chunk while loading a column
+DEFAULT_ROW_LIMIT = 25              # Rows shown for reports with one row per course
+
+YEAR_SLOTS = 8                      # Student code = house index * 8 + year (years are 1-7)
+
+# --- One report: a title, column headings and rows of plain Python values ---
+Report = namedtuple("Report", ["title", "columns", "rows"])
+
+
+# --- Column loading ---
+# --- Each chunk is one primary-key range that SQLite returns as a single comma-separated string, which
+# --- NumPy parses in C; that avoids building a Python tuple per row, the main cost at millions of rows ---
+
+def _house_code_sql():
+    # --- House -> index in VALID_HOUSES (unknown houses share the next index), computed by SQLite ---
+    cases = " ".join(f"WHEN '{house}' THEN {i}" for i, house in enumerate(d.VALID_HOUSES))
+    return f"(CASE House {cases} ELSE {len(d.VALID_HOUSES)} END)"
+
+def _id_sql(column):
+    # --- An ID column as a non-negative int32, or 0 (no course) for NULL, text such as a mistyped CourseID,
+    # --- negative or oversized values, which would otherwise stop the parse early or break np.bincount ---
+    return f"(CASE WHEN typeof({column}) = 'integer' AND {column} BETWEEN 0 AND 2147483647 THEN {column} ELSE 0 END)"
+
+# --- Column name -> (table, integer key column, SQL expression); order within a chunk doesn't matter ---
+# --- Every expression yields exactly one integer per row, so load_column can check the count ---
+COLUMNS = {
+    "Students":         ("Students", "WizardID",
+                         f"{_house_code_sql()} * {YEAR_SLOTS} + MIN(MAX(CAST(Year AS INTEGER), 0), {YEAR_SLOTS - 1})"),
+    "Teachers":         ("HogwartAdmin", "WizardID", _id_sql("CourseID")),
+    "Enrollments":      ("Enrollments", "WizardID", _id_sql("CourseID")),
+    "Enrollment Dates": ("Enrollments", "WizardID",                 # --- YYYYMM; cheaper than strftime per row ---
+                         "CAST(substr(EnrolledAt, 1, 4) AS INTEGER) * 100 + CAST(substr(EnrolledAt, 6, 2) AS INTEGER)"),
+}
+
+
+def load_column(table, key, expression, dtype, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    # --- Loads expression for every row of table into a NumPy array, chunk_size keys at a time ---
+    # --- progress(keys done, key range) is called after each chunk ---
+    con = d.get_connection()
+    low, high = con.execute(f"SELECT MIN({key}), MAX({key}) FROM {table};").fetchone()
+    if low is None:
+        return np.empty(0, dtype=dtype)
+    query = f"SELECT group_concat({expression}, ','), COUNT(*) FROM {table} WHERE {key} >= ? AND {key} < ?;"
+    parts = []
+    for start in range(low, high + 1, chunk_size):
+        text, count = con.execute(query, (start, start + chunk_size)).fetchone()
+        if text:
+            try:
+                values = np.fromstring(text, dtype=dtype, sep=",")
+            except ValueError:                  # --- NumPy 2 raises on a value it can't parse; older versions stop there ---
+                values = ()
+            if len(values) != count:
+                raise ValueError(f"Loaded {len(values):,} of {count:,} {table} rows with {key} in [{start}, {start + chunk_size}).")
+            parts.append(values)
+        if progress:
+            progress(min(start + chunk_size, high + 1) - low, high + 1 - low)
+    return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+
+class AnalyticsData:
+    # --- Loads each column on first use and keeps it for the other reports in the same run ---
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+        if np is None:
+            raise ValueError("Analytics needs NumPy (pip install numpy).")
+        self.chunk_size = chunk_size
+        self.progress = progress            # --- progress(label, done, total) while loading ---
+        self.columns = {}
+        self.load_seconds = 0.0
+
+    def _load(self, label, dtype):
+        if label not in self.columns:
+            started = time.perf_counter()
+            report = (lambda done, total: self.progress(label, done, total)) if self.progress else None
+            self.columns[label] = load_column(*COLUMNS[label], dtype, self.chunk_size, report)
+            self.load_seconds += time.perf_counter() - started
+        return self.columns[label]
+
+    def student_codes(self):
+        return self._load("Students", np.uint8)
+
+    def admin_courses(self):
+        return self._load("Teachers", np.int32)
+
+    def enrollment_courses(self):
+        return self._load("Enrollments", np.int32)
+
+    def enrollment_months(self):
+        return self._load("Enrollment Dates", np.int32)
+
+    def house_year_counts(self):
+        # --- (houses + 1) x YEAR_SLOTS matrix of student counts; the last row is for unknown houses ---
+        counts = np.bincount(self.student_codes(), minlength=(len(d.VALID_HOUSES) + 1) * YEAR_SLOTS)
+        return counts.reshape(-1, YEAR_SLOTS)
+
+
+# --- Reports: each takes an AnalyticsData and returns a Report ---
+
+def _percent(part, whole):
+    return round(100.0 * part / whole, 1) if whole else 0.0
+
+def house_year_report(data, limit=None):
+    counts = data.house_year_counts()
+    years = [int(year) for year in d.VALID_YEARS]
+    total = int(counts.sum())
+    houses = list(d.VALID_HOUSES) + (["Other"] if counts[-1].any() else [])
+    rows = []
+    for i, house in enumerate(houses):
+        row = counts[i, years]
+        rows.append([house] + [int(count) for count in row] + [int(row.sum()), _percent(row.sum(), total)])
+    column_totals = counts[:, years].sum(axis=0)
+    rows.append(["Total"] + [int(count) for count in column_totals] + [total, 100.0 if total else 0.0])
+    return Report("House / Year Distribution", ["House"] + [f"Year {year}" for year in years] + ["Total", "%"], rows)
+
+def cohort_report(data, limit=None):
+    # --- One row per year group; a cohort's entry year counts back from the current school year (September start) ---
+    counts = data.house_year_counts()
+    years = np.array([int(year) for year in d.VALID_YEARS])
+    by_year = counts[:, years].sum(axis=0)
+    largest = counts[:len(d.VALID_HOUSES), years].argmax(axis=0)
+    today = date.today()
+    school_year = today.year if today.month >= 9 else today.year - 1
+    first = int(by_year[0])
+    rows = [[int(year), str(school_year - int(year) + 1), int(size), _percent(size, by_year.sum()),
+             _percent(size, first), d.VALID_HOUSES[int(house)] if size else ""]
+            for year, size, house in zip(years, by_year, largest)]
+    return Report("Cohort Sizes", ["Year", "Entered", "Students", "%", "% of Year 1", "Largest House"], rows)
+
+def course_ratio_report(data, limit=DEFAULT_ROW_LIMIT):
+    # --- Teachers and enrolled students per course, busiest courses (most students per teacher) first ---
+    teachers = data.admin_courses()
+    students = data.enrollment_courses()
+    courses = r.courses.all()
+    size = max([course.CourseID for course in courses], default=0) + 1
+    # --- IDs past the last course (no such course) are counted with 0, so bincount stays course-sized ---
+    teacher_counts = np.bincount(np.where(teachers < size, teachers, 0), minlength=size)
+    student_counts = np.bincount(np.where(students < size, students, 0), minlength=size)
+    ratio = np.divide(student_counts, teacher_counts, out=np.full(size, np.inf), where=teacher_counts > 0)
+    ratio[(teacher_counts == 0) & (student_counts == 0)] = 0.0
+
+    ids = np.array([course.CourseID for course in courses], dtype=np.int64)
+    names = {course.CourseID: course.CourseName for course in courses}
+    order = ids[np.lexsort((-student_counts[ids], -ratio[ids]))]
+    rows = [[int(course_id), names[int(course_id)], int(teacher_counts[course_id]), int(student_counts[course_id]),
+             "no teacher" if np.isinf(ratio[course_id]) else round(float(ratio[course_id]), 1)]
+            for course_id in (order[:limit] if limit else order)]
+    return Report("Students per Teacher by Course", ["CourseID", "Course", "Teachers", "Students", "Students/Teacher"], rows)
+
+def enrollment_trend_report(data, limit=None):
+    # --- New enrollments per month with the running total ---
+    months, counts = np.unique(data.enrollment_months(), return_counts=True)
+    running = np.cumsum(counts)
+    rows = [[f"{month // 100:04d}-{month % 100:02d}" if month else "Unknown", int(count), int(total)]
+            for month, count, total in zip(months, counts, running)]
+    return Report("Enrollments by Month", ["Month", "Enrollments", "Running Total"], rows)
+
+
+# --- Report name -> function; also the choices for the CLI and GUI ---
+REPORTS = {
+    "houses":      house_year_report,
+    "cohorts":     cohort_report,
+    "courses":     course_ratio_report,
+    "enrollments": enrollment_trend_report,
+}
+
+def build_reports(names=None, chunk_size=DEFAULT_CHUNK_SIZE, limit=DEFAULT_ROW_LIMIT, progress=None):
+    # --- Runs the named reports (default: all) sharing one set of loaded columns; returns ([Report], AnalyticsData) ---
+    data = AnalyticsData(chunk_size, progress)
+    reports = []
+    for name in names or REPORTS:
+        if name not in REPORTS:
+            raise ValueError(f"Unknown report '{name}'. Choose from: {', '.join(REPORTS)}.")
+        reports.append(REPORTS[name](data, limit))
+    return reports, data
+
+
+def format_value(value):
+    return f"{value:,.1f}" if isinstance(value, float) else f"{value:,}" if isinstance(value, int) else str(value)
+
+def format_report(report):
+    # --- Plain-text table for the terminal ---
+    cells = [[format_value(value) for value in row] for row in report.rows]
+    widths = [max([len(column)] + [len(row[i]) for row in cells]) for i, column in enumerate(report.columns)]
+    lines = [report.title, "  ".join(column.rjust(width) for column, width in zip(report.columns, widths))]
+    lines.append("  ".join("-" * width for width in widths))
+    lines += ["  ".join(cell.rjust(width) for cell, width in zip(row, widths)) for row in cells]
+    if not report.rows:
+        lines.append("(no data)")
+    return "\n".join(lines)
+
+def run_reports(names=None, chunk_size=DEFAULT_CHUNK_SIZE, limit=DEFAULT_ROW_LIMIT):
+    # --- Terminal front end for build_reports: prints each report and the load time ---
+    started = time.perf_counter()
+    try:
+        reports, data = build_reports(names, chunk_size, limit)
+    except ValueError as e:
+        print(e)                            # --- Unknown report name or missing NumPy: the message says what to do ---
+        l.log_error("Failed to build analytics reports", details={"Reports": names, "Exception": str(e)})
+        return None
+    except Exception as e:
+        print("An error occurred while building the reports. Please check the hogwarts_error_log file for more information.")
+        l.log_error("Failed to build analytics reports", details={"Reports": names, "Exception": str(e)})
+        return None
+    for report in reports:
+        print(format_report(report) + "\n")
+    loaded = ", ".join(f"{len(values):,} {label.lower()}" for label, values in data.columns.items())
+    print(f"Loaded {loaded} in {data.load_seconds:.2f}s; reports took {time.perf_counter() - started:.2f}s in total.")
+    return reports
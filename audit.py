@@ -0,0 +1,204 @@
+# Hogwarts Audit Store
+# --------------------------
+# This script keeps logged events and errors in an indexed SQLite table next to the JSONL logs.
+# Features: Every batch the logger writes is also inserted here, an importer loads existing
+# (and legacy JSON) logs, and queries filter by time range, event type and detail fields using
+# the indexes, returning one page at a time with a token for the next page.
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+import logger as l
+
+AUDIT_DB = os.environ.get("HOGWARTS_AUDIT_DB", "hogwarts_audit.db")
+DEFAULT_PAGE_SIZE = 50
+IMPORT_CHUNK_SIZE = 5000            # Entries per executemany/commit when importing logs
+
+# --- Log file -> kind of entry stored in the Kind column ---
+LOG_KINDS = {l.LOG_FILE: "event", l.ERROR_LOG_FILE: "error"}
+
+create_audit_table = """CREATE TABLE IF NOT EXISTS AuditLog (
+    EntryID INTEGER PRIMARY KEY,
+    Timestamp TEXT NOT NULL,
+    Kind TEXT NOT NULL,
+    EventType TEXT NOT NULL,
+    Details TEXT NOT NULL,
+    EntryHash TEXT NOT NULL
+);"""
+
+# --- (Kind, Timestamp) serves time-range queries in page order (ties broken by EntryID, which every index ends
+# --- with). Timestamps are ISO 8601 with microseconds, so text order is time order. EntryHash is a hash of the
+# --- whole logged entry: a re-import skips entries already stored, while different entries that share a
+# --- timestamp and type are all kept ---
+audit_indexes = [
+    "CREATE INDEX IF NOT EXISTS idx_audit_kind_time ON AuditLog (Kind, Timestamp);",
+    "CREATE INDEX IF NOT EXISTS idx_audit_type_time ON AuditLog (Kind, EventType, Timestamp);",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_audit_entry ON AuditLog (EntryHash);",
+]
+
+insert_entry_query = "INSERT OR IGNORE INTO AuditLog (Timestamp, Kind, EventType, Details, EntryHash) VALUES (?, ?, ?, ?, ?);"
+
+_lock = threading.Lock()
+_connection = None
+
+
+# --- Connection ---
+
+def _connect():
+    # --- Opens the store on first use; callers hold _lock ---
+    global _connection
+    if _connection is None:
+        _connection = sqlite3.connect(AUDIT_DB, check_same_thread=False)
+        _connection.execute("PRAGMA journal_mode = WAL;")
+        _connection.execute("PRAGMA synchronous = NORMAL;")
+        _connection.execute(create_audit_table)
+        for ddl in audit_indexes:
+            _connection.execute(ddl)
+        _connection.commit()
+    return _connection
+
+def configure(db_path):
+    global AUDIT_DB
+    close()
+    AUDIT_DB = db_path
+
+def close():
+    global _connection
+    with _lock:
+        if _connection is not None:
+            _connection.close()
+            _connection = None
+
+
+# --- Writing ---
+
+def _type_field(kind):
+    return "Event_Type" if kind == "event" else "Error_Message"
+
+def entry_hash(kind, entry):
+    # --- Identifies a logged entry by its full content, as the logger wrote it ---
+    serialized = json.dumps([kind, entry], sort_keys=True, default=str)
+    return hashlib.blake2b(serialized.encode("utf-8"), digest_size=16).hexdigest()
+
+def _params(kind, entry):
+    # --- (Timestamp, Kind, EventType, Details, EntryHash) for one log entry ---
+    event_type = entry.get(_type_field(kind))
+    return (entry.get("Timestamp") or datetime.now().isoformat(), kind, event_type or "",
+            json.dumps(entry.get("Details") or {}), entry_hash(kind, entry))
+
+def store(kind, entries):
+    # --- Inserts log entries in one transaction; returns the number new to the store ---
+    with _lock:
+        con = _connect()
+        before = con.total_changes
+        try:
+            con.executemany(insert_entry_query, (_params(kind, entry) for entry in entries))
+            con.commit()
+        except Exception:
+            con.rollback()
+            raise
+        return con.total_changes - before
+
+def _sink(path, entries):
+    kind = LOG_KINDS.get(path)
+    if kind is not None:
+        store(kind, entries)
+
+def enable():
+    # --- Mirrors every event and error the logger writes into the store from now on ---
+    # --- Set HOGWARTS_AUDIT=0 to keep only the JSONL files ---
+    if os.environ.get("HOGWARTS_AUDIT", "1") != "0":
+        l.add_sink(_sink)
+
+def disable():
+    l.remove_sink(_sink)
+
+def import_logs():
+    # --- Loads the JSONL logs (every rotated segment, and legacy JSON arrays) into the store ---
+    # --- Entries already stored are skipped, so it is safe to run again; returns {kind: entries added} ---
+    added = {}
+    for path, kind in LOG_KINDS.items():
+        added[kind] = 0
+        chunk = []
+        for entry in l.read_log(path):
+            chunk.append(entry)
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                added[kind] += store(kind, chunk)
+                chunk.clear()
+        if chunk:
+            added[kind] += store(kind, chunk)
+    return added
+
+
+# --- Querying ---
+
+def parse_time(value):
+    # --- ISO date/datetime, or a relative age like "7d", "12h" or "30m"; returns an ISO string ---
+    if value is None:
+        return None
+    match = re.fullmatch(r"(\d+)([dhm])", value.strip())
+    if match:
+        amount, unit = int(match.group(1)), match.group(2)
+        delta = {"d": timedelta(days=amount), "h": timedelta(hours=amount), "m": timedelta(minutes=amount)}[unit]
+        return (datetime.now() - delta).isoformat()
+    return datetime.fromisoformat(value.strip()).isoformat()
+
+def query(kind="event", event_type=None, since=None, until=None, details=None, limit=DEFAULT_PAGE_SIZE, page_token=None):
+    # --- Newest first. details maps a detail path to a value, e.g. {"Filter.House": "Ravenclaw"} ---
+    # --- Returns (entries, token for the next page or None); pass the token back to continue ---
+    where = ["Kind = ?"]
+    params = [kind]
+    if event_type:
+        where.append("EventType = ?")
+        params.append(event_type)
+    if since:
+        where.append("Timestamp >= ?")
+        params.append(since)
+    if until:
+        where.append("Timestamp < ?")
+        params.append(until)
+    for key, value in (details or {}).items():
+        where.append("json_extract(Details, ?) = ?")        # --- Checked only on rows the indexes already narrowed to ---
+        params += ["$." + key, value]
+    if page_token:
+        # --- Keyset paging: continue below the last (Timestamp, EntryID) shown, which is unique ---
+        stamp, last_id = page_token.rsplit("|", 1)
+        where.append("(Timestamp, EntryID) < (?, ?)")
+        params += [stamp, int(last_id)]
+
+    sql = (f"SELECT Timestamp, EventType, Details, EntryID FROM AuditLog WHERE {' AND '.join(where)} "
+           f"ORDER BY Timestamp DESC, EntryID DESC LIMIT ?;")
+    with _lock:
+        rows = _connect().execute(sql, params + [limit + 1]).fetchall()
+    entries = [{"Timestamp": stamp, _type_field(kind): event_type, "Details": json.loads(details_json)}
+               for stamp, event_type, details_json, _ in rows[:limit]]
+    next_token = f"{rows[limit - 1][0]}|{rows[limit - 1][3]}" if len(rows) > limit else None
+    return entries, next_token
+
+def event_types(kind="event"):
+    # --- Distinct event types with their counts, read from the (Kind, EventType, Timestamp) index ---
+    with _lock:
+        return _connect().execute("SELECT EventType, COUNT(*) FROM AuditLog WHERE Kind = ? GROUP BY EventType ORDER BY EventType;",
+                                  (kind,)).fetchall()
+
+
+def run_query(kind="event", event_type=None, since=None, until=None, details=None, limit=DEFAULT_PAGE_SIZE, page_token=None):
+    # --- Terminal front end for query: prints one page and how to get the next ---
+    try:
+        entries, next_token = query(kind, event_type, parse_time(since), parse_time(until), details, limit, page_token)
+    except Exception as e:
+        print("An error occurred while querying the audit store. Please check the hogwarts_error_log file for more information.")
+        l.log_error("Failed to query the audit store", details={"Exception": str(e)})
+        return None
+    if not entries:
+        print("No matching audit entries.")
+    for entry in entries:
+        label = entry.get("Event_Type", entry.get("Error_Message"))
+        print(f"{entry['Timestamp']}  {label}  {json.dumps(entry['Details'])}")
+    if next_token:
+        print(f"More entries: add --page '{next_token}'")
+    return next_token
@@ -0,0 +1,216 @@
+# Hogwarts Backup
+# --------------------------
+# This script takes consistent snapshots of the live database with SQLite's online backup API.
+# Features: Pages are copied PAGES_PER_STEP at a time with a short sleep between steps, so GUI and
+# CLI users keep reading and writing while a backup runs. Snapshots can be gzip-compressed, are
+# checked with PRAGMA integrity_check before they are kept, and only the newest KEEP_SNAPSHOTS
+# are retained in the backup directory.
+
+import glob
+import gzip
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+import database_design as d
+import logger as l
+
+BACKUP_DIR = os.environ.get("HOGWARTS_BACKUP_DIR", "backups")
+PAGES_PER_STEP = 1024               # Pages copied per step (4 MiB with the default 4 KiB page size)
+STEP_SLEEP_MS = 5                   # Pause between steps, when other connections may take the database
+KEEP_SNAPSHOTS = 7                  # Newest snapshots kept by retention (0 keeps all of them)
+MAX_RESTARTS = 3                    # Stepped copies restarted by concurrent writes before copying in one step
+GZIP_LEVEL = 6
+
+SNAPSHOT_PREFIX = "Hogwarts-"
+SNAPSHOT_STAMP = "%Y%m%d-%H%M%S-%f"
+
+
+class BackupReport:
+    # --- Summary of one backup run ---
+    def __init__(self, path, compressed):
+        self.path = path
+        self.compressed = compressed
+        self.pages = 0
+        self.steps = 0
+        self.restarts = 0
+        self.bytes = 0
+        self.verified = None
+        self.removed = []
+        self.copy_seconds = 0.0
+        self.verify_seconds = 0.0
+        self.compress_seconds = 0.0
+        self.seconds = 0.0
+
+    def as_dict(self):
+        return {"File": self.path, "Gzip": self.compressed, "Pages": self.pages, "Steps": self.steps,
+                "Restarts": self.restarts, "Bytes": self.bytes, "Verified": self.verified,
+                "Removed": len(self.removed), "Copy Seconds": round(self.copy_seconds, 3),
+                "Verify Seconds": round(self.verify_seconds, 3), "Compress Seconds": round(self.compress_seconds, 3),
+                "Seconds": round(self.seconds, 3)}
+
+
+# --- Snapshots on disk ---
+
+def snapshot_path(directory, compressed, now=None):
+    stamp = (now or datetime.now()).strftime(SNAPSHOT_STAMP)
+    return os.path.join(directory, f"{SNAPSHOT_PREFIX}{stamp}.db" + (".gz" if compressed else ""))
+
+def list_snapshots(directory=None):
+    # --- Snapshot files in the directory, oldest first (the timestamped names sort in time order) ---
+    directory = directory or BACKUP_DIR
+    pattern = os.path.join(glob.escape(directory), SNAPSHOT_PREFIX + "*.db")
+    return sorted(glob.glob(pattern) + glob.glob(pattern + ".gz"), key=os.path.basename)
+
+def apply_retention(directory=None, keep=KEEP_SNAPSHOTS):
+    # --- Deletes all but the newest `keep` snapshots; returns the deleted paths ---
+    if not keep:
+        return []
+    removed = list_snapshots(directory)[:-keep]
+    for path in removed:
+        os.remove(path)
+    return removed
+
+
+# --- Copy and verify ---
+
+class _Restarted(Exception):
+    pass
+
+def _copy(destination, pages_per_step, step_sleep_ms, report):
+    # --- Online backup into destination, sleeping between steps so the source is never held for long ---
+    # --- A write from another connection restarts a stepped copy; after MAX_RESTARTS it is finished in one step ---
+    # --- mode=rw: a missing or mistyped DB_PATH fails instead of creating (and backing up) an empty database ---
+    source = sqlite3.connect(f"file:{d.DB_PATH}?mode=rw", uri=True, timeout=d.PRAGMAS.get("busy_timeout", 5000) / 1000)
+    target = sqlite3.connect(destination)
+    remaining_before = None
+
+    def progress(status, remaining, total):
+        nonlocal remaining_before
+        report.steps += 1
+        report.pages = total
+        if remaining_before is not None and remaining > remaining_before:
+            report.restarts += 1
+            if report.restarts > MAX_RESTARTS:
+                raise _Restarted()
+        remaining_before = remaining
+        if remaining and step_sleep_ms:
+            time.sleep(step_sleep_ms / 1000)
+
+    try:
+        try:
+            source.backup(target, pages=pages_per_step, progress=progress)
+        except _Restarted:
+            source.backup(target, pages=-1)                 # --- One step: consistent, but holds the read lock throughout ---
+        target.execute("PRAGMA journal_mode = DELETE;")     # --- Self-contained file with no -wal companion ---
+    finally:
+        target.close()
+        source.close()
+
+def integrity_check(path):
+    # --- Returns the problems PRAGMA integrity_check reports for a database file ([] if it is sound) ---
+    con = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        rows = [row[0] for row in con.execute("PRAGMA integrity_check;")]
+    finally:
+        con.close()
+    return [] if rows == ["ok"] else rows
+
+def verify_snapshot(path):
+    # --- Checks a snapshot on disk; gzip snapshots are decompressed to a temporary file first ---
+    if not path.endswith(".gz"):
+        return integrity_check(path)
+    handle, plain = tempfile.mkstemp(suffix=".db", dir=os.path.dirname(path) or None)
+    try:
+        with gzip.open(path, 'rb') as src, os.fdopen(handle, 'wb') as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        return integrity_check(plain)
+    finally:
+        os.remove(plain)
+
+
+def backup_database(directory=None, compress=False, verify=True, keep=KEEP_SNAPSHOTS,
+                    pages_per_step=PAGES_PER_STEP, step_sleep_ms=STEP_SLEEP_MS):
+    # --- Snapshots the current database into directory; returns a BackupReport ---
+    # --- A snapshot that fails verification is deleted and ValueError is raised ---
+    if not os.path.exists(d.DB_PATH):
+        raise FileNotFoundError(f"Database {d.DB_PATH} does not exist; nothing to back up.")
+    directory = directory or BACKUP_DIR
+    os.makedirs(directory, exist_ok=True)
+    path = snapshot_path(directory, compress)
+    plain = path[:-3] if compress else path
+    tmp_path = plain + ".tmp"              # --- A failed backup never leaves a partial snapshot under a real name ---
+    report = BackupReport(path, compress)
+    started = time.perf_counter()
+    try:
+        _copy(tmp_path, pages_per_step, step_sleep_ms, report)
+        report.copy_seconds = time.perf_counter() - started
+
+        if verify:
+            mark = time.perf_counter()
+            problems = integrity_check(tmp_path)
+            report.verify_seconds = time.perf_counter() - mark
+            report.verified = not problems
+            if problems:
+                raise ValueError(f"Snapshot failed integrity_check: {'; '.join(problems[:5])}")
+
+        if compress:
+            mark = time.perf_counter()
+            with open(tmp_path, 'rb') as src, gzip.open(path + ".tmp", 'wb', compresslevel=GZIP_LEVEL) as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+            os.remove(tmp_path)
+            os.replace(path + ".tmp", path)
+            report.compress_seconds = time.perf_counter() - mark
+        else:
+            os.replace(tmp_path, path)
+    except BaseException:
+        for leftover in (tmp_path, path + ".tmp"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+        raise
+    report.bytes = os.path.getsize(path)
+    report.removed = apply_retention(directory, keep)
+    report.seconds = time.perf_counter() - started
+
+    l.log_event("Backup!", report.as_dict())
+    return report
+
+
+def run_backup(directory=None, compress=False, verify=True, keep=KEEP_SNAPSHOTS,
+               pages_per_step=PAGES_PER_STEP, step_sleep_ms=STEP_SLEEP_MS):
+    # --- Terminal front end for backup_database: prints a summary ---
+    try:
+        report = backup_database(directory, compress, verify, keep, pages_per_step, step_sleep_ms)
+    except FileNotFoundError as e:
+        print(e)
+        l.log_error("Failed to back up the database", details={"Directory": directory or BACKUP_DIR, "Exception": str(e)})
+        return None
+    except Exception as e:
+        print("An error occurred while backing up the database. Please check the hogwarts_error_log file for more information.")
+        l.log_error("Failed to back up the database", details={"Directory": directory or BACKUP_DIR, "Exception": str(e)})
+        return None
+
+    check = "verified" if report.verified else "not verified"
+    print(f"Backed up {report.pages:,} pages to {report.path} ({report.bytes:,} bytes, {check}) in {report.seconds:.2f}s "
+          f"({report.steps} steps{f', {report.restarts} restarts' if report.restarts else ''}).")
+    if report.removed:
+        print(f"Removed {len(report.removed)} old snapshot(s); keeping the newest {keep}.")
+    return report
+
+def run_verify(path):
+    # --- Terminal front end for verify_snapshot ---
+    try:
+        problems = verify_snapshot(path)
+    except Exception as e:
+        print("An error occurred while verifying the snapshot. Please check the hogwarts_error_log file for more information.")
+        l.log_error("Failed to verify a snapshot", details={"File": path, "Exception": str(e)})
+        return False
+    if problems:
+        print(f"{path} is damaged:")
+        for problem in problems:
+            print(f"  {problem}")
+        return False
+    print(f"{path} passed integrity_check.")
+    return True
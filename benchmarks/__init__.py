@@ -0,0 +1,4 @@
+# Hogwarts Benchmarks
+# --------------------------
+# Headless timing suite for the Hogwarts Management System (no Tk display needed).
+# Run from the repository root: python -m benchmarks.run --scale 10k --out bench.json
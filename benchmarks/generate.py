@@ -0,0 +1,94 @@
+# Hogwarts Benchmarks - Synthetic Data
+# --------------------------
+# This script fills Students, Courses, and HogwartAdmin with deterministic synthetic rows.
+# Features: Named scales (10k / 1m / 10m students), a fixed seed so every run produces the
+# same data, and streaming generation so memory stays flat at any scale.
+#
+# Usage (from the repository root): python -m benchmarks.generate bench.db --scale 1m
+
+import argparse
+import random
+import time
+import database_design as d
+import repository as r
+
+# --- Student counts per named scale; courses and staff scale with them ---
+SCALES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+DEFAULT_SEED = 312
+
+FIRST_NAMES = ["Harry", "Hermione", "Ron", "Ginny", "Neville", "Luna", "Draco", "Cho", "Cedric", "Seamus",
+               "Dean", "Lavender", "Parvati", "Padma", "Fred", "George", "Percy", "Oliver", "Katie", "Angelina",
+               "Hannah", "Ernie", "Justin", "Susan", "Terry", "Michael", "Anthony", "Marietta", "Blaise", "Pansy",
+               "Vincent", "Gregory", "Theodore", "Millicent", "Colin", "Dennis", "Romilda", "Cormac", "Lee", "Alicia"]
+LAST_NAMES = ["Potter", "Granger", "Weasley", "Longbottom", "Lovegood", "Malfoy", "Chang", "Diggory", "Finnigan",
+              "Thomas", "Brown", "Patil", "Wood", "Bell", "Johnson", "Abbott", "Macmillan", "Finch-Fletchley",
+              "Bones", "Boot", "Corner", "Goldstein", "Edgecombe", "Zabini", "Parkinson", "Crabbe", "Goyle", "Nott",
+              "Bulstrode", "Creevey", "Vane", "McLaggen", "Jordan", "Spinnet", "Jones", "Smith", "Fawcett", "Davies"]
+SUBJECTS = ["Charms", "Potions", "Transfiguration", "Herbology", "Astronomy", "Runes", "Arithmancy", "Divination",
+            "Alchemy", "Flying", "History", "Creatures", "Defense", "Apparition", "Music", "Studies"]
+LEVELS = ["Beginning", "Intermediate", "Advanced", "Applied", "Theoretical", "Practical", "Remedial", "Honours"]
+
+
+def parse_scale(scale):
+    # --- Accepts a named scale ("10k") or a plain number of students ---
+    if isinstance(scale, int):
+        return scale
+    key = str(scale).lower().replace("_", "")
+    if key in SCALES:
+        return SCALES[key]
+    return int(key)
+
+def course_count(students):
+    return max(len(d.course_data), students // 1000)
+
+def admin_count(students):
+    return max(len(d.admin_data), students // 100)
+
+def student_name(rng):
+    # --- Most names repeat across the school, like real rosters; the suffix keeps some unique ---
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.randrange(10_000)}"
+
+def iter_students(count, seed=DEFAULT_SEED):
+    # --- Yields (Name, House, Year) tuples ---
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield (student_name(rng), rng.choice(d.VALID_HOUSES), rng.choice(d.VALID_YEARS))
+
+def iter_courses(count, seed=DEFAULT_SEED):
+    rng = random.Random(seed + 1)
+    for i in range(count):
+        yield (f"{rng.choice(LEVELS)} {rng.choice(SUBJECTS)} {i}",)
+
+def iter_admins(count, courses, seed=DEFAULT_SEED):
+    rng = random.Random(seed + 2)
+    for _ in range(count):
+        yield (f"Professor {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", rng.randint(1, courses))
+
+def populate(scale, seed=DEFAULT_SEED, chunk_size=r.DEFAULT_CHUNK_SIZE):
+    # --- Fills the configured database; returns {table: (rows inserted, seconds)} ---
+    students = parse_scale(scale)
+    courses = course_count(students)
+    admins = admin_count(students)
+    timings = {}
+    for table, repository, rows in (
+        ("Courses", r.courses, iter_courses(courses - len(d.course_data), seed)),
+        ("HogwartAdmin", r.admins, iter_admins(admins - len(d.admin_data), courses, seed)),
+        ("Students", r.students, iter_students(students, seed)),
+    ):
+        started = time.perf_counter()
+        inserted = repository.add_many(rows, chunk_size=chunk_size, log=False)
+        timings[table] = (inserted, time.perf_counter() - started)
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fill a Hogwarts database with synthetic data.")
+    parser.add_argument("db", help="Database file to fill (created if missing)")
+    parser.add_argument("--scale", default="10k", help=f"Students: one of {', '.join(SCALES)} or a number")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+
+    d.configure(db_path=args.db)
+    for table, (inserted, seconds) in populate(args.scale, args.seed).items():
+        print(f"{table}: {inserted} rows in {seconds:.2f}s")
+    d.close_all()
@@ -0,0 +1,177 @@
+# Hogwarts Benchmarks - HTTP Load Generator
+# --------------------------
+# This script drives the HTTP service (service.py) with concurrent keep-alive clients and emits JSON.
+# Features: A configurable read/write mix (keyset student pages, lookups, search, adds), a fixed duration,
+# and per-endpoint requests/second with p50/p95/p99 latency. With --spawn it starts its own service
+# against a synthetic database in a scratch directory.
+#
+# Usage (from the repository root):
+#   python -m benchmarks.load --spawn --scale 100k --connections 32 --duration 10
+#   python -m benchmarks.load --port 8312 --write-ratio 0.05
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import database_design as d
+from benchmarks import generate
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(ordered, fraction):
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def summarize(latencies, seconds):
+    ordered = sorted(latencies)
+    ms = lambda value: round(value * 1000, 3) if value is not None else None
+    return {"requests": len(ordered), "rps": round(len(ordered) / seconds, 1) if seconds else None,
+            "p50_ms": ms(percentile(ordered, 0.50)), "p95_ms": ms(percentile(ordered, 0.95)),
+            "p99_ms": ms(percentile(ordered, 0.99)), "max_ms": ms(ordered[-1] if ordered else None)}
+
+
+# --- Request mix: (label, method, path, body) chosen per request ---
+
+def next_request(rng, args, state):
+    if rng.random() < args.write_ratio:
+        name, house, year = next(generate.iter_students(1, rng.randrange(1 << 30)))
+        return "add_student", "POST", "/students", json.dumps({"Name": name, "House": house, "Year": year})
+    roll = rng.random()
+    if roll < 0.4:
+        # --- Each client pages through one house's students, following the "next" tokens ---
+        house = state.setdefault("house", rng.choice(d.VALID_HOUSES))
+        page = f"&page={state['next']}" if state.get("next") else ""
+        return "list_students", "GET", f"/students?house={house}&limit=50{page}", None
+    if roll < 0.7:
+        return "get_student", "GET", f"/students/{rng.randint(1, args.max_id)}", None
+    if roll < 0.9:
+        return "search", "GET", f"/search?q={rng.choice(generate.FIRST_NAMES)[:rng.randint(2, 5)]}&limit=20", None
+    return "list_courses", "GET", "/courses?limit=50", None
+
+
+async def client(host, port, rng, args, deadline, results):
+    # --- One keep-alive connection sending requests back to back until the deadline ---
+    reader, writer = await asyncio.open_connection(host, port)
+    state = {}
+    try:
+        while time.perf_counter() < deadline:
+            label, method, path, body = next_request(rng, args, state)
+            data = body.encode("utf-8") if body else b""
+            started = time.perf_counter()
+            writer.write(f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(data)}\r\n\r\n".encode("latin-1") + data)
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            payload = await reader.readexactly(length)
+            results.setdefault(label, []).append(time.perf_counter() - started)
+            if label == "list_students" and status == 200:
+                state["next"] = json.loads(payload).get("next")
+            if status >= 500:
+                results.setdefault("errors", []).append(status)
+    finally:
+        writer.close()
+
+async def drive(host, port, args):
+    results = {}
+    deadline = time.perf_counter() + args.duration
+    started = time.perf_counter()
+    await asyncio.gather(*(client(host, port, random.Random(args.seed + i), args, deadline, results)
+                           for i in range(args.connections)))
+    return results, time.perf_counter() - started
+
+
+# --- Spawned service ---
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def wait_for_port(host, port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Service did not start on {host}:{port}.")
+
+
+def run(args):
+    # --- Runs the load against a running service, or a spawned one; returns the results document ---
+    scratch = process = None
+    host, port = args.host, args.port
+    original_dir = os.getcwd()
+    if args.spawn:
+        scratch = tempfile.TemporaryDirectory(prefix="hogwarts-load-")
+        os.chdir(scratch.name)                  # --- Keeps the run's logs away from the real ones ---
+        db_path = os.path.join(scratch.name, "load.db")
+        d.configure(db_path=db_path)
+        generate.populate(args.scale, args.seed)
+        d.close_all()
+        port = free_port()
+        process = subprocess.Popen([sys.executable, os.path.join(REPO_ROOT, "main.py"), "--db", db_path, "serve",
+                                    "--port", str(port), "--read-workers", str(args.read_workers)],
+                                   cwd=scratch.name, stdout=subprocess.DEVNULL)
+        args.max_id = generate.parse_scale(args.scale)
+    try:
+        wait_for_port(host, port)
+        results, seconds = asyncio.run(drive(host, port, args))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        os.chdir(original_dir)
+        if scratch is not None:
+            scratch.cleanup()
+
+    errors = len(results.pop("errors", []))
+    every = [latency for latencies in results.values() for latency in latencies]
+    return {
+        "meta": {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "connections": args.connections,
+                 "duration_s": args.duration, "write_ratio": args.write_ratio, "read_workers": args.read_workers,
+                 "scale": args.scale if args.spawn else None, "seed": args.seed},
+        "total": {**summarize(every, seconds), "server_errors": errors},
+        "endpoints": {label: summarize(latencies, seconds) for label, latencies in sorted(results.items())},
+    }
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Generate HTTP load against the Hogwarts service and report rps/p99.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8312)
+    parser.add_argument("--spawn", action="store_true", help="Start a service on a synthetic database first")
+    parser.add_argument("--scale", default="10k", help="Students in the spawned database (see benchmarks.generate)")
+    parser.add_argument("--read-workers", type=int, default=4, help="Read workers for the spawned service")
+    parser.add_argument("--connections", type=int, default=16, help="Concurrent keep-alive clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--write-ratio", type=float, default=0.1, help="Fraction of requests that add a student")
+    parser.add_argument("--max-id", type=int, default=10_000, help="Highest WizardID used for lookups")
+    parser.add_argument("--seed", type=int, default=generate.DEFAULT_SEED)
+    parser.add_argument("--out", help="Write JSON here instead of stdout")
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    output = json.dumps(run(args), indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
@@ -0,0 +1,253 @@
+# Hogwarts Benchmarks - Runner
+# --------------------------
+# This script times every core operation against a synthetic database and emits JSON.
+# Features: Insert throughput (batched and one commit per row), full listing, year/house filters,
+# name deletes, logger.log_event cost against log size, cold-start time checked against a
+# budget, online backup (copy, verify and gzip) time, and NumPy report time. Runs headless in a
+# scratch directory.
+#
+# Usage (from the repository root):
+#   python -m benchmarks.run --scale 10k --out bench.json
+#   python -m benchmarks.run --scale 1m --only insert,listing
+
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import backup
+import database_design as d
+import logger as l
+import repository as r
+from benchmarks import generate
+
+SUITES = []                 # (name, function) in run order; filled by @suite
+STARTUP_BUDGET_MS = 300     # Cold start of a CLI command against an initialized database
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def suite(function):
+    SUITES.append((function.__name__.replace("bench_", ""), function))
+    return function
+
+def timed(function, repeat=5):
+    # --- Runs function repeat times; returns (last result, [seconds per run]) ---
+    times = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - started)
+    return result, times
+
+def summarize(times):
+    ordered = sorted(times)
+    return {"runs": len(times), "min_s": round(ordered[0], 6), "median_s": round(statistics.median(ordered), 6),
+            "max_s": round(ordered[-1], 6)}
+
+def consume(rows):
+    # --- Drains an iterator; returns (row count, seconds until the first row) ---
+    started = time.perf_counter()
+    first = None
+    count = 0
+    for _ in rows:
+        if first is None:
+            first = time.perf_counter() - started
+        count += 1
+    return count, first or 0.0
+
+
+# --- Suites: each takes the parsed args and returns a JSON-serialisable dict ---
+
+@suite
+def bench_insert(args):
+    # --- Fills the database at the requested scale, then times single-row commits ---
+    timings = generate.populate(args.scale, args.seed)
+    result = {table: {"rows": rows, "seconds": round(seconds, 3), "rows_per_s": round(rows / seconds) if seconds else None}
+              for table, (rows, seconds) in timings.items()}
+
+    single = list(generate.iter_students(args.single_inserts, args.seed + 99))
+    started = time.perf_counter()
+    for name, house, year in single:
+        r.students.add(name, house, year, log=False)
+    seconds = time.perf_counter() - started
+    result["single_row_commits"] = {"rows": len(single), "seconds": round(seconds, 3),
+                                    "rows_per_s": round(len(single) / seconds) if seconds else None}
+    return result
+
+@suite
+def bench_listing(args):
+    (count, first), times = timed(lambda: consume(d.iter_students()), args.repeat)
+    return {"rows": count, "time_to_first_row_s": round(first, 6), **summarize(times),
+            "rows_per_s": round(count / statistics.median(times)) if count else None}
+
+@suite
+def bench_filters(args):
+    result = {}
+    for label, kwargs in (("year", {"year": "5"}), ("house", {"house": "Ravenclaw"}),
+                          ("house_year", {"house": "Ravenclaw", "year": "5"})):
+        (count, first), times = timed(lambda: consume(d.iter_students(**kwargs)), args.repeat)
+        result[label] = {"rows": count, "time_to_first_row_s": round(first, 6), **summarize(times)}
+    return result
+
+@suite
+def bench_deletes(args):
+    # --- Deletes existing names one at a time (each is a lookup plus a commit) ---
+    rng = random.Random(args.seed)
+    total = d.student_total()
+    names = []
+    for _ in range(args.deletes):
+        student = r.students.get(rng.randint(1, max(total, 1)))
+        if student:
+            names.append(student.Name)
+    times = []
+    deleted = 0
+    for name in names:
+        started = time.perf_counter()
+        deleted += r.students.delete(name, log=False)
+        times.append(time.perf_counter() - started)
+    return {"names": len(names), "rows_deleted": deleted, **(summarize(times) if times else {})}
+
+@suite
+def bench_log_event(args):
+    # --- Per-call cost of logger.log_event with increasingly large existing logs ---
+    result = {}
+    entry = json.dumps({"Timestamp": "2026-01-01T00:00:00", "Event_Type": "Student Added!",
+                        "Details": {"Name": "Filler", "House": "Hufflepuff", "Year": "1"}}) + "\n"
+    for size in args.log_sizes:
+        for path in [l.LOG_FILE] + l.rotated_files(l.LOG_FILE):
+            if os.path.exists(path):
+                os.remove(path)
+        with open(l.LOG_FILE, "w", encoding="utf-8") as f:
+            f.writelines(entry for _ in range(size))
+        l._segment_started.pop(l.LOG_FILE, None)
+        started = time.perf_counter()
+        for i in range(args.log_calls):
+            l.log_event("Student Added!", {"Name": f"Bench {i}", "House": "Gryffindor", "Year": "1"})
+        seconds = time.perf_counter() - started
+        result[str(size)] = {"existing_entries": size, "calls": args.log_calls,
+                             "us_per_call": round(seconds / args.log_calls * 1e6, 2)}
+    return result
+
+@suite
+def bench_startup(args):
+    # --- Wall time of fresh interpreters: importing main, and a full `stats` command ---
+    env = dict(os.environ, HOGWARTS_DB=d.DB_PATH, PYTHONPATH=REPO_ROOT)
+    d.close_all()
+    probes = {
+        "import_main": [sys.executable, "-c", "import sys, main; print('tkinter' in sys.modules)"],
+        "stats_command": [sys.executable, os.path.join(REPO_ROOT, "main.py"), "stats"],
+    }
+    result = {}
+    outputs = {}
+    for label, command in probes.items():
+        times = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            outputs[label] = subprocess.run(command, capture_output=True, text=True, env=env, check=True).stdout
+            times.append(time.perf_counter() - started)
+        result[label] = summarize(times)
+    result["tkinter_imported"] = outputs["import_main"].strip() == "True"
+    result["budget_ms"] = STARTUP_BUDGET_MS
+    result["within_budget"] = result["stats_command"]["median_s"] * 1000 <= STARTUP_BUDGET_MS
+    return result
+
+@suite
+def bench_backup(args):
+    # --- Online backup of the benchmark database: stepped copy, integrity_check and gzip, timed separately ---
+    directory = os.path.join(os.getcwd(), "bench-backups")
+    result = {}
+    for label, compress in (("plain", False), ("gzip", True)):
+        reports = [backup.backup_database(directory, compress=compress, keep=1) for _ in range(args.repeat)]
+        last = reports[-1]
+        result[label] = {"pages": last.pages, "steps": last.steps, "bytes": last.bytes, "verified": last.verified,
+                         "copy": summarize([report.copy_seconds for report in reports]),
+                         "verify": summarize([report.verify_seconds for report in reports]),
+                         "total": summarize([report.seconds for report in reports])}
+        if compress:
+            result[label]["compress"] = summarize([report.compress_seconds for report in reports])
+    return result
+
+
+@suite
+def bench_analytics(args):
+    # --- Column load time and per-report time for the NumPy reports (skipped without NumPy) ---
+    import analytics
+    if analytics.np is None:
+        return {"skipped": "numpy is not installed"}
+    data = analytics.AnalyticsData()
+    result = {}
+    for name, report in analytics.REPORTS.items():
+        started = time.perf_counter()
+        report(data)
+        result[name] = {"seconds": round(time.perf_counter() - started, 6)}
+    result["loaded"] = {label: len(values) for label, values in data.columns.items()}
+    result["load_seconds"] = round(data.load_seconds, 3)
+    return result
+
+
+# --- Runner ---
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              cwd=REPO_ROOT).stdout.strip() or None
+    except OSError:
+        return None
+
+def run(args):
+    # --- Runs the selected suites in a scratch directory; returns the results document ---
+    selected = [(name, function) for name, function in SUITES if not args.only or name in args.only]
+    document = {
+        "meta": {"commit": git_commit(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                 "python": platform.python_version(), "sqlite": sqlite3.sqlite_version,
+                 "platform": platform.platform(), "scale": args.scale,
+                 "students": generate.parse_scale(args.scale), "seed": args.seed},
+        "results": {},
+    }
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="hogwarts-bench-", dir=args.workdir) as scratch:
+        os.chdir(scratch)                       # --- Keeps the benchmark's logs away from the real ones ---
+        try:
+            d.configure(db_path=os.path.join(scratch, "bench.db"))
+            if not any(name == "insert" for name, _ in selected):
+                generate.populate(args.scale, args.seed)
+            for name, function in selected:
+                print(f"Running {name}...", file=sys.stderr)
+                document["results"][name] = function(args)
+        finally:
+            d.close_all()
+            os.chdir(original_dir)
+    return document
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Time Hogwarts operations and emit JSON results.")
+    parser.add_argument("--scale", default="10k", help=f"Students: one of {', '.join(generate.SCALES)} or a number")
+    parser.add_argument("--seed", type=int, default=generate.DEFAULT_SEED)
+    parser.add_argument("--only", type=lambda value: value.split(","), help="Comma-separated suites: " + ", ".join(name for name, _ in SUITES))
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per read benchmark")
+    parser.add_argument("--single-inserts", type=int, default=1000, help="Rows inserted with one commit each")
+    parser.add_argument("--deletes", type=int, default=200, help="Names deleted one at a time")
+    parser.add_argument("--log-sizes", type=lambda value: [int(v) for v in value.split(",")], default=[0, 10_000, 100_000],
+                        help="Existing log sizes (entries) for the log_event benchmark")
+    parser.add_argument("--log-calls", type=int, default=2000, help="log_event calls per log size")
+    parser.add_argument("--workdir", help="Directory for the scratch database (default: system temp)")
+    parser.add_argument("--out", help="Write JSON here instead of stdout")
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    document = run(args)
+    output = json.dumps(document, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
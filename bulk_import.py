@@ -0,0 +1,191 @@
+# Hogwarts Bulk Importer
+# --------------------------
+# This script streams Students, Teachers, Courses, or Enrollments from a CSV or JSONL file into the database.
+# Features: Reuses the student year/house validation, inserts with executemany in chunked
+# transactions, and reports rejected rows without holding the whole file in memory.
+
+import csv
+import json
+import os
+import time
+import database_design as d
+import logger as l
+import repository as r
+
+DEFAULT_CHUNK_SIZE = 5000           # Rows per executemany/commit
+MAX_REPORTED_REJECTS = 1000         # Rejects kept on the report; the reject file gets all of them
+
+# --- Columns expected for each table (matched case-insensitively against file headers/keys) ---
+TABLE_COLUMNS = {
+    "students": ("Name", "House", "Year"),
+    "teachers": ("Name", "CourseID"),
+    "courses":  ("CourseName",),
+    "enrollments": ("WizardID", "CourseID"),
+}
+
+
+class ImportReport:
+    # --- Summary of one import run ---
+    def __init__(self, table, path):
+        self.table = table
+        self.path = path
+        self.read = 0
+        self.inserted = 0
+        self.rejected = 0
+        self.rejects = []           # (line number, reason, raw record), capped at MAX_REPORTED_REJECTS
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.inserted / self.seconds if self.seconds else 0.0
+
+    def as_dict(self):
+        return {"Table": self.table, "File": self.path, "Read": self.read, "Inserted": self.inserted,
+                "Rejected": self.rejected, "Seconds": round(self.seconds, 3)}
+
+
+# --- Readers: yield (line number, record dict) one row at a time ---
+
+def _read_csv(f):
+    reader = csv.DictReader(f)
+    for record in reader:
+        yield reader.line_num, record
+
+def _read_jsonl(f):
+    for line_no, line in enumerate(f, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, ValueError(f"Invalid JSON: {e.msg}")
+            continue
+        yield line_no, record if isinstance(record, dict) else ValueError("Expected a JSON object")
+
+def detect_format(path):
+    # --- Picks the reader from the file extension ---
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if ext == ".csv":
+        return "csv"
+    raise ValueError(f"Cannot tell the format of '{path}'; use a .csv or .jsonl file or pass fmt.")
+
+
+# --- Row validation: returns the parameter tuple for the insert, or raises ValueError ---
+
+def _fields(record, columns):
+    # --- Values for the columns, with header names matched case-insensitively (the first match wins) ---
+    values = {}
+    for key, value in record.items():
+        if key is not None:
+            values.setdefault(key.strip().lower(), value)
+    return tuple("" if values.get(column.lower()) is None else str(values[column.lower()]).strip() for column in columns)
+
+def _student_params(record):
+    name, house, year = _fields(record, TABLE_COLUMNS["students"])
+    if not name:
+        raise ValueError("Missing name.")
+    error = d.validate_student(house, year)
+    if error:
+        raise ValueError(error)
+    return (name, house, year)
+
+def _teacher_params(record):
+    name, course_id = _fields(record, TABLE_COLUMNS["teachers"])
+    if not name:
+        raise ValueError("Missing name.")
+    if course_id and not course_id.isdigit():
+        raise ValueError("Course ID must be a whole number.")
+    return (name, int(course_id) if course_id else None)
+
+def _course_params(record):
+    course_name, = _fields(record, ("CourseName",))
+    if not course_name:
+        raise ValueError("Missing course name.")
+    return (course_name,)
+
+def _enrollment_params(record):
+    wizard_id, course_id = _fields(record, TABLE_COLUMNS["enrollments"])
+    if not (wizard_id.isdigit() and course_id.isdigit()):
+        raise ValueError("Student and course IDs must be whole numbers.")
+    return (int(wizard_id), int(course_id))
+
+_TABLES = {
+    "students": (r.students, _student_params),
+    "teachers": (r.admins,   _teacher_params),
+    "courses":  (r.courses,  _course_params),
+    "enrollments": (r.enrollments, _enrollment_params),     # Unknown IDs and repeats are skipped, not inserted
+}
+
+
+def import_file(path, table, fmt=None, chunk_size=DEFAULT_CHUNK_SIZE, reject_file=None, on_reject=None):
+    # --- Streams a CSV/JSONL file into the given table ("students", "teachers", "courses" or "enrollments") ---
+    # --- Each chunk is inserted with executemany and committed as one transaction ---
+    # --- Rejected rows go to on_reject(line_no, reason, record) and, if given, reject_file as JSONL ---
+    table = table.lower()
+    if table not in _TABLES:
+        raise ValueError(f"Unknown table '{table}'. Choose one of: {', '.join(_TABLES)}.")
+    repository, to_params = _TABLES[table]
+    fmt = fmt or detect_format(path)
+    read_rows = _read_jsonl if fmt == "jsonl" else _read_csv
+
+    report = ImportReport(table, path)
+    started = time.perf_counter()
+    chunk = []
+    rejects_out = open(reject_file, 'w', encoding='utf-8') if reject_file else None
+
+    def flush_chunk():
+        report.inserted += repository.add_many(chunk, chunk_size=len(chunk), log=False)
+        chunk.clear()
+
+    try:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for line_no, record in read_rows(f):
+                report.read += 1
+                try:
+                    if isinstance(record, Exception):
+                        raise record
+                    chunk.append(to_params(record))
+                except ValueError as e:
+                    report.rejected += 1
+                    if len(report.rejects) < MAX_REPORTED_REJECTS:
+                        report.rejects.append((line_no, str(e), record if isinstance(record, dict) else None))
+                    if rejects_out:
+                        rejects_out.write(json.dumps({"Line": line_no, "Reason": str(e),
+                                                      "Record": record if isinstance(record, dict) else None}) + "\n")
+                    if on_reject:
+                        on_reject(line_no, str(e), record)
+                    continue
+                if len(chunk) >= chunk_size:
+                    flush_chunk()
+            if chunk:
+                flush_chunk()
+    finally:
+        if rejects_out:
+            rejects_out.close()
+        report.seconds = time.perf_counter() - started
+
+    l.log_event("Bulk Import!", report.as_dict())
+    return report
+
+
+def run_import(path, table, fmt=None, chunk_size=DEFAULT_CHUNK_SIZE, reject_file=None, show_rejects=20):
+    # --- Terminal front end for import_file: prints a summary and the first few rejects ---
+    try:
+        report = import_file(path, table, fmt=fmt, chunk_size=chunk_size, reject_file=reject_file)
+    except Exception as e:
+        print("An error occurred while importing data. Please check the hogwarts_error_log file for more information.")
+        l.log_error("Failed to import data", details={"File": path, "Table": table, "Exception": str(e)})
+        return None
+
+    print(f"Imported {report.inserted} of {report.read} {report.table} rows from {path} "
+          f"in {report.seconds:.2f}s ({report.rows_per_second:,.0f} rows/s).")
+    if report.rejected:
+        print(f"{report.rejected} rows rejected:")
+        for line_no, reason, _ in report.rejects[:show_rejects]:
+            print(f"  line {line_no}: {reason}")
+        if report.rejected > show_rejects:
+            where = f" (all rejects written to {reject_file})" if reject_file else ""
+            print(f"  ... and {report.rejected - show_rejects} more{where}.")
+    return report
@@ -0,0 +1,90 @@
+# Hogwarts Reference Cache
+# --------------------------
+# This script keeps small, rarely changing tables (Courses, HogwartAdmin) in memory.
+# Features: Read-through LRU caches with a bounded number of entries, whole-table invalidation
+# on writes, and hit/miss/eviction counters.
+
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 128           # Cached results kept per table before the least recently used is evicted
+
+
+class LRUCache:
+    # --- Thread-safe least-recently-used cache with counters ---
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.generation = 0             # Bumped on invalidate so a load that raced a write isn't stored
+
+    def get_or_load(self, key, loader):
+        # --- Returns the cached value for key, calling loader() and storing its result on a miss ---
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+            generation = self.generation
+        value = loader()
+        with self.lock:
+            if generation == self.generation:
+                self.entries[key] = value
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def invalidate(self):
+        with self.lock:
+            self.entries.clear()
+            self.generation += 1
+            self.invalidations += 1
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {"Entries": len(self.entries), "Max Entries": self.max_entries, "Hits": self.hits,
+                    "Misses": self.misses, "Evictions": self.evictions, "Invalidations": self.invalidations,
+                    "Hit Rate": round(self.hits / lookups, 3) if lookups else 0.0}
+
+    def reset_stats(self):
+        with self.lock:
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+
+# --- One cache per reference table ---
+reference_caches = {
+    "Courses": LRUCache(),
+    "HogwartAdmin": LRUCache(),
+}
+
+def is_cached(table):
+    return table in reference_caches
+
+def cached(table, key, loader):
+    # --- Read-through lookup; tables without a cache always call loader() ---
+    table_cache = reference_caches.get(table)
+    if table_cache is None:
+        return loader()
+    return table_cache.get_or_load(key, loader)
+
+def invalidate(table):
+    # --- Drops everything cached for a table; call after any write to it ---
+    table_cache = reference_caches.get(table)
+    if table_cache is not None:
+        table_cache.invalidate()
+
+def invalidate_all():
+    for table_cache in reference_caches.values():
+        table_cache.invalidate()
+
+def stats():
+    # --- Counters for every reference cache, keyed by table ---
+    return {table: table_cache.stats() for table, table_cache in reference_caches.items()}
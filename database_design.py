@@ -1,15 +1,106 @@
 # Hogwarts Database Manager
 # --------------------------
 # This script manages Students, Courses, and Admins for Hogwarts using SQLite.
-# Features: Add, View, and Delete records with logging events.
+# Features: Schema, connections, predefined queries, streaming and windowed reads, name search indexes.
+# Record operations live in repository.py; the terminal prompts live in terminal.py.
 
 import os
 import sqlite3
+import threading
+import cache
+import instrumentation
 import logger as l
 
-# --- Set up database connection ---
-con = sqlite3.connect('Hogwarts.db')
-cur = con.cursor()
+# --- Database connection settings ---
+# --- The path can be set with the HOGWARTS_DB environment variable or configure() ---
+DB_PATH = os.environ.get("HOGWARTS_DB", "Hogwarts.db")
+
+# --- PRAGMAs applied to every new connection ---
+# --- WAL lets readers on other threads run while one writer commits ---
+PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous":  "NORMAL",       # Safe with WAL; FULL adds an fsync per commit
+    "cache_size":   -64000,         # Negative = KiB, so about 64 MB of page cache per connection
+    "mmap_size":    268435456,      # 256 MB of memory-mapped reads
+    "temp_store":   "MEMORY",
+    "busy_timeout": 5000,           # Wait up to 5s for a lock instead of failing immediately
+}
+
+CACHED_STATEMENTS = 256             # Prepared statements kept per connection for reuse
+
+_local = threading.local()          # Per-thread connection and cursor
+_connections = []                   # Every open connection, so close_all() can reach them
+_connections_lock = threading.Lock()
+_schema_ready = set()               # Database paths checked against SCHEMA_VERSION this process
+_generation = 0                     # Bumped by close_all(); a thread holding an older connection reopens
+
+def configure(db_path=None, **pragmas):
+    # --- Changes the database path and/or PRAGMAs; open connections are closed so the change applies ---
+    global DB_PATH
+    close_all()
+    cache.invalidate_all()
+    if db_path is not None:
+        DB_PATH = db_path
+    PRAGMAS.update(pragmas)
+
+def _apply_pragmas(connection):
+    for name, value in PRAGMAS.items():
+        connection.execute(f"PRAGMA {name} = {value};")
+
+def _open_connection():
+    connection = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=CACHED_STATEMENTS,
+                                 factory=instrumentation.connection_factory())
+    _apply_pragmas(connection)
+    with _connections_lock:
+        _connections.append(connection)
+        if DB_PATH not in _schema_ready:
+            init_schema(connection)
+            _schema_ready.add(DB_PATH)
+    return connection
+
+def get_connection():
+    # --- Returns this thread's connection, opening it on first use or after close_all()/configure() ---
+    connection = getattr(_local, "con", None)
+    if connection is None or getattr(_local, "generation", None) != _generation:
+        connection = _open_connection()
+        if getattr(_local, "read_only", False):
+            connection.execute("PRAGMA query_only = ON;")
+        _local.con, _local.cur, _local.generation = connection, connection.cursor(), _generation
+    return connection
+
+def set_read_only():
+    # --- Makes this thread's connections (including any reopened later) refuse writes ---
+    _local.read_only = True
+    get_connection().execute("PRAGMA query_only = ON;")
+
+def get_cursor():
+    # --- Returns this thread's shared cursor ---
+    get_connection()
+    return _local.cur
+
+def close_connection():
+    # --- Closes this thread's connection ---
+    connection = getattr(_local, "con", None)
+    if connection is not None:
+        _local.con = _local.cur = _local.generation = None
+        with _connections_lock:
+            if connection in _connections:
+                _connections.remove(connection)
+        connection.close()
+
+def close_all():
+    # --- Closes every connection opened by any thread; each thread opens a new one on its next call ---
+    global _generation
+    with _connections_lock:
+        connections = list(_connections)
+        _connections.clear()
+        _generation += 1
+    for connection in connections:
+        try:
+            connection.close()
+        except sqlite3.Error:
+            pass
+    _local.con = _local.cur = _local.generation = None
 
 
 # --- Create tables if they don't exist ---
@@ -31,10 +122,149 @@ create_student_table = """CREATE TABLE IF NOT EXISTS Students (
     Year INTEGER NOT NULL
 );"""
 
-# --- Executes create table queries ---
-cur.execute(create_admin_table)
-cur.execute(create_course_table)
-cur.execute(create_student_table)
+# --- Materialized student counts per (House, Year), kept current by the triggers below ---
+create_student_stats_table = """CREATE TABLE IF NOT EXISTS StudentStats (
+    House TEXT NOT NULL,
+    Year INTEGER NOT NULL,
+    StudentCount INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (House, Year)
+) WITHOUT ROWID;"""
+
+student_stats_triggers = [
+    """CREATE TRIGGER IF NOT EXISTS trg_students_stats_insert AFTER INSERT ON Students
+    BEGIN
+        INSERT INTO StudentStats (House, Year, StudentCount) VALUES (NEW.House, NEW.Year, 1)
+        ON CONFLICT (House, Year) DO UPDATE SET StudentCount = StudentCount + 1;
+    END;""",
+    """CREATE TRIGGER IF NOT EXISTS trg_students_stats_delete AFTER DELETE ON Students
+    BEGIN
+        UPDATE StudentStats SET StudentCount = StudentCount - 1 WHERE House = OLD.House AND Year = OLD.Year;
+    END;""",
+    """CREATE TRIGGER IF NOT EXISTS trg_students_stats_update AFTER UPDATE OF House, Year ON Students
+    WHEN OLD.House IS NOT NEW.House OR OLD.Year IS NOT NEW.Year
+    BEGIN
+        UPDATE StudentStats SET StudentCount = StudentCount - 1 WHERE House = OLD.House AND Year = OLD.Year;
+        INSERT INTO StudentStats (House, Year, StudentCount) VALUES (NEW.House, NEW.Year, 1)
+        ON CONFLICT (House, Year) DO UPDATE SET StudentCount = StudentCount + 1;
+    END;""",
+]
+
+# --- Which students take which courses; the primary key serves "courses for a student" ---
+create_enrollment_table = """CREATE TABLE IF NOT EXISTS Enrollments (
+    WizardID INTEGER NOT NULL,
+    CourseID INTEGER NOT NULL,
+    EnrolledAt TEXT NOT NULL DEFAULT (datetime('now')),
+    PRIMARY KEY (WizardID, CourseID)
+) WITHOUT ROWID;"""
+
+# --- (CourseID, WizardID) covers rosters and per-course counts without touching the table ---
+create_enrollment_index = "CREATE INDEX IF NOT EXISTS idx_enrollments_course ON Enrollments (CourseID, WizardID);"
+
+# --- Deleting a student or course drops their enrollments ---
+enrollment_triggers = [
+    """CREATE TRIGGER IF NOT EXISTS trg_students_enrollments_delete AFTER DELETE ON Students
+    BEGIN
+        DELETE FROM Enrollments WHERE WizardID = OLD.WizardID;
+    END;""",
+    """CREATE TRIGGER IF NOT EXISTS trg_courses_enrollments_delete AFTER DELETE ON Courses
+    BEGIN
+        DELETE FROM Enrollments WHERE CourseID = OLD.CourseID;
+    END;""",
+]
+
+# --- Secondary indexes for the name/house/year lookups ---
+# --- (House, Year) serves house-only and house+year filters; Year alone needs its own index ---
+index_definitions = {
+    "idx_students_name":       "CREATE INDEX IF NOT EXISTS idx_students_name ON Students (Name);",
+    "idx_students_house_year": "CREATE INDEX IF NOT EXISTS idx_students_house_year ON Students (House, Year);",
+    "idx_students_year":       "CREATE INDEX IF NOT EXISTS idx_students_year ON Students (Year);",
+    "idx_courses_name":        "CREATE INDEX IF NOT EXISTS idx_courses_name ON Courses (CourseName);",
+    "idx_admin_name":          "CREATE INDEX IF NOT EXISTS idx_admin_name ON HogwartAdmin (Name);",
+}
+
+# --- Added by migration v6 (index_definitions belongs to v2). An index on X is ordered by (X, WizardID), so a
+# --- keyset page filtered by House alone is a seek that needs no sort ---
+create_student_house_index = "CREATE INDEX IF NOT EXISTS idx_students_house ON Students (House);"
+
+def ensure_indexes(cursor=None):
+    # --- Creates any missing secondary index; existing ones are left alone ---
+    cursor = cursor or get_cursor()
+    for ddl in index_definitions.values():
+        cursor.execute(ddl)
+
+def optimize_database():
+    # --- Refreshes planner statistics so SQLite keeps choosing the indexes as tables grow ---
+    get_cursor().execute("PRAGMA optimize;")
+    get_connection().commit()
+
+# --- FTS5 name indexes for search; external content, so names are stored only in the source tables ---
+# --- table: (FTS table, key column, name column). prefix='2 3' keeps short prefix queries off a full term scan ---
+search_indexes = {
+    "Students":     ("StudentSearch", "WizardID", "Name"),
+    "HogwartAdmin": ("AdminSearch",   "WizardID", "Name"),
+    "Courses":      ("CourseSearch",  "CourseID", "CourseName"),
+}
+
+def search_index_ddl(table):
+    # --- CREATE statements for a table's FTS index and the triggers that keep it in sync ---
+    fts, key, column = search_indexes[table]
+    return [
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+    {column}, content='{table}', content_rowid='{key}', prefix='2 3'
+);""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_{fts.lower()}_insert AFTER INSERT ON {table}
+    BEGIN
+        INSERT INTO {fts} (rowid, {column}) VALUES (NEW.{key}, NEW.{column});
+    END;""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_{fts.lower()}_delete AFTER DELETE ON {table}
+    BEGIN
+        INSERT INTO {fts} ({fts}, rowid, {column}) VALUES ('delete', OLD.{key}, OLD.{column});
+    END;""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_{fts.lower()}_update AFTER UPDATE OF {column} ON {table}
+    BEGIN
+        INSERT INTO {fts} ({fts}, rowid, {column}) VALUES ('delete', OLD.{key}, OLD.{column});
+        INSERT INTO {fts} (rowid, {column}) VALUES (NEW.{key}, NEW.{column});
+    END;""",
+    ]
+
+# --- Bulk inserts pause a table's insert trigger by adding its name here inside their own transaction, then
+# --- index the whole chunk with one INSERT ... SELECT (about 3x faster than a trigger firing per row).
+# --- The row is deleted before the commit, so no other connection ever sees the trigger paused ---
+create_search_pause_table = """CREATE TABLE IF NOT EXISTS SearchSyncPaused (
+    TableName TEXT PRIMARY KEY
+) WITHOUT ROWID;"""
+
+pause_search_query = "INSERT INTO SearchSyncPaused (TableName) VALUES (?);"
+resume_search_query = "DELETE FROM SearchSyncPaused WHERE TableName = ?;"
+
+def search_insert_trigger_ddl(table):
+    # --- v7 insert trigger: as in search_index_ddl, but skipped while the table's sync is paused ---
+    fts, key, column = search_indexes[table]
+    return [
+        f"DROP TRIGGER IF EXISTS trg_{fts.lower()}_insert;",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_{fts.lower()}_insert AFTER INSERT ON {table}
+    WHEN NOT EXISTS (SELECT 1 FROM SearchSyncPaused WHERE TableName = '{table}')
+    BEGIN
+        INSERT INTO {fts} (rowid, {column}) VALUES (NEW.{key}, NEW.{column});
+    END;""",
+    ]
+
+def search_catch_up_query(table):
+    # --- Indexes the rows a paused bulk insert added; parameter is the largest key before the insert ---
+    fts, key, column = search_indexes[table]
+    return f"INSERT INTO {fts} (rowid, {column}) SELECT {key}, {column} FROM {table} WHERE {key} > ?;"
+
+def search_query(table, columns):
+    # --- Ranked (bm25) matches joined back to the source rows; parameters are (match, limit) ---
+    fts, key, _ = search_indexes[table]
+    selected = ", ".join(f"{table}.{column}" for column in columns)
+    return (f"SELECT {selected} FROM {fts} JOIN {table} ON {table}.{key} = {fts}.rowid "
+            f"WHERE {fts} MATCH ? ORDER BY {fts}.rank LIMIT ?;")
+
+def match_expression(text):
+    # --- Turns user text into an FTS5 query: every word must match as a word prefix ---
+    # --- Words are quoted, so FTS5 operators and punctuation in names are taken literally ---
+    return " ".join('"' + word.replace('"', '""') + '"*' for word in text.split())
 
 # --- SQL Insert Statements ---
 insert_admin_query = "INSERT INTO HogwartAdmin (Name, CourseID) VALUES (?,?);"
@@ -43,10 +273,115 @@ insert_course_query = "INSERT INTO Courses (CourseName) VALUES (?);"
 
 # --- Predefined queries ---
 student_list_query = "SELECT Name, House, Year FROM Students;"
-student_count_query = "SELECT COUNT(*) FROM Students;"
+student_count_query = "SELECT COALESCE(SUM(StudentCount), 0) FROM StudentStats;"   # Trigger-maintained, see StudentStats
 admin_list_query = "SELECT WizardID, Name, CourseID FROM HogwartAdmin;"
 course_list_query = "SELECT CourseID, CourseName FROM Courses;"
 
+# --- Filter and delete queries ---
+student_by_year_query = "SELECT Name, House, Year FROM Students WHERE Year = ?;"
+student_by_house_query = "SELECT Name, House, Year FROM Students WHERE House = ?;"
+student_by_house_year_query = "SELECT Name, House, Year FROM Students WHERE House = ? AND Year = ?;"
+find_student_query = "SELECT * FROM Students WHERE Name = ?;"
+find_course_query = "SELECT * FROM Courses WHERE CourseName = ?;"
+find_admin_query = "SELECT * FROM HogwartAdmin WHERE Name = ?;"
+delete_student_query = "DELETE FROM Students WHERE Name = ?;"
+delete_course_query = "DELETE FROM Courses WHERE CourseName = ?;"
+delete_admin_query = "DELETE FROM HogwartAdmin WHERE Name = ?;"
+
+# --- Enrollment queries ---
+# --- Unknown student or course IDs select no row, so nothing is inserted for them ---
+enroll_query = """INSERT OR IGNORE INTO Enrollments (WizardID, CourseID)
+    SELECT s.WizardID, c.CourseID FROM Students s, Courses c WHERE s.WizardID = ? AND c.CourseID = ?;"""
+unenroll_query = "DELETE FROM Enrollments WHERE WizardID = ? AND CourseID = ?;"
+
+roster_select = """SELECT s.WizardID, s.Name, s.House, s.Year FROM Courses c
+    JOIN Enrollments e ON e.CourseID = c.CourseID
+    JOIN Students s ON s.WizardID = e.WizardID
+    WHERE c.CourseName = ?"""
+roster_query = roster_select + " ORDER BY s.Name;"
+roster_by_house_query = roster_select + " AND s.House = ? ORDER BY s.Name;"
+roster_by_year_query = roster_select + " AND s.Year = ? ORDER BY s.Name;"
+roster_by_house_year_query = roster_select + " AND s.House = ? AND s.Year = ? ORDER BY s.Name;"
+
+courses_for_student_query = """SELECT s.WizardID, s.Name, c.CourseID, c.CourseName FROM Students s
+    JOIN Enrollments e ON e.WizardID = s.WizardID
+    JOIN Courses c ON c.CourseID = e.CourseID
+    WHERE s.Name = ? ORDER BY s.WizardID, c.CourseName;"""
+
+# --- Bulk delete filter: students enrolled in the named course (served by idx_enrollments_course) ---
+student_in_course_condition = """WizardID IN (SELECT e.WizardID FROM Courses c
+    JOIN Enrollments e ON e.CourseID = c.CourseID WHERE c.CourseName = ?)"""
+
+# --- Every teacher with the number of students enrolled in their course ---
+teacher_load_query = """SELECT a.WizardID, a.Name, a.CourseID, c.CourseName,
+    (SELECT COUNT(*) FROM Enrollments e WHERE e.CourseID = a.CourseID) AS Students
+    FROM HogwartAdmin a LEFT JOIN Courses c ON c.CourseID = a.CourseID
+    ORDER BY Students DESC, a.Name;"""
+
+# --- Keyset pages: each page continues after the last key of the previous one (key > ?), so a deep page
+# --- is an index seek like the first, where OFFSET would read and discard every earlier row ---
+def keyset_page_query(table, columns, key, where="", first=False):
+    # --- Parameters: the where parameters, then (unless first) the last key seen, then the page size ---
+    conditions = " AND ".join(part for part in (where, None if first else f"{key} > ?") if part)
+    return (f"SELECT {', '.join(columns)} FROM {table}" + (f" WHERE {conditions}" if conditions else "")
+            + f" ORDER BY {key} LIMIT ?;")
+
+student_columns = ("WizardID", "Name", "House", "Year")
+
+# --- Every predefined query with sample parameters, for query-plan diagnostics ---
+# --- Full listings read the whole table by design, the count reads the tiny StudentStats table,
+# --- and teacher load reports on every teacher (the enrollment counts come from the index) ---
+predefined_queries = {
+    "student_list":       (student_list_query, ()),
+    "student_count":      (student_count_query, ()),
+    "admin_list":         (admin_list_query, ()),
+    "course_list":        (course_list_query, ()),
+    "student_by_year":    (student_by_year_query, (1,)),
+    "student_by_house":   (student_by_house_query, ("Gryffindor",)),
+    "student_by_house_year": (student_by_house_year_query, ("Gryffindor", 1)),
+    "find_student":       (find_student_query, ("",)),
+    "find_course":        (find_course_query, ("",)),
+    "find_admin":         (find_admin_query, ("",)),
+    "delete_student":     (delete_student_query, ("",)),
+    "delete_course":      (delete_course_query, ("",)),
+    "delete_admin":       (delete_admin_query, ("",)),
+    "roster":             (roster_query, ("",)),
+    "roster_by_house":    (roster_by_house_query, ("", "Gryffindor")),
+    "roster_by_year":     (roster_by_year_query, ("", 1)),
+    "roster_by_house_year": (roster_by_house_year_query, ("", "Gryffindor", 1)),
+    "courses_for_student": (courses_for_student_query, ("",)),
+    "teacher_load":       (teacher_load_query, ()),
+    "student_page":       (keyset_page_query("Students", student_columns, "WizardID"), (0, 50)),
+    "student_page_by_house": (keyset_page_query("Students", student_columns, "WizardID", "House = ?"), ("Gryffindor", 0, 50)),
+    "student_page_by_year": (keyset_page_query("Students", student_columns, "WizardID", "Year = ?"), (1, 0, 50)),
+    "student_page_by_house_year": (keyset_page_query("Students", student_columns, "WizardID", "House = ? AND Year = ?"),
+                                   ("Gryffindor", 1, 0, 50)),
+    "admin_page":         (keyset_page_query("HogwartAdmin", ("WizardID", "Name", "CourseID"), "WizardID"), (0, 50)),
+    "course_page":        (keyset_page_query("Courses", ("CourseID", "CourseName"), "CourseID"), (0, 50)),
+}
+full_scan_expected = {"student_list", "student_count", "admin_list", "course_list", "teacher_load"}
+
+# --- Valid values for student records ---
+VALID_YEARS = ['1', '2', '3', '4', '5', '6', '7']
+VALID_HOUSES = ['Gryffindor', 'Slytherin', 'Hufflepuff', 'Ravenclaw']
+
+def validate_student(house, year):
+    # --- Returns an error message for an invalid house/year, or None when the values are valid ---
+    if str(year) not in VALID_YEARS:
+        return "Invalid year. Please enter a number between 1 and 7."
+    if house not in VALID_HOUSES:
+        return "Invalid house. Please enter one of the four houses."
+    return None
+
+# --- Tables that can be read in windows (used by the GUI grid) ---
+# --- key: unique column used as the tie-breaker so window order is stable ---
+# --- text: columns filtered by prefix match; every other column is filtered by equality ---
+listable_tables = {
+    "Students":     {"key": "WizardID", "columns": ("Name", "House", "Year"),         "text": ("Name", "House")},
+    "HogwartAdmin": {"key": "WizardID", "columns": ("WizardID", "Name", "CourseID"),  "text": ("Name",), "nullable": ("CourseID",)},
+    "Courses":      {"key": "CourseID", "columns": ("CourseID", "CourseName"),        "text": ("CourseName",)},
+}
+
 # --- Pre-filled data ---
 course_data = [
     ('Astronomy',), ('Charms',), ('Defense Against the Dark Arts',), ('Flying',),
@@ -62,250 +397,286 @@ admin_data = [
     ('Remus Lupin', 13), ('Alastor Moody', 4), ('Firenze', 1),
 ]
 
-# --- Insert initial course data if table is empty ---
-try:
-    cur.execute("SELECT COUNT(*) FROM Courses;")
-    if cur.fetchone()[0] == 0:
-        cur.executemany(insert_course_query, course_data)
-except Exception as e:
-    print("An error occurred while populating the Courses table. Please check the hogwarts_error_log file for more information.")
-    l.log_error("Failed to populate the Courses table", details={"Exception": str(e)})
-
-# --- Insert initial admin data if table is empty ---
-try:
-    cur.execute("SELECT COUNT(*) FROM HogwartAdmin;")
-    if cur.fetchone()[0] == 0:
-        cur.executemany(insert_admin_query, admin_data)
-except Exception as e:
-    print("An error occurred while populating the HogwartAdmin table. Please check the hogwarts_error_log file for more information.")
-    l.log_error("Failed to populate the HogwartAdmin table", details={"Exception": str(e)})
-
-con.commit()
-
-# --- Functions ---
-
-def insert_student():
-    # --- Adds a new student to the Students table ---
-    try:
-        name = input("Enter the student's name: ")
-        year = input("Enter the student's year (1-7): ")
-        house = input("Enter the student's house (Gryffindor, Slytherin, Hufflepuff, Ravenclaw): ")
-
-        if year not in ['1', '2', '3', '4', '5', '6', '7']:
-            print("Invalid year. Please enter a number between 1 and 7.")
-            return
-        elif house not in ['Gryffindor', 'Slytherin', 'Hufflepuff', 'Ravenclaw']:
-            print("Invalid house. Please enter one of the four houses.")
-            return
-        else:
-            cur.execute(insert_student_query, (name, house, year))
-            con.commit()
-            print(f"Student {name} added successfully!")
-            l.log_event("Student Added!", {"Name": name, "House": house, "Year": year})
-    except Exception as e:
-        print("An error occurred while adding student data. Please check the hogwarts_error_log file for more information.")
-        l.log_error("Failed to add student data", details={"Exception": str(e)})
+# --- Schema versioning ---
+# --- Each migration runs once per database; afterwards startup costs a single version lookup ---
+create_schema_version_table = """CREATE TABLE IF NOT EXISTS SchemaVersion (
+    Version INTEGER PRIMARY KEY,
+    Description TEXT NOT NULL,
+    AppliedAt TEXT NOT NULL DEFAULT (datetime('now'))
+);"""
 
-def add_course():
-    # --- Adds a new course to the Courses table ---
-    try:
-        course_name = input("Enter the course name: ")
-        cur.execute(insert_course_query, (course_name,))
-        con.commit()
-        print(f"Course {course_name} added successfully!")
-        l.log_event("Course Added!", {"Course Name": course_name})
-    except Exception as e:
-        print("An error occurred while adding course data. Please check the hogwarts_error_log file for more information.")
-        l.log_error("Failed to add course data", details={"Exception": str(e)})
+def _migrate_base_tables(cur):
+    # --- v1: the original tables plus their seed data (seeded only when empty, so older databases keep theirs) ---
+    cur.execute(create_admin_table)
+    cur.execute(create_course_table)
+    cur.execute(create_student_table)
 
-def insert_admin():
-    # --- Adds a new admin/teacher to the HogwartAdmin table ---
+    # --- Insert initial course data if table is empty ---
     try:
-        name = input("Enter the admin's name: ")
-        course_id = input("Enter the course/occupation ID: ")
-        cur.execute(insert_admin_query, (name, course_id))
-        con.commit()
-        print(f"Admin {name} added successfully!")
-        l.log_event("Teacher Added!", {"Name": name, "Course ID": course_id})
+        cur.execute("SELECT COUNT(*) FROM Courses;")
+        if cur.fetchone()[0] == 0:
+            cur.executemany(insert_course_query, course_data)
     except Exception as e:
-        print("An error occurred while adding admin data. Please check the hogwarts_error_log file for more information.")
-        l.log_error("Failed to add admin data", details={"Exception": str(e)})
+        print("An error occurred while populating the Courses table. Please check the hogwarts_error_log file for more information.")
+        l.log_error("Failed to populate the Courses table", details={"Exception": str(e)})
 
-def all_students():
-    # --- Lists all students in the database ---
+    # --- Insert initial admin data if table is empty ---
     try:
-        cur.execute("SELECT Name, House, Year FROM Students;")
-        students = cur.fetchall()
-        if students:
-            print("List of all students:")
-            for student in students:
-                print(f"Name: {student[0]}, House: {student[1]}, Year: {student[2]}")
-        else:
-            print("No students found.")
+        cur.execute("SELECT COUNT(*) FROM HogwartAdmin;")
+        if cur.fetchone()[0] == 0:
+            cur.executemany(insert_admin_query, admin_data)
     except Exception as e:
-        print("An error occurred while iterating student data. Please check the hogwarts_error_log file for more information.")
-        l.log_error("Failed to iterate student data", details={"Exception": str(e)})
+        print("An error occurred while populating the HogwartAdmin table. Please check the hogwarts_error_log file for more information.")
+        l.log_error("Failed to populate the HogwartAdmin table", details={"Exception": str(e)})
+
+def _migrate_indexes(cur):
+    # --- v2: secondary indexes for the name/house/year lookups ---
+    ensure_indexes(cur)
+
+def _migrate_student_stats(cur):
+    # --- v3: StudentStats summary table and its triggers, filled from the existing students ---
+    cur.execute(create_student_stats_table)
+    for trigger in student_stats_triggers:
+        cur.execute(trigger)
+    rebuild_student_stats(cur)
+
+def _migrate_search(cur):
+    # --- v4: FTS5 name indexes and their triggers, filled from the existing rows ---
+    for table, (fts, _, _) in search_indexes.items():
+        for ddl in search_index_ddl(table):
+            cur.execute(ddl)
+        cur.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild');")
+
+def _migrate_enrollments(cur):
+    # --- v5: Enrollments table, its course index and the delete triggers ---
+    cur.execute(create_enrollment_table)
+    cur.execute(create_enrollment_index)
+    for trigger in enrollment_triggers:
+        cur.execute(trigger)
+
+def _migrate_keyset_indexes(cur):
+    # --- v6: the House index that keyset pages filtered by house seek on ---
+    cur.execute(create_student_house_index)
+
+def _migrate_search_bulk(cur):
+    # --- v7: FTS insert triggers that bulk inserts can pause for the length of one transaction ---
+    cur.execute(create_search_pause_table)
+    for table in search_indexes:
+        for ddl in search_insert_trigger_ddl(table):
+            cur.execute(ddl)
+
+# --- (version, description, function) in order; append new migrations, never edit applied ones ---
+migrations = [
+    (1, "Base tables and seed data", _migrate_base_tables),
+    (2, "Secondary indexes", _migrate_indexes),
+    (3, "StudentStats summary table", _migrate_student_stats),
+    (4, "FTS5 name search indexes", _migrate_search),
+    (5, "Enrollments table", _migrate_enrollments),
+    (6, "Keyset pagination indexes", _migrate_keyset_indexes),
+    (7, "Pausable search triggers for bulk inserts", _migrate_search_bulk),
+]
+SCHEMA_VERSION = migrations[-1][0]
 
-def student_by_year():
-    # --- Lists students filtered by year ---
+def schema_version(connection):
+    # --- Highest applied migration, or 0 for a new (or pre-versioning) database ---
     try:
-        year = input("Enter the year (1-7): ")
-        cur.execute("SELECT Name, House, Year FROM Students WHERE Year = ?;", (year,))
-        students = cur.fetchall()
-        if students:
-            print(f"Students in Year {year}:")
-            for student in students:
-                print(f"Name: {student[0]}, House: {student[1]}, Year: {student[2]}")
-        else:
-            print(f"No students found in Year {year}.")
-    except Exception as e:
-        print("An error occurred while searching student data by year. Please check the hogwarts_error_log file for more information.")
-        l.log_error("Failed to search student data by year", details={"Exception": str(e)})
-
-def student_by_house():
-    # --- Lists students filtered by house ---
+        return connection.execute("SELECT MAX(Version) FROM SchemaVersion;").fetchone()[0] or 0
+    except sqlite3.OperationalError:
+        return 0
+
+def init_schema(connection):
+    # --- Applies pending migrations; returns the versions applied (empty when already current) ---
+    if schema_version(connection) >= SCHEMA_VERSION:
+        return []
+    cur = connection.cursor()
+    applied = []
     try:
-        house = input("Enter the house name: ")
-        cur.execute("SELECT Name, House, Year FROM Students WHERE House = ?;", (house,))
-        students = cur.fetchall()
-        if students:
-            print(f"Students in House {house}:")
-            for student in students:
-                print(f"Name: {student[0]}, House: {student[1]}, Year: {student[2]}")
-        else:
-            print("No students found in that house.")
-    except Exception as e:
-        print("An error occurred while searching student data by house. Please check the hogwarts_error_log file for more information.")
-        l.log_error("Failed to search student data by house", details={"Exception": str(e)})
-
-def student_list():
-    # --- Menu for listing students by different filters ---
+        cur.execute("BEGIN IMMEDIATE;")                     # --- One process migrates at a time ---
+        cur.execute(create_schema_version_table)
+        current = schema_version(connection)
+        for version, description, migrate in migrations:
+            if version > current:
+                migrate(cur)
+                cur.execute("INSERT INTO SchemaVersion (Version, Description) VALUES (?, ?);", (version, description))
+                applied.append(version)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cur.close()
+    if applied:
+        l.log_event("Schema Migrated!", {"Database": DB_PATH, "Versions": applied})
+    return applied
+
+def init_db(db_path=None):
+    # --- Explicit setup entry point (main.py --init-db); returns the versions applied ---
+    if db_path is not None:
+        configure(db_path=db_path)
+    connection = sqlite3.connect(DB_PATH)
+    try:
+        _apply_pragmas(connection)
+        applied = init_schema(connection)
+    finally:
+        connection.close()
+    with _connections_lock:
+        _schema_ready.add(DB_PATH)
+    return applied
+
+# --- Streaming reads ---
+# --- Rows come back lazily in fetchmany batches, so memory stays flat and the first row arrives immediately ---
+DEFAULT_BATCH_SIZE = 500
+
+def iter_batches(query, params=(), batch_size=None):
+    # --- Yields lists of rows from fetchmany on a private cursor (for writers that work a batch at a time) ---
+    cursor = get_connection().cursor()
     try:
+        cursor.execute(query, params)
         while True:
-            print("1. View all students")
-            print("2. View students by year")
-            print("3. View students by house")
-            print("4. Exit")
-
-            student_choice = input("Enter your choice (1-4): ")
-            if student_choice == "1":
-                all_students()
-            elif student_choice == "2":
-                student_by_year()
-            elif student_choice == "3":
-                student_by_house()
-            elif student_choice == "4":
-                print("Exiting student list.")
+            rows = cursor.fetchmany(batch_size or DEFAULT_BATCH_SIZE)
+            if not rows:
                 break
-            else:
-                print("Invalid choice. Please try again.")
-                student_list()
-    except Exception as e:
-        print("An error occurred while accessing the student sorting menu. Please check the hogwarts_error_log file for more information.")
-        l.log_error("Failed to access student sorting menu", details={"Exception": str(e)})
-
-def admin_list():
-    # --- Lists all admins/teachers ---
-    try:
-        cur.execute(admin_list_query)
-        admins = cur.fetchall()
-        if admins:
-            print("List of all admins:")
-            for admin in admins:
-                print(f"WizardID: {admin[0]}, Name: {admin[1]}, CourseID: {admin[2]}")
-        else:
-            print("No admins found.")
-    except Exception as e:
-        print("An error occurred while accessing admin data. Please check the hogwarts_error_log file for more information.")
-        l.log_error("Failed to access admin list", details={"Exception": str(e)})
-
-def course_list():
-    # --- Lists all courses ---
-    try:
-        cur.execute(course_list_query)
-        courses = cur.fetchall()
-        if courses:
-            print("List of all courses:")
-            for course in courses:
-                print(f"CourseID: {course[0]}, CourseName: {course[1]}")
-        else:
-            print("No courses found.")
-    except Exception as e:
-        print("An error occurred while accessing course data. Please check the hogwarts_error_log file for more information.")
-        l.log_error("Failed to access course list", details={"Exception": str(e)})
-
-def delete_record():
-    # --- Allows the user to delete a record from Students, Courses, or HogwartAdmin ---
-    print("Which table would you like to delete from?")
-    print("1. Students")
-    print("2. Courses")
-    print("3. HogwartAdmin")
-    choice = input("Enter the number corresponding to the table: ").strip()
-    try:
-        if choice == "1":
-            # --- Delete student ---
-            name = input("Enter the student's name you want to delete: ").strip()
-            if not name:
-                print("No name entered. Deletion cancelled.")
-                return
-
-            cur.execute("SELECT * FROM Students WHERE Name = ?;", (name,))
-            student = cur.fetchone()
-            if student:
-                confirm = input(f"Are you sure you want to delete student '{name}'? (Y/N): ").strip().lower()
-                if confirm == 'y' or confirm == 'Y':
-                    cur.execute("DELETE FROM Students WHERE Name = ?;", (name,))
-                    con.commit()
-                    print(f"Student '{name}' deleted successfully!")
-                    l.log_event("Student Deleted!", {"Name": name})
-                else:
-                    print("Deletion cancelled.")
-            else:
-                print(f"No student found with the name '{name}'.")
-
-        elif choice == "2":
-            # --- Delete course ---
-            course_name = input("Enter the course name you want to delete: ").strip()
-            if not course_name:
-                print("No course name entered. Deletion cancelled.")
-                return
-
-            cur.execute("SELECT * FROM Courses WHERE CourseName = ?;", (course_name,))
-            course = cur.fetchone()
-            if course:
-                confirm = input(f"Are you sure you want to delete course '{course_name}'? (Y/N): ").strip().lower()
-                if confirm == 'y' or confirm == 'Y':
-                    cur.execute("DELETE FROM Courses WHERE CourseName = ?;", (course_name,))
-                    con.commit()
-                    print(f"Course '{course_name}' deleted successfully.")
-                    l.log_event("Course Deleted!", {"Course Name": course_name})
-                else:
-                    print("Deletion cancelled.")
-            else:
-                print(f"No course found with the name '{course_name}'.")
-
-        elif choice == "3":
-            # --- Delete admin ---
-            name = input("Enter the admin's name you want to delete: ").strip()
-            if not name:
-                print("No admin name entered. Deletion cancelled.")
-                return
-
-            cur.execute("SELECT * FROM HogwartAdmin WHERE Name = ?;", (name,))
-            admin = cur.fetchone()
-            if admin:
-                confirm = input(f"Are you sure you want to delete admin '{name}'? (Y/N): ").strip().lower()
-                if confirm == 'y' or confirm == 'Y':
-                    cur.execute("DELETE FROM HogwartAdmin WHERE Name = ?;", (name,))
-                    con.commit()
-                    print(f"Admin '{name}' deleted successfully!")
-                    l.log_event("Admin Deleted!", {"Name": name})
-                else:
-                    print("Deletion cancelled.")
-            else:
-                print(f"No admin found with the name '{name}'.")
-        else:
-            print("Invalid choice. No records deleted.")
-    except Exception as e:
-        print("An error occurred while removing data. Please check the hogwarts_error_log file for more information.")
-        l.log_error("Failed to remove data", details={"Exception": str(e)})
+            yield rows
+    finally:
+        cursor.close()
+
+def iter_rows(query, params=(), batch_size=None):
+    # --- Yields rows one at a time from fetchmany batches on a private cursor ---
+    for rows in iter_batches(query, params, batch_size):
+        yield from rows
+
+def iter_students(year=None, house=None, batch_size=None):
+    # --- Streams (Name, House, Year) rows, optionally filtered by year and/or house ---
+    if year is not None and house is not None:
+        return iter_rows(student_by_house_year_query, (house, year), batch_size)
+    if year is not None:
+        return iter_rows(student_by_year_query, (year,), batch_size)
+    if house is not None:
+        return iter_rows(student_by_house_query, (house,), batch_size)
+    return iter_rows(student_list_query, (), batch_size)
+
+def iter_roster(course_name, house=None, year=None, batch_size=None):
+    # --- Streams (WizardID, Name, House, Year) for students enrolled in a course, optionally by house and/or year ---
+    if house is not None and year is not None:
+        return iter_rows(roster_by_house_year_query, (course_name, house, year), batch_size)
+    if year is not None:
+        return iter_rows(roster_by_year_query, (course_name, year), batch_size)
+    if house is not None:
+        return iter_rows(roster_by_house_query, (course_name, house), batch_size)
+    return iter_rows(roster_query, (course_name,), batch_size)
+
+def iter_admins(batch_size=None):
+    # --- Streams (WizardID, Name, CourseID) rows ---
+    return iter_rows(admin_list_query, (), batch_size)
+
+def iter_courses(batch_size=None):
+    # --- Streams (CourseID, CourseName) rows ---
+    return iter_rows(course_list_query, (), batch_size)
+
+# --- Student statistics (read from StudentStats, never from a scan of Students) ---
+student_stats_query = "SELECT House, Year, StudentCount FROM StudentStats WHERE StudentCount > 0 ORDER BY House, Year;"
+student_stats_actual_query = "SELECT House, Year, COUNT(*) FROM Students GROUP BY House, Year;"
+
+def student_stats():
+    # --- Returns [(House, Year, count)] for every non-empty house/year ---
+    return get_connection().execute(student_stats_query).fetchall()
+
+def student_total():
+    # --- Total number of students; sums at most one row per house/year ---
+    return get_connection().execute(student_count_query).fetchone()[0]
+
+def check_student_stats():
+    # --- Compares StudentStats with a full GROUP BY over Students ---
+    # --- Returns [(House, Year, stored count, actual count)] for every mismatch; empty means consistent ---
+    con = get_connection()
+    stored = {(house, year): count for house, year, count in con.execute("SELECT House, Year, StudentCount FROM StudentStats;")}
+    actual = {(house, year): count for house, year, count in con.execute(student_stats_actual_query)}
+    return [(house, year, stored.get((house, year), 0), actual.get((house, year), 0))
+            for house, year in sorted(set(stored) | set(actual), key=str)
+            if stored.get((house, year), 0) != actual.get((house, year), 0)]
+
+def rebuild_student_stats(cursor=None):
+    # --- Recomputes StudentStats from Students in one statement pair ---
+    own_cursor = cursor is None
+    cursor = cursor or get_connection().cursor()
+    cursor.execute("DELETE FROM StudentStats;")
+    cursor.execute("INSERT INTO StudentStats (House, Year, StudentCount) " + student_stats_actual_query)
+    if own_cursor:
+        cursor.connection.commit()
+        cursor.close()
+
+# --- Query plan diagnostics ---
+
+def explain_queries():
+    # --- Runs EXPLAIN QUERY PLAN on every predefined query ---
+    # --- Returns (name, plan lines, unexpected full scan?) for each, in definition order ---
+    cur = get_cursor()
+    results = []
+    for name, (query, params) in predefined_queries.items():
+        cur.execute("EXPLAIN QUERY PLAN " + query, params)
+        plan = [row[3] for row in cur.fetchall()]
+        scans = any(step.startswith("SCAN") for step in plan)
+        results.append((name, plan, scans and name not in full_scan_expected))
+    return results
+
+# --- Windowed reads: only the requested slice of rows leaves SQLite ---
+
+def _glob_prefix(value):
+    # --- Escapes GLOB wildcards so the value matches literally, then appends '*' for a prefix match ---
+    # --- GLOB is case sensitive, so SQLite can answer it with a range search on the column's index ---
+    return "".join(f"[{ch}]" if ch in "*?[" else ch for ch in value) + "*"
+
+def _window_filter(table, filter_column, filter_value):
+    # --- Builds the WHERE clause for a grid filter; column names are checked against listable_tables ---
+    spec = listable_tables[table]
+    if not filter_column or filter_value in (None, ""):
+        return "", ()
+    if filter_column not in spec["columns"] and filter_column != spec["key"]:
+        raise ValueError(f"Cannot filter {table} by {filter_column}.")
+    if filter_column in spec["text"]:
+        return f" WHERE {filter_column} GLOB ?", (_glob_prefix(filter_value),)
+    return f" WHERE {filter_column} = ?", (filter_value,)
+
+def count_rows(table, filter_column=None, filter_value=None):
+    # --- Counts the rows a grid would show (cached for reference tables) ---
+    # --- Unfiltered, house and year counts of Students come from StudentStats instead of a COUNT(*) scan ---
+    where, params = _window_filter(table, filter_column, filter_value)
+    if table == "Students" and (not where or filter_column in ("House", "Year")):
+        query = f"SELECT COALESCE(SUM(StudentCount), 0) FROM StudentStats{where};"
+    else:
+        query = f"SELECT COUNT(*) FROM {table}{where};"
+    return cache.cached(table, (query, params), lambda: get_cursor().execute(query, params).fetchone()[0])
+
+def fetch_window(table, offset, limit, sort_column=None, descending=False, filter_column=None, filter_value=None,
+                 after=None, before=None):
+    # --- Returns rows [offset, offset + limit) of a table, sorted and filtered in SQL (cached for reference tables) ---
+    # --- Each row ends with the table's key. after/before are (sort value, key) of the row just before/after the
+    # --- window; with one, the window is a keyset seek from that row and offset is ignored. Nullable sort
+    # --- columns don't compare as row values, so they always use the offset ---
+    spec = listable_tables[table]
+    key = spec["key"]
+    if limit < 1:
+        raise ValueError("A window needs a limit of at least 1.")
+    if sort_column and sort_column not in spec["columns"] and sort_column != key:
+        raise ValueError(f"Cannot sort {table} by {sort_column}.")
+    sort_column = sort_column if sort_column and sort_column != key else None
+    if sort_column in spec.get("nullable", ()):
+        after = before = None
+    where, params = _window_filter(table, filter_column, filter_value)
+    backwards = before is not None and after is None
+    boundary = after if after is not None else before
+    if boundary is not None:
+        op = "<" if descending != backwards else ">"
+        seek = f"({sort_column}, {key}) {op} (?, ?)" if sort_column else f"{key} {op} ?"
+        where = f"{where} AND {seek}" if where else f" WHERE {seek}"
+        params += tuple(boundary) if sort_column else (boundary[1],)
+    direction = "DESC" if descending != backwards else "ASC"
+    order = f"{sort_column} {direction}, {key} {direction}" if sort_column else f"{key} {direction}"
+    query = f"SELECT {', '.join(spec['columns'])}, {key} FROM {table}{where} ORDER BY {order} LIMIT ?"
+    query += ";" if boundary is not None else " OFFSET ?;"
+    params += (limit,) if boundary is not None else (limit, offset)
+
+    def run():
+        rows = get_cursor().execute(query, params).fetchall()
+        return tuple(reversed(rows)) if backwards else tuple(rows)
+    return cache.cached(table, (query, params), run)
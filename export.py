@@ -0,0 +1,161 @@
+# Hogwarts Exporter
+# --------------------------
+# This script streams Students, Teachers, or Courses (optionally filtered) from the database to a file.
+# Features: CSV, JSONL and Parquet output with optional gzip, written a fetchmany batch at a time
+# so memory stays bounded however many rows are exported. Parquet needs pyarrow (optional).
+
+import csv
+import gzip
+import importlib.util
+import json
+import os
+import time
+import database_design as d
+import logger as l
+import repository as r
+
+DEFAULT_BATCH_SIZE = 10_000         # Rows fetched and written per batch
+GZIP_LEVEL = 6                      # zlib's default; level 9 is several times slower for a few percent
+
+FORMATS = ("csv", "jsonl", "parquet")
+
+# --- CLI table names -> repositories ---
+TABLES = {
+    "students": r.students,
+    "teachers": r.admins,
+    "courses":  r.courses,
+}
+
+
+class ExportReport:
+    # --- Summary of one export run ---
+    def __init__(self, table, path, fmt, compressed):
+        self.table = table
+        self.path = path
+        self.format = fmt
+        self.compressed = compressed
+        self.rows = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def as_dict(self):
+        return {"Table": self.table, "File": self.path, "Format": self.format, "Gzip": self.compressed,
+                "Rows": self.rows, "Bytes": self.bytes, "Seconds": round(self.seconds, 3)}
+
+
+def detect_format(path):
+    # --- (format, gzip?) from the file extension, e.g. students.jsonl.gz -> ("jsonl", True) ---
+    base, ext = os.path.splitext(path.lower())
+    compressed = ext == ".gz"
+    if compressed:
+        ext = os.path.splitext(base)[1]
+    fmt = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".parquet": "parquet"}.get(ext)
+    if fmt is None:
+        raise ValueError(f"Cannot tell the format of '{path}'; use .csv, .jsonl or .parquet (optionally .gz) or pass fmt.")
+    return fmt, compressed
+
+
+# --- Writers: each takes the open file (or path for Parquet), the column names and an iterator of row batches ---
+
+def _write_csv(f, columns, batches):
+    writer = csv.writer(f)
+    writer.writerow(columns)
+    for rows in batches:
+        writer.writerows(rows)
+        yield len(rows)
+
+def _write_jsonl(f, columns, batches):
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    for rows in batches:
+        f.write("".join(encode(dict(zip(columns, row))) + "\n" for row in rows))
+        yield len(rows)
+
+def _write_parquet(path, columns, batches, compressed):
+    # --- One row group per batch; gzip selects Parquet's own GZIP codec instead of wrapping the file ---
+    # --- pyarrow is optional and slow to import, so it is loaded here rather than on every CLI start ---
+    import pyarrow
+    import pyarrow.parquet
+    writer = None
+    try:
+        for rows in batches:
+            table = pyarrow.Table.from_pydict({column: [row[i] for row in rows] for i, column in enumerate(columns)})
+            if writer is None:
+                writer = pyarrow.parquet.ParquetWriter(path, table.schema, compression="gzip" if compressed else "snappy")
+            writer.write_table(table.cast(writer.schema))
+            yield len(rows)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def export_table(path, table, fmt=None, compress=None, batch_size=DEFAULT_BATCH_SIZE, **filters):
+    # --- Streams a table ("students", "teachers" or "courses") to path; returns an ExportReport ---
+    # --- Filters select a view, e.g. export_table("s.csv", "students", House="Slytherin", Year=7, Course="Potions") ---
+    # --- fmt and compress default to what the file extension says ---
+    table = table.lower()
+    if table not in TABLES:
+        raise ValueError(f"Unknown table '{table}'. Choose one of: {', '.join(TABLES)}.")
+    if fmt is None:
+        fmt, detected_gzip = detect_format(path)
+    else:
+        detected_gzip = path.lower().endswith(".gz")
+    compress = detected_gzip if compress is None else compress
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format '{fmt}'. Choose one of: {', '.join(FORMATS)}.")
+    if fmt == "parquet" and importlib.util.find_spec("pyarrow") is None:       # --- Found without importing it ---
+        raise ValueError("Parquet export needs pyarrow (pip install pyarrow); use csv or jsonl instead.")
+
+    repository = TABLES[table]
+    columns = list(repository.record._fields)
+    query, params = repository.select_where(**filters)
+    batches = d.iter_batches(query, params, batch_size)
+
+    report = ExportReport(table, path, fmt, compress)
+    started = time.perf_counter()
+    tmp_path = path + ".tmp"            # --- A failed export never leaves a truncated file under the real name ---
+    try:
+        if fmt == "parquet":
+            for count in _write_parquet(tmp_path, columns, batches, compress):
+                report.rows += count
+        else:
+            write = _write_csv if fmt == "csv" else _write_jsonl
+            if compress:
+                f = gzip.open(tmp_path, 'wt', encoding='utf-8', newline='', compresslevel=GZIP_LEVEL)
+            else:
+                f = open(tmp_path, 'w', encoding='utf-8', newline='')
+            with f:
+                for count in write(f, columns, batches):
+                    report.rows += count
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        report.seconds = time.perf_counter() - started
+    report.bytes = os.path.getsize(path)
+
+    l.log_event("Export!", {**report.as_dict(), "Filter": {k: v for k, v in filters.items() if v is not None}})
+    return report
+
+
+def run_export(path, table, fmt=None, compress=None, batch_size=DEFAULT_BATCH_SIZE, **filters):
+    # --- Terminal front end for export_table: prints a summary ---
+    try:
+        report = export_table(path, table, fmt=fmt, compress=compress, batch_size=batch_size, **filters)
+    except ValueError as e:
+        print(e)                            # --- Unknown table or format, or no pyarrow: the message says what to do ---
+        l.log_error("Failed to export data", details={"File": path, "Table": table, "Exception": str(e)})
+        return None
+    except Exception as e:
+        print("An error occurred while exporting data. Please check the hogwarts_error_log file for more information.")
+        l.log_error("Failed to export data", details={"File": path, "Table": table, "Exception": str(e)})
+        return None
+
+    print(f"Exported {report.rows} {report.table} rows to {path} ({report.format}{', gzip' if report.compressed else ''}, "
+          f"{report.bytes:,} bytes) in {report.seconds:.2f}s ({report.rows_per_second:,.0f} rows/s).")
+    return report
@@ -0,0 +1,182 @@
+# Hogwarts Group Commit
+# --------------------------
+# This script coalesces single-row writes from concurrent callers into shared transactions.
+# Features: Writes are queued to one writer thread, which runs them in a single transaction that
+# is committed once MAX_BATCH_OPS writes are waiting or MAX_BATCH_DELAY_MS has passed since the
+# first one, so one commit (and its fsync) is paid per batch instead of per write. Every write
+# runs in its own savepoint, so a failing write is rolled back alone. Each caller gets a Future
+# that resolves after the commit containing its write.
+#
+# Durability follows database_design.PRAGMAS: with synchronous=NORMAL a committed batch survives
+# an application crash; set synchronous=FULL to also survive power loss.
+
+import queue
+import threading
+import time
+import database_design as d
+
+MAX_BATCH_DELAY_MS = 5              # Longest a write waits for others to share its commit
+MAX_BATCH_OPS = 256                 # Commit as soon as this many writes are queued
+
+_writer = None                      # Running _GroupCommitWriter, or None when writes commit individually
+_writer_lock = threading.Lock()
+
+
+class _GroupCommitWriter:
+    # --- Drains queued writes on a dedicated thread and commits them in batches ---
+    _STOP = object()
+
+    def __init__(self, max_delay_ms, max_ops):
+        self.max_delay = max_delay_ms / 1000
+        self.max_ops = max_ops
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.closed = False                 # --- Set by stop(); later writes are refused so none is left behind ---
+        self.batches = 0
+        self.writes = 0
+        self.thread = threading.Thread(target=self._run, name="hogwarts-group-commit", daemon=True)
+        self.thread.start()
+
+    def put(self, item):
+        # --- False once stopped: every accepted item is queued ahead of _STOP, so the writer commits it ---
+        with self.lock:
+            if self.closed:
+                return False
+            self.queue.put(item)
+            return True
+
+    def stop(self, timeout=None):
+        with self.lock:
+            if not self.closed:
+                self.closed = True
+                self.queue.put(self._STOP)
+        self.thread.join(timeout)
+
+    def _commit_batch(self, batch):
+        # --- One transaction for the batch; each write in its own savepoint ---
+        batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        con = d.get_connection()
+        results = []
+        try:
+            con.execute("BEGIN IMMEDIATE;")
+            for work, on_commit, future in batch:
+                con.execute("SAVEPOINT group_write;")
+                try:
+                    results.append((True, work(con)))
+                except Exception as e:
+                    con.execute("ROLLBACK TO group_write;")
+                    results.append((False, e))
+                con.execute("RELEASE group_write;")
+            con.commit()
+        except Exception as e:
+            # --- The transaction itself failed (e.g. the database stayed locked): nothing was written ---
+            if con.in_transaction:
+                con.rollback()
+            for work, on_commit, future in batch:
+                future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.writes += len(batch)
+        for (work, on_commit, future), (ok, value) in zip(batch, results):
+            if not ok:
+                future.set_exception(value)
+                continue
+            try:
+                if on_commit is not None:
+                    on_commit(value)            # --- e.g. cache invalidation, before the caller can read again ---
+            except Exception as e:
+                print(f"Group commit callback failed: {e}")
+            future.set_result(value)
+
+    def _run(self):
+        batch = []
+        deadline = None
+        stopped = RuntimeError("Group commit stopped before this write was committed.")
+        try:
+            while True:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+
+                if item is self._STOP:
+                    while not self.queue.empty():         # --- Writes that raced stop() still get committed ---
+                        batch.append(self.queue.get_nowait())
+                    self._commit_batch(batch)
+                    batch = []
+                    return
+                if item is not None:
+                    batch.append(item)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.max_delay
+
+                if batch and (len(batch) >= self.max_ops or time.monotonic() >= deadline):
+                    self._commit_batch(batch)
+                    batch, deadline = [], None
+        finally:
+            # --- If the loop died, fail what it still held so no caller waits forever ---
+            with self.lock:
+                self.closed = True
+            while not self.queue.empty():
+                item = self.queue.get_nowait()
+                if item is not self._STOP:
+                    batch.append(item)
+            for work, on_commit, future in batch:
+                if future.running() or (not future.done() and future.set_running_or_notify_cancel()):
+                    future.set_exception(stopped)
+            d.close_connection()
+
+
+def start(max_delay_ms=None, max_ops=None):
+    # --- Routes single-row repository writes through the group-commit writer; safe to call more than once ---
+    global _writer
+    with _writer_lock:
+        if _writer is None or _writer.closed:
+            _writer = _GroupCommitWriter(MAX_BATCH_DELAY_MS if max_delay_ms is None else max_delay_ms,
+                                         max_ops or MAX_BATCH_OPS)
+    return _writer
+
+def stop():
+    # --- Commits whatever is queued, then returns to one commit per write ---
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.stop()
+
+def active():
+    return _writer is not None
+
+def submit(work, on_commit=None):
+    # --- Queues work(connection) and returns a Future for its result, set once the batch has committed ---
+    # --- on_commit(result) runs on the writer thread after the commit and before the Future resolves ---
+    # --- When the writer isn't running (or has been stopped) the write commits on its own right away ---
+    from concurrent.futures import Future   # --- Loaded on first use; it costs every CLI start otherwise ---
+    future = Future()
+    writer = _writer
+    if writer is not None and writer.put((work, on_commit, future)):
+        return future
+    future.set_running_or_notify_cancel()
+    con = d.get_connection()
+    try:
+        result = work(con)
+        con.commit()
+    except Exception as e:
+        con.rollback()
+        future.set_exception(e)
+        return future
+    if on_commit is not None:
+        on_commit(result)
+    future.set_result(result)
+    return future
+
+def stats():
+    writer = _writer
+    if writer is None:
+        return {"Active": False}
+    return {"Active": True, "Batches": writer.batches, "Writes": writer.writes,
+            "Writes Per Commit": round(writer.writes / writer.batches, 1) if writer.batches else 0.0}
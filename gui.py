@@ -1,7 +1,7 @@
 # Hogwarts Database Manager - GUI
 # -------------------------------
 # This script provides a graphical user interface (GUI) to manage Students, Teachers, and Courses at Hogwarts.
-# Features: Add, View, and Delete records, with integrated logging for all actions.
+# Features: Add, View, Search, Enroll, and Delete records, analytics reports, with integrated logging for all actions.
 
 
 # - MODULES -
@@ -9,14 +9,20 @@ import os
 import tkinter as tk
 from tkinter import messagebox, ttk
 import database_design as d
-from logger import log_event
+import repository as r
+from logger import flush as flush_logs
+from gui_grid import VirtualGrid
+from gui_search import SearchPanel
+from gui_enrollments import EnrollmentsPanel
+from gui_reports import ReportsPanel
+from gui_worker import DbExecutor
 
 class HogwartsGUI:
     # - INITIALIZE THE GUI -
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("Hogwarts Management System")
-        self.root.geometry("400x500")
+        self.root.geometry("400x650")
         self.root.resizable(False, False)
         self.root.option_add("*Font", "Arial 11")
 
@@ -28,13 +34,21 @@ class HogwartsGUI:
         style.configure("TButton", background="#444", foreground="white", font=("Arial", 10, "bold"))
         style.map("TButton", background=[("active", "#555")])
         
+        self.db = DbExecutor(self.root)     # - Database work runs on background threads
         self.setup_main_menu()  # - Setup main menu
         self.center_window()    # - Center window
+        self.root.protocol("WM_DELETE_WINDOW", self.exit)   # - Closing the window exits cleanly too
 
     # - START TKINTER MAIN LOOP -
     def run(self):
         self.root.mainloop()
         
+    # - EXIT: FLUSH QUEUED LOG ENTRIES, THEN LEAVE THE MAIN LOOP -
+    def exit(self):
+        self.db.shutdown()      # - - Let queued database work finish
+        flush_logs()
+        self.root.quit()
+
     # - MAIN MENU -
     def setup_main_menu(self):
         ttk.Label(self.root, text="Hogwarts Management", font=("Arial", 16)).pack(pady=10)
@@ -46,13 +60,17 @@ class HogwartsGUI:
             ("View Professors"  , self.view_professors),
             ("View Courses"     , self.view_courses),
             ("Delete Record"    , self.delete_record),
-            ("Exit"             , self.root.quit)]
+            ("Dashboard"        , self.view_dashboard),
+            ("Search"           , self.search_records),
+            ("Enrollments"      , self.view_enrollments),
+            ("Reports"          , self.view_reports),
+            ("Exit"             , self.exit)]
 
         for label, command in options:
             ttk.Button(self.root, text=label, width=30, command=command).pack(pady=5)   # - Buttons for the main menu
 
     # - CENTER WINDOW ON SCREEN -
-    def center_window(self, width=400, height=500):             # V - FOR WINDOW POSITION - V
+    def center_window(self, width=400, height=650):             # V - FOR WINDOW POSITION - V
         screen_width  = self.root.winfo_screenwidth()                   #Width
         screen_height = self.root.winfo_screenheight()                  #Height
         x = int((screen_width  / 2) - (width / 2))                      #X coordinate
@@ -61,56 +79,64 @@ class HogwartsGUI:
 
     # - ADD and SUBTMIT [ STUDENT ] -
     def add_student(self):
-        fields = [("Name", ""), ("House", ["Gryffindor", "Slytherin", "Hufflepuff", "Ravenclaw"]), ("Year", "")]        # - Fields for student
+        fields = [("Name", ""), ("House", d.VALID_HOUSES), ("Year", "")]        # - Fields for student
         self.open_form("Add Student", fields, self.submit_student)
     
-    def submit_student(self, inputs):
+    def submit_student(self, inputs, on_finished):
         name, house, year = inputs                                  
-        if year not in ['1', '2', '3', '4', '5', '6', '7']:
-            messagebox.showerror("Error", "Invalid year.")          # - - VALIDATION
-            return
-        if house not in ['Gryffindor', 'Slytherin', 'Hufflepuff', 'Ravenclaw']:
-            messagebox.showerror("Error", "Invalid house.")         # - - VALIDATION
+        error = d.validate_student(house, year)
+        if error:
+            messagebox.showerror("Error", error)                    # - - VALIDATION
+            on_finished(False)
             return
         
-        d.cur.execute(d.insert_student_query, (name, house, year))    # - - insert student into database
-        d.con.commit()
-        
-        d.l.log_event("Student Added!", {"Name": name, "House": house, "Year": year})  # - - LOGGING
-        messagebox.showinfo("Success", f"Student '{name}' added.")
+        def work(job):
+            r.students.add(name, house, year)           # - - insert student into database (logged by the repository)
+
+        self.run_write(work, f"Student '{name}' added.", on_finished)
 
     # - ADD and SUBMIT [ TEACHER ] -
     def add_teacher(self):
         self.open_form("Add Teacher", [("Name", ""), ("Course ID", "")], self.submit_teacher)   # - - Fields for teacher
 
-    def submit_teacher(self, inputs):
+    def submit_teacher(self, inputs, on_finished):
         name, course_id = inputs
         
-        d.cur.execute(d.insert_admin_query, (name, course_id))        # - - insert teacher into database
-        d.con.commit()
-        
-        d.l.log_event("Teacher Added!", {"Name": name, "Course ID": course_id})        # - - LOGGING
-        messagebox.showinfo("Success", f"Teacher '{name}' added.")
+        def work(job):
+            r.admins.add(name, course_id)               # - - insert teacher into database (logged by the repository)
+
+        self.run_write(work, f"Teacher '{name}' added.", on_finished)
 
     # - ADD and SUBMIT [ COURSE ] -
     def add_course(self):
         self.open_form("Add Course", [("Course Name", "")], self.submit_course)                 # - - Fields for course
 
-    def submit_course(self, inputs):
+    def submit_course(self, inputs, on_finished):
         course_name = inputs[0] 
         
-        d.cur.execute(d.insert_course_query, (course_name,))          # - - insert course into database
-        d.con.commit()
-        
-        d.l.log_event("Course Added!", {"Course Name": course_name})                   # - - LOGGING
-        messagebox.showinfo("Success", f"Course '{course_name}' added.")
+        def work(job):
+            r.courses.add(course_name)                  # - - insert course into database (logged by the repository)
+
+        self.run_write(work, f"Course '{course_name}' added.", on_finished)
+
+    # - RUN A WRITE IN THE BACKGROUND, THEN REPORT BACK ON THE TK THREAD -
+    def run_write(self, work, success_message, on_finished):
+        def done(result):
+            messagebox.showinfo("Success", success_message)
+            on_finished(True)
+
+        def failed(error):
+            messagebox.showerror("Error", f"Failed to save: {error}")
+            on_finished(False)
+
+        self.db.submit(work, on_done=done, on_error=failed)
 
     
     # - FOR RECORD DELETION -
     def delete_record(self):
         delete_window = tk.Toplevel(self.root)                      # - - Creates new window for deleting
         delete_window.title("Delete Record")
-        delete_window.geometry("500x150")
+        delete_window.geometry("500x380")
         delete_window.resizable(False, False)
 
         frame = ttk.Frame(delete_window, padding=10, style="TFrame")    # - - Frame for layout
@@ -140,31 +166,102 @@ class HogwartsGUI:
                 messagebox.showerror("Error", "Please enter a name.")       # - - VALIDATION
                 return
 
-            # - DELETE RECORD CONFIRMATION -
-            confirm = messagebox.askyesno("Confirm Deletion", f"Are you sure you want to delete '{name}' from {table}?")
-            if not confirm:         # - - Cancel Deletion
-                messagebox.showinfo("Cancelled", "Deletion cancelled.")
-                return
+            repository = r.by_table[table]
 
-            try:
-                if table   == "Students":
-                    d.cur.execute("DELETE FROM Students WHERE Name = ?;", (name,))         # - - Delete student
-                elif table == "Courses":
-                    d.cur.execute("DELETE FROM Courses WHERE CourseName = ?;", (name,))    # - - Delete course
-                elif table == "HogwartAdmin":
-                    d.cur.execute("DELETE FROM HogwartAdmin WHERE Name = ?;", (name,))     # - - Delete teacher
-                d.con.commit()
-
-                messagebox.showinfo("Success", f"{table[:-1]} '{name}' deleted successfully.")  
-                log_event(f"{table[:-1]} Deleted", {"Name": name})  # - - LOGGING
-                
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to delete: {e}")     # - - ERROR HANDLING
+            def work(job):
+                return repository.delete(name)          # - - Delete every match (logged by the repository)
+
+            def done(deleted):
+                if deleted:
+                    messagebox.showinfo("Success", f"{deleted} record(s) named '{name}' deleted from {table}.")
+                else:
+                    messagebox.showinfo("Not Found", f"No record named '{name}' in {table}.")
+
+            def failed(error):
+                messagebox.showerror("Error", f"Failed to delete: {error}")     # - - ERROR HANDLING
+                delete_button.state(["!disabled"])
+
+            # - DELETE RECORD CONFIRMATION (COUNTED FIRST, SO DUPLICATE NAMES ARE CALLED OUT) -
+            def confirm(matches):
+                if not matches:
+                    messagebox.showinfo("Not Found", f"No record named '{name}' in {table}.")
+                    delete_button.state(["!disabled"])
+                    return
+                prompt = (f"Are you sure you want to delete '{name}' from {table}?" if matches == 1 else
+                          f"{matches} records in {table} are named '{name}'. Delete all of them?")
+                if not messagebox.askyesno("Confirm Deletion", prompt):          # - - Cancel Deletion
+                    messagebox.showinfo("Cancelled", "Deletion cancelled.")
+                    delete_button.state(["!disabled"])
+                    return
+                self.db.submit(work, on_done=done, on_error=failed,
+                               on_finally=delete_window.destroy)                # - - Closes deletion window
+
+            delete_button.state(["disabled"])       # - - No second click while the count and delete run
+            self.db.submit(lambda job: repository.delete_where(dry_run=True, **{repository.name_column: name}),
+                           on_done=confirm, on_error=failed)
 
-            delete_window.destroy()     # - - Closes deletion window
-            
         # - BUTTON TO PERFORM DELETION -
-        ttk.Button(frame, text="Delete", style="TButton", command=perform_deletion).grid(row=2, column=1, pady=20, sticky="e")  # - - Button for delete record
+        delete_button = ttk.Button(frame, text="Delete", style="TButton", command=perform_deletion)
+        delete_button.grid(row=2, column=1, pady=20, sticky="e")  # - - Button for delete record
+
+        # - BULK DELETE STUDENTS: BY WIZARDID LIST OR HOUSE / YEAR / COURSE, IN ONE TRANSACTION -
+        ttk.Separator(frame).grid(row=3, column=0, columnspan=2, sticky="ew", pady=5)
+        ttk.Label(frame, text="Bulk Delete Students", style="TLabel").grid(row=4, column=0, columnspan=2, pady=5)
+
+        ttk.Label(frame, text="WizardIDs:", style="TLabel").grid(row=5, column=0, padx=10, pady=5, sticky="e")
+        ids_entry = ttk.Entry(frame)                                    # - - Comma-separated; overrides the filters
+        ids_entry.grid(row=5, column=1, padx=10, pady=5)
+        ttk.Label(frame, text="or House / Year:", style="TLabel").grid(row=6, column=0, padx=10, pady=5, sticky="e")
+        filter_frame = ttk.Frame(frame)
+        filter_frame.grid(row=6, column=1, padx=10, pady=5)
+        house_box = ttk.Combobox(filter_frame, values=["Any"] + d.VALID_HOUSES, state="readonly", width=11)
+        house_box.current(0)
+        house_box.pack(side="left")
+        year_box = ttk.Combobox(filter_frame, values=["Any"] + d.VALID_YEARS, state="readonly", width=4)
+        year_box.current(0)
+        year_box.pack(side="left", padx=(5, 0))
+        ttk.Label(frame, text="Enrolled in Course:", style="TLabel").grid(row=7, column=0, padx=10, pady=5, sticky="e")
+        course_entry = ttk.Entry(frame)
+        course_entry.grid(row=7, column=1, padx=10, pady=5)
+
+        def perform_bulk_deletion():
+            try:
+                ids = [int(part) for part in ids_entry.get().replace(",", " ").split()]
+            except ValueError:
+                messagebox.showerror("Error", "WizardIDs must be whole numbers.")     # - - VALIDATION
+                return
+            filters = {"House":  None if house_box.get() == "Any" else house_box.get(),
+                       "Year":   None if year_box.get() == "Any" else year_box.get(),
+                       "Course": course_entry.get().strip() or None}
+            if not ids and all(value is None for value in filters.values()):
+                messagebox.showerror("Error", "Enter WizardIDs or choose at least one filter.")
+                return
+
+            def delete(dry_run):
+                if ids:
+                    return r.students.delete_ids(ids, dry_run=dry_run)
+                return r.students.delete_where(dry_run=dry_run, **filters)
+
+            def failed(error):
+                messagebox.showerror("Error", f"Failed to delete: {error}")
+                bulk_button.state(["!disabled"])
+
+            def done(deleted):
+                messagebox.showinfo("Success", f"{deleted} students deleted.")        # - - One log entry for the batch
+
+            def confirm(matches):               # - - Dry-run count first, then one transaction
+                if not matches or not messagebox.askyesno("Confirm Deletion", f"Delete {matches} students? This cannot be undone."):
+                    messagebox.showinfo("Cancelled", "No students matched." if not matches else "Deletion cancelled.")
+                    bulk_button.state(["!disabled"])
+                    return
+                self.db.submit(lambda job: delete(False), on_done=done, on_error=failed,
+                               on_finally=delete_window.destroy)
+
+            bulk_button.state(["disabled"])
+            self.db.submit(lambda job: delete(True), on_done=confirm, on_error=failed)
+
+        bulk_button = ttk.Button(frame, text="Bulk Delete", style="TButton", command=perform_bulk_deletion)
+        bulk_button.grid(row=8, column=1, pady=10, sticky="e")
 
     # - CREATE NEW WINDOW WITH FIELDS FOR DATA ENTRY -
     def open_form(self, title, fields, callback):
@@ -190,36 +287,87 @@ class HogwartsGUI:
                 entries.append(entry)
                 
         # - SUBMIT BUTTON FOR FORM -
+        def finished(success):
+            if success:
+                form.destroy()                   # - - Close form window
+            else:
+                submit_button.state(["!disabled"])  # - - Let the user fix the input and retry
+
         def submit():
             inputs = [e.get() for e in entries]  # - - Get values from entry fields
-            callback(inputs)    
-            form.destroy()                       # - - Close form window
+            submit_button.state(["disabled"])    # - - Disabled until the database work finishes
+            callback(inputs, finished)    
 
-        ttk.Button(form, text="Submit", command=submit).grid(row=len(fields), column=1, pady=10)    # - - Button to submit form
+        submit_button = ttk.Button(form, text="Submit", command=submit)
+        submit_button.grid(row=len(fields), column=1, pady=10)    # - - Button to submit form
     
     # - DISPLAY LIST OF STUDENTS, TEACHERS, OR COURSES -
-    def display_list(self, title, data, headers):
+    def display_list(self, title, table, headers):
         window = tk.Toplevel(self.root)             # - - Create new window for list display
         window.title(title)
 
-        outer_frame = ttk.Frame(window, padding=10) # - - Padding
-        outer_frame.pack(fill="both", expand=True)  # - - Fill the window with the frame
-    
-        for i, header in enumerate(headers):        # - - Enumerate through the headers
-            ttk.Label(outer_frame, text=header, font=("Arial", 10, "bold")).grid(row=0, column=i, padx=10, pady=5)    # - - Header labels
+        grid = VirtualGrid(window, table, headers, self.db)  # - - Rows are fetched in the background as they scroll into view
+        grid.pack(fill="both", expand=True)         # - - Fill the window with the grid
 
-        for r, row in enumerate(data, start=1):                                                 # - - Data rows
-            for c, item in enumerate(row):          # - - Enumerate through EACH ITEM in the row
-                ttk.Label(outer_frame, text=str(item)).grid(row=r, column=c, padx=10, pady=5)   # - - Data labels
-                          
     def view_students(self):
-        d.cur.execute(d.student_list_query)
-        self.display_list("Students", d.cur.fetchall(), ["Name", "House", "Year"])             # - DISPLAY STUDENT LIST
+        self.display_list("Students", "Students", ["Name", "House", "Year"])                 # - DISPLAY STUDENT LIST
 
     def view_professors(self):
-        d.cur.execute(d.admin_list_query)
-        self.display_list("Professors", d.cur.fetchall(), ["WizardID", "Name", "CourseID"])    # - DISPLAY ADMIN LIST
+        self.display_list("Professors", "HogwartAdmin", ["WizardID", "Name", "CourseID"])   # - DISPLAY ADMIN LIST
 
     def view_courses(self):
-        d.cur.execute(d.course_list_query)
-        self.display_list("Courses", d.cur.fetchall(), ["CourseID", "CourseName"])             # - DISPLAY COURSE LIST
+        self.display_list("Courses", "Courses", ["CourseID", "CourseName"])                  # - DISPLAY COURSE LIST
+
+    # - HOUSE / YEAR DASHBOARD (READ FROM THE StudentStats SUMMARY TABLE) -
+    def view_dashboard(self):
+        window = tk.Toplevel(self.root)
+        window.title("Student Dashboard")
+
+        frame = ttk.Frame(window, padding=10)
+        frame.pack(fill="both", expand=True)
+
+        years   = [int(year) for year in d.VALID_YEARS]
+        columns = ["House"] + [f"Year {year}" for year in years] + ["Total"]
+        tree    = ttk.Treeview(frame, columns=columns, show="headings", height=len(d.VALID_HOUSES) + 1)
+        for column in columns:
+            tree.heading(column, text=column)
+            tree.column(column, width=90 if column == "House" else 60, anchor="center")
+        tree.pack(fill="both", expand=True)
+
+        def show(counts):
+            counts = {(house, year): count for house, year, count in counts}
+            for house in d.VALID_HOUSES:                                                # - - One row per house
+                row = [counts.get((house, year), 0) for year in years]
+                tree.insert("", "end", values=[house] + row + [sum(row)])
+            totals = [sum(counts.get((house, year), 0) for house in d.VALID_HOUSES) for year in years]
+            tree.insert("", "end", values=["Total"] + totals + [sum(totals)])           # - - Totals row
+
+        self.db.submit(lambda job: d.student_stats(), on_done=show,
+                       on_error=lambda error: messagebox.showerror("Error", f"Failed to load dashboard: {error}"))
+
+    # - SEARCH AS YOU TYPE (FTS5 PREFIX MATCHING, BEST MATCHES FIRST) -
+    def search_records(self):
+        window = tk.Toplevel(self.root)
+        window.title("Search")
+        window.geometry("560x400")
+
+        panel = SearchPanel(window, self.db)        # - - Debounced, cancellable searches on the background workers
+        panel.pack(fill="both", expand=True)
+
+    # - ENROLLMENTS: ROSTERS, STUDENT COURSES, TEACHER LOAD, BULK ENROLL -
+    def view_enrollments(self):
+        window = tk.Toplevel(self.root)
+        window.title("Enrollments")
+        window.geometry("600x450")
+
+        panel = EnrollmentsPanel(window, self.db)
+        panel.pack(fill="both", expand=True, padx=5, pady=5)
+
+    # - ANALYTICS REPORTS (NUMPY OVER THE WHOLE STUDENT BODY) -
+    def view_reports(self):
+        window = tk.Toplevel(self.root)
+        window.title("Reports")
+        window.geometry("760x420")
+
+        panel = ReportsPanel(window, self.db)
+        panel.pack(fill="both", expand=True)
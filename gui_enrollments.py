@@ -0,0 +1,165 @@
+# Hogwarts Database Manager - Enrollments
+# ---------------------------------------
+# This script provides the enrollment and roster window for the GUI.
+# Features: Course rosters filtered by house and year, a student's courses, teacher load,
+#           and bulk enroll/unenroll by student IDs. All queries run on the GUI's DbExecutor.
+
+
+# - MODULES -
+from tkinter import messagebox, ttk
+import database_design as d
+import repository as r
+
+
+class EnrollmentsPanel(ttk.Notebook):
+    # - INITIALIZE THE TABS -
+    def __init__(self, parent, executor):
+        super().__init__(parent)
+        self.executor = executor                    # - - Runs the SQL off the Tk thread
+
+        self.setup_roster_tab()
+        self.setup_student_tab()
+        self.setup_load_tab()
+        self.setup_enroll_tab()
+
+    # - SHARED: A TREEVIEW WITH A SCROLLBAR -
+    def make_tree(self, parent, columns, row):
+        tree = ttk.Treeview(parent, columns=columns, show="headings", height=12)
+        for column in columns:
+            tree.heading(column, text=column)
+            tree.column(column, width=110, anchor="w")
+        tree.grid(row=row, column=0, columnspan=4, sticky="nsew", pady=(5, 0))
+        scrollbar = ttk.Scrollbar(parent, orient="vertical", command=tree.yview)
+        scrollbar.grid(row=row, column=4, sticky="ns", pady=(5, 0))
+        tree.configure(yscrollcommand=scrollbar.set)
+        parent.rowconfigure(row, weight=1)
+        parent.columnconfigure(1, weight=1)
+        return tree
+
+    # - SHARED: RUN A QUERY IN THE BACKGROUND AND FILL A TREE WITH ITS ROWS -
+    def load(self, tree, button, work, empty_message):
+        def show(rows):
+            tree.delete(*tree.get_children())
+            for row in rows:
+                tree.insert("", "end", values=list(row))
+            if not rows:
+                messagebox.showinfo("No Results", empty_message)
+
+        if button is not None:
+            button.state(["disabled"])                                  # - - One load at a time per tab
+        self.executor.submit(work, on_done=show,
+                             on_error=lambda error: messagebox.showerror("Error", f"Failed to load: {error}"),
+                             on_finally=lambda: button is not None and button.state(["!disabled"]))
+
+    # - COURSE ROSTER (COURSE NAME + OPTIONAL HOUSE / YEAR) -
+    def setup_roster_tab(self):
+        tab = ttk.Frame(self, padding=10)
+        self.add(tab, text="Course Roster")
+
+        ttk.Label(tab, text="Course:").grid(row=0, column=0, sticky="e", padx=5, pady=5)
+        course = ttk.Combobox(tab, values=[c.CourseName for c in r.courses.all()])   # - - Cached, so no DB round trip
+        course.grid(row=0, column=1, sticky="ew", padx=5, pady=5)
+        ttk.Label(tab, text="House:").grid(row=1, column=0, sticky="e", padx=5, pady=5)
+        house = ttk.Combobox(tab, values=["Any"] + d.VALID_HOUSES, state="readonly")
+        house.current(0)
+        house.grid(row=1, column=1, sticky="ew", padx=5, pady=5)
+        ttk.Label(tab, text="Year:").grid(row=2, column=0, sticky="e", padx=5, pady=5)
+        year = ttk.Combobox(tab, values=["Any"] + d.VALID_YEARS, state="readonly", width=6)
+        year.current(0)
+        year.grid(row=2, column=1, sticky="w", padx=5, pady=5)
+
+        tree = self.make_tree(tab, ["WizardID", "Name", "House", "Year"], row=4)
+
+        def show_roster():
+            name = course.get().strip()
+            if not name:
+                messagebox.showerror("Error", "Please choose a course.")   # - - VALIDATION
+                return
+            house_value = None if house.get() == "Any" else house.get()
+            year_value  = None if year.get() == "Any" else year.get()
+            self.load(tree, button, lambda job: list(r.enrollments.roster(name, house=house_value, year=year_value)),
+                      f"No matching students enrolled in {name}.")
+
+        button = ttk.Button(tab, text="Show Roster", command=show_roster)
+        button.grid(row=3, column=1, sticky="e", padx=5, pady=5)
+
+    # - COURSES FOR A STUDENT -
+    def setup_student_tab(self):
+        tab = ttk.Frame(self, padding=10)
+        self.add(tab, text="Student Courses")
+
+        ttk.Label(tab, text="Student Name:").grid(row=0, column=0, sticky="e", padx=5, pady=5)
+        name_entry = ttk.Entry(tab)
+        name_entry.grid(row=0, column=1, sticky="ew", padx=5, pady=5)
+
+        tree = self.make_tree(tab, ["WizardID", "Name", "CourseID", "CourseName"], row=1)
+
+        def show_courses(event=None):
+            name = name_entry.get().strip()
+            if not name:
+                messagebox.showerror("Error", "Please enter a name.")      # - - VALIDATION
+                return
+            self.load(tree, button, lambda job: r.enrollments.courses_for(name), f"No enrollments found for '{name}'.")
+
+        button = ttk.Button(tab, text="Show Courses", command=show_courses)
+        button.grid(row=0, column=2, padx=5, pady=5)
+        name_entry.bind("<Return>", show_courses)
+
+    # - TEACHER LOAD (LOADED WHEN THE TAB IS FIRST OPENED) -
+    def setup_load_tab(self):
+        tab = ttk.Frame(self, padding=10)
+        self.add(tab, text="Teacher Load")
+
+        tree = self.make_tree(tab, ["WizardID", "Name", "CourseID", "CourseName", "Students"], row=1)
+
+        def refresh():
+            self.load(tree, button, lambda job: r.enrollments.teacher_load(), "No teachers found.")
+
+        button = ttk.Button(tab, text="Refresh", command=refresh)
+        button.grid(row=0, column=0, sticky="w", padx=5, pady=5)
+        tab.bind("<Map>", lambda event: tree.get_children() or refresh())
+
+    # - BULK ENROLL / UNENROLL BY STUDENT IDS -
+    def setup_enroll_tab(self):
+        tab = ttk.Frame(self, padding=10)
+        self.add(tab, text="Enroll")
+
+        ttk.Label(tab, text="Course ID:").grid(row=0, column=0, sticky="e", padx=5, pady=5)
+        course_entry = ttk.Entry(tab, width=10)
+        course_entry.grid(row=0, column=1, sticky="w", padx=5, pady=5)
+        ttk.Label(tab, text="Student IDs:").grid(row=1, column=0, sticky="e", padx=5, pady=5)
+        ids_entry = ttk.Entry(tab)
+        ids_entry.grid(row=1, column=1, columnspan=2, sticky="ew", padx=5, pady=5)
+        tab.columnconfigure(1, weight=1)
+
+        def submit(unenroll):
+            course_id = course_entry.get().strip()
+            try:
+                student_ids = [int(part) for part in ids_entry.get().replace(",", " ").split()]
+            except ValueError:
+                student_ids = None
+            if not course_id.isdigit() or not student_ids:
+                messagebox.showerror("Error", "Enter a course ID and one or more student IDs (comma-separated).")   # - - VALIDATION
+                return
+            pairs = [(student_id, int(course_id)) for student_id in student_ids]
+
+            def work(job):
+                return r.enrollments.delete_many(pairs) if unenroll else r.enrollments.add_many(pairs)
+
+            def done(changed):
+                verb = "unenrolled from" if unenroll else "enrolled in"
+                messagebox.showinfo("Success", f"{changed} of {len(pairs)} students {verb} course {course_id}.")
+
+            def enable():
+                for button in buttons:
+                    button.state(["!disabled"])
+
+            for button in buttons:
+                button.state(["disabled"])                              # - - No second click while the write runs
+            self.executor.submit(work, on_done=done, on_finally=enable,
+                                 on_error=lambda error: messagebox.showerror("Error", f"Failed to save: {error}"))
+
+        buttons = [ttk.Button(tab, text="Enroll", command=lambda: submit(False)),
+                   ttk.Button(tab, text="Unenroll", command=lambda: submit(True))]
+        buttons[0].grid(row=2, column=1, sticky="e", padx=5, pady=10)
+        buttons[1].grid(row=2, column=2, sticky="w", padx=5, pady=10)
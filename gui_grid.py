@@ -0,0 +1,206 @@
+# Hogwarts Database Manager - Result Grid
+# ---------------------------------------
+# This script provides a virtualized ttk.Treeview grid for the GUI list views.
+# Features: Only the visible rows (plus a prefetch margin) are fetched and rendered,
+#           with sort and filter controls pushed down to SQL. Scrolling next to the cached
+#           rows seeks from the neighbouring row's (sort value, key), so it stays an index
+#           seek however deep the view is; scrollbar jumps fall back to an offset. Loads run
+#           on the GUI's DbExecutor with a progress indicator and a Cancel button.
+
+
+# - MODULES -
+from tkinter import messagebox, ttk
+import database_design as d
+
+
+class VirtualGrid(ttk.Frame):
+    # - INITIALIZE THE GRID -
+    def __init__(self, parent, table, headers, executor, visible_rows=20, prefetch=100):
+        super().__init__(parent, padding=10)
+        self.executor     = executor                # - - Runs the SQL off the Tk thread
+        self.pending      = None                    # - - Load currently in flight
+        self.table        = table
+        self.columns      = d.listable_tables[table]["columns"]
+        self.visible_rows = visible_rows            # - - Rows rendered in the Treeview at once
+        self.prefetch     = prefetch                # - - Extra rows fetched above and below the view
+
+        self.offset       = 0                       # - - Index of the first visible row
+        self.total        = 0                       # - - Rows matching the current filter
+        self.sort_column  = None
+        self.descending   = False
+        self.filter       = (None, None)            # - - (column, value)
+        self.cache_start  = 0                       # - - Offset of the first cached row
+        self.cache        = []                      # - - Rows fetched around the view (each ends with the key)
+
+        self.setup_filter_bar(headers)
+        self.setup_tree(headers)
+        self.reload()
+
+    # - FILTER CONTROLS -
+    def setup_filter_bar(self, headers):
+        bar = ttk.Frame(self)
+        bar.pack(fill="x", pady=(0, 5))
+
+        ttk.Label(bar, text="Filter:").pack(side="left")
+        self.filter_column = ttk.Combobox(bar, values=headers, state="readonly", width=12)     # - - Column to filter on
+        self.filter_column.current(0)
+        self.filter_column.pack(side="left", padx=5)
+
+        self.filter_entry = ttk.Entry(bar, width=18)                                            # - - Value (prefix for text columns)
+        self.filter_entry.pack(side="left", padx=5)
+        self.filter_entry.bind("<Return>", lambda event: self.apply_filter())
+
+        ttk.Button(bar, text="Apply", command=self.apply_filter).pack(side="left", padx=2)
+        ttk.Button(bar, text="Clear", command=self.clear_filter).pack(side="left", padx=2)
+
+        self.status = ttk.Label(bar, text="")                                                   # - - "rows x-y of n"
+        self.status.pack(side="right")
+
+        # - - Shown only while a load is running
+        self.cancel_button = ttk.Button(bar, text="Cancel", command=self.cancel_load)
+        self.progress      = ttk.Progressbar(bar, mode="indeterminate", length=80)
+
+    # - TREEVIEW + SCROLLBAR -
+    def setup_tree(self, headers):
+        body = ttk.Frame(self)
+        body.pack(fill="both", expand=True)
+
+        self.tree = ttk.Treeview(body, columns=self.columns, show="headings", height=self.visible_rows, selectmode="browse")
+        for column, header in zip(self.columns, headers):
+            self.tree.heading(column, text=header, command=lambda c=column: self.sort_by(c))     # - - Click header to sort
+            self.tree.column(column, width=140, anchor="w")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        # - - The scrollbar spans the whole result set; the tree only ever holds one screen of rows
+        self.scrollbar = ttk.Scrollbar(body, orient="vertical", command=self.on_scroll)
+        self.scrollbar.pack(side="right", fill="y")
+
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self.on_wheel)
+        self.tree.bind("<Next>",  lambda event: self.scroll_to(self.offset + self.visible_rows))
+        self.tree.bind("<Prior>", lambda event: self.scroll_to(self.offset - self.visible_rows))
+
+    # - BACKGROUND LOADS (A NEW LOAD CANCELS THE ONE IT REPLACES) -
+    def start_load(self, work, on_done):
+        if self.pending is not None:
+            self.pending.cancel()
+        self.progress.pack(side="right", padx=5)
+        self.cancel_button.pack(side="right")
+        self.progress.start(10)
+        self.status.config(text="Loading...")
+
+        def failed(error):
+            messagebox.showerror("Error", f"Failed to load {self.table}: {error}")
+
+        def finished():
+            if self.pending is job:
+                self.pending = None
+                self.progress.stop()
+                self.progress.pack_forget()
+                self.cancel_button.pack_forget()
+                self.render()
+
+        job = self.pending = self.executor.submit(work, on_done=on_done, on_error=failed, on_finally=finished)
+
+    def cancel_load(self):
+        if self.pending is not None:
+            self.pending.cancel()
+
+    # - RELOAD AFTER SORT/FILTER CHANGES -
+    def reload(self):
+        column, value = self.filter
+        sort_column, descending = self.sort_column, self.descending
+        limit = self.visible_rows + 2 * self.prefetch
+
+        def work(job):
+            total = d.count_rows(self.table, column, value)
+            job.check_cancelled()
+            return total, d.fetch_window(self.table, 0, limit, sort_column, descending, column, value)
+
+        def done(result):
+            self.total, self.cache = result
+            self.cache_start, self.offset = 0, 0
+
+        self.start_load(work, done)
+
+    def apply_filter(self):
+        header = self.filter_column.get()
+        column = self.columns[list(self.filter_column["values"]).index(header)]
+        self.filter = (column, self.filter_entry.get().strip())
+        self.reload()
+
+    def clear_filter(self):
+        self.filter_entry.delete(0, "end")
+        self.filter = (None, None)
+        self.reload()
+
+    def sort_by(self, column):
+        if self.sort_column == column:
+            self.descending = not self.descending       # - - Second click flips the direction
+        else:
+            self.sort_column, self.descending = column, False
+        self.reload()
+
+    # - SCROLLING -
+    def on_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * self.total))
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self.scroll_to(self.offset + int(amount) * step)
+
+    def on_wheel(self, event):
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self.scroll_to(self.offset - 3)
+        else:
+            self.scroll_to(self.offset + 3)
+        return "break"
+
+    def scroll_to(self, offset):
+        self.offset = max(0, min(offset, self.total - self.visible_rows))
+        end = min(self.offset + self.visible_rows, self.total)
+        if self.cache_start <= self.offset and end <= self.cache_start + len(self.cache):
+            self.render()
+        else:
+            self.load_window()
+
+    # - FETCH ONLY WHAT THE VIEW NEEDS -
+    def load_window(self):
+        start = max(0, self.offset - self.prefetch)
+        column, value = self.filter
+        sort_column, descending = self.sort_column, self.descending
+        limit = self.visible_rows + 2 * self.prefetch
+        after  = self.boundary(start - 1)           # - - Row just above the window, if it is cached
+        before = None if after else self.boundary(start + limit)
+
+        def work(job):
+            return d.fetch_window(self.table, start, limit, sort_column, descending, column, value, after, before)
+
+        def done(rows):
+            self.cache_start, self.cache = start, rows
+
+        self.start_load(work, done)
+
+    def boundary(self, index):
+        # - - (sort value, key) of a cached row for a keyset seek, or None if the row isn't cached
+        if not 0 <= index - self.cache_start < len(self.cache):
+            return None
+        row = self.cache[index - self.cache_start]
+        sort_value = row[self.columns.index(self.sort_column)] if self.sort_column in self.columns else None
+        return (sort_value, row[-1])
+
+    def render(self):
+        end  = min(self.offset + self.visible_rows, self.total)
+        rows = self.cache[self.offset - self.cache_start:end - self.cache_start] if self.offset >= self.cache_start else []
+        self.tree.delete(*self.tree.get_children())
+        for row in rows:
+            self.tree.insert("", "end", values=[str(item) for item in row[:len(self.columns)]])
+
+        if self.pending is not None:
+            return                                  # - - Status shows "Loading..." until the load finishes
+        if self.total:
+            self.scrollbar.set(self.offset / self.total, (self.offset + len(rows)) / self.total)
+            self.status.config(text=f"{self.offset + 1}-{self.offset + len(rows)} of {self.total}")
+        else:
+            self.scrollbar.set(0, 1)
+            self.status.config(text="No rows")
@@ -0,0 +1,131 @@
+# Hogwarts Database Manager - Reports
+# -----------------------------------
+# This script provides the analytics report window for the GUI.
+# Features: House/year distribution, cohort sizes, students per teacher by course and enrollments
+#           by month, computed with NumPy (analytics.py) on the GUI's DbExecutor with a progress
+#           bar while columns load. A running report is cancelled when another starts or the window closes.
+
+
+# - MODULES -
+from tkinter import StringVar, messagebox, ttk
+import analytics as a
+
+REPORT_LABELS = {                                   # - Combobox label -> analytics report name
+    "House / Year Distribution"     : "houses",
+    "Cohort Sizes"                  : "cohorts",
+    "Students per Teacher by Course": "courses",
+    "Enrollments by Month"          : "enrollments",
+}
+COURSE_ROWS = 100       # - Courses listed in the course report, busiest first
+
+
+class ReportsPanel(ttk.Frame):
+    # - INITIALIZE THE PANEL -
+    def __init__(self, parent, executor):
+        super().__init__(parent, padding=10)
+        self.executor = executor                    # - - Runs the loading and NumPy work off the Tk thread
+        self.pending  = None                        # - - Report currently in flight
+        self.data     = None                        # - - Columns loaded by the last run, reused until Refresh
+
+        self.setup_controls()
+        self.setup_tree()
+        self.bind("<Destroy>", self.on_destroy)
+        if a.np is None:
+            self.status.config(text="Reports need NumPy (pip install numpy).")
+            self.refresh_button.state(["disabled"])
+        else:
+            self.after_idle(self.run_report)        # - - Show the first report straight away
+
+    # - REPORT CHOICE + REFRESH -
+    def setup_controls(self):
+        bar = ttk.Frame(self)
+        bar.pack(fill="x", pady=(0, 5))
+
+        self.report_var = StringVar(value=next(iter(REPORT_LABELS)))
+        ttk.Combobox(bar, textvariable=self.report_var, state="readonly", width=30,
+                     values=list(REPORT_LABELS)).pack(side="left", padx=5)                    # - - Report to show
+        self.refresh_button = ttk.Button(bar, text="Refresh", command=lambda: self.run_report(reload=True))   # - - Reload from the database
+        self.refresh_button.pack(side="left", padx=5)
+        self.report_var.trace_add("write", lambda *args: self.run_report())                   # - - Switching reports shows it
+
+        self.progress = ttk.Progressbar(self, mode="determinate", maximum=1.0)
+        self.status   = ttk.Label(self, text="Choose a report.")
+
+    # - REPORT TABLE (COLUMNS CHANGE WITH THE REPORT) -
+    def setup_tree(self):
+        body = ttk.Frame(self)
+        body.pack(fill="both", expand=True)
+
+        self.tree = ttk.Treeview(body, show="headings", selectmode="browse")
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar = ttk.Scrollbar(body, orient="vertical", command=self.tree.yview)
+        scrollbar.pack(side="right", fill="y")
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.status.pack(fill="x", pady=(5, 0))
+
+    # - BUILD THE CHOSEN REPORT IN THE BACKGROUND -
+    def run_report(self, reload=False):
+        if a.np is None:
+            return
+        self.cancel_report()
+        name = REPORT_LABELS[self.report_var.get()]
+        data = None if reload else self.data
+
+        def work(job):
+            def progress(label, done, total):
+                job.check_cancelled()               # - - Stop between chunks once superseded
+                job.report_progress(done, total)
+            loaded = data or a.AnalyticsData()
+            loaded.progress = progress
+            try:
+                return a.REPORTS[name](loaded, COURSE_ROWS), loaded
+            finally:
+                loaded.progress = None
+
+        def done(result):
+            if self.pending is job:                 # - - Ignore a result that raced its cancellation
+                report, self.data = result
+                self.show(report)
+
+        def failed(error):
+            if self.pending is job:
+                messagebox.showerror("Error", f"Report failed: {error}")
+
+        def progressed(done, total):
+            self.progress["value"] = done / total if total else 0
+            self.status.config(text=f"Loading {done:,} of {total:,} IDs...")
+
+        def finished():
+            if self.pending is job:
+                self.pending = None
+                self.progress.pack_forget()
+
+        self.progress["value"] = 0
+        self.progress.pack(fill="x", pady=(0, 5), before=self.tree.master)
+        self.status.config(text="Building report...")
+        job = self.pending = self.executor.submit(work, on_done=done, on_error=failed,
+                                                  on_progress=progressed, on_finally=finished)
+
+    def cancel_report(self):
+        if self.pending is not None:
+            self.pending.cancel()
+            self.pending = None
+            self.data = None                        # - - The cancelled job may still be loading into it
+            self.progress.pack_forget()
+
+    # - SHOW A REPORT -
+    def show(self, report):
+        self.tree.delete(*self.tree.get_children())
+        self.tree.configure(columns=report.columns)
+        for column in report.columns:
+            self.tree.heading(column, text=column)
+            self.tree.column(column, width=max(70, 8 * len(column)), anchor="w" if column in ("House", "Course", "Month") else "e")
+        for row in report.rows:
+            self.tree.insert("", "end", values=[a.format_value(value) for value in row])
+        loaded = ", ".join(f"{len(values):,} {label.lower()}" for label, values in self.data.columns.items())
+        self.status.config(text=f"{report.title}: loaded {loaded} in {self.data.load_seconds:.2f}s.")
+
+    # - WINDOW CLOSED: STOP ANY REPORT STILL RUNNING -
+    def on_destroy(self, event):
+        if event.widget is self:
+            self.cancel_report()
@@ -0,0 +1,150 @@
+# Hogwarts Database Manager - Search Panel
+# ---------------------------------------
+# This script provides the search-as-you-type panel for the GUI.
+# Features: Keystrokes are debounced, a new search cancels (and interrupts) the one it replaces,
+#           every query is capped with a LIMIT, and results are inserted into the Treeview in
+#           small batches so typing stays responsive however many rows the tables hold.
+
+
+# - MODULES -
+from tkinter import StringVar, messagebox, ttk
+import repository as r
+
+DEBOUNCE_MS   = 250     # - Quiet time after the last keystroke before a search starts
+RESULT_LIMIT  = 100     # - Matches fetched per table
+RENDER_BATCH  = 50      # - Treeview rows inserted per Tk idle slot
+
+
+class SearchPanel(ttk.Frame):
+    # - INITIALIZE THE PANEL -
+    def __init__(self, parent, executor, limit=RESULT_LIMIT, debounce_ms=DEBOUNCE_MS):
+        super().__init__(parent, padding=10)
+        self.executor    = executor                 # - - Runs the SQL off the Tk thread
+        self.limit       = limit
+        self.debounce_ms = debounce_ms
+        self.pending     = None                     # - - Search currently in flight
+        self.timer       = None                     # - - after() id of the debounced search
+        self.render_id   = None                     # - - after() id of the next render batch
+        self.last_search = None                     # - - (text, tables) of the last search started
+
+        self.setup_search_bar()
+        self.setup_tree()
+        self.bind("<Destroy>", self.on_destroy)
+
+    # - SEARCH TEXT + TABLE FILTER -
+    def setup_search_bar(self):
+        bar = ttk.Frame(self)
+        bar.pack(fill="x", pady=(0, 5))
+
+        self.text_var  = StringVar()
+        self.table_var = StringVar(value="All")
+        entry = ttk.Entry(bar, textvariable=self.text_var, width=30)                           # - - Search text
+        entry.pack(side="left", fill="x", expand=True, padx=5)
+        entry.focus_set()
+        ttk.Combobox(bar, textvariable=self.table_var, state="readonly", width=14,
+                     values=["All"] + list(r.by_table)).pack(side="left", padx=5)             # - - Table filter
+
+        self.text_var.trace_add("write", self.schedule)                                        # - - Every edit restarts the debounce
+        self.table_var.trace_add("write", self.schedule)
+
+        self.status   = ttk.Label(self, text="Type a name or the start of one.")
+        self.progress = ttk.Progressbar(bar, mode="indeterminate", length=60)                  # - - Shown while a search runs
+
+    # - RESULT LIST -
+    def setup_tree(self):
+        body = ttk.Frame(self)
+        body.pack(fill="both", expand=True)
+
+        self.tree = ttk.Treeview(body, columns=["Table", "ID", "Name", "Details"], show="headings", selectmode="browse")
+        for column, width in (("Table", 100), ("ID", 60), ("Name", 200), ("Details", 160)):
+            self.tree.heading(column, text=column)
+            self.tree.column(column, width=width, anchor="w")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        scrollbar = ttk.Scrollbar(body, orient="vertical", command=self.tree.yview)
+        scrollbar.pack(side="right", fill="y")
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.status.pack(fill="x", pady=(5, 0))
+
+    # - DEBOUNCE: ONLY THE LAST EDIT IN A BURST STARTS A SEARCH -
+    def schedule(self, *args):
+        if self.timer is not None:
+            self.after_cancel(self.timer)
+        self.timer = self.after(self.debounce_ms, self.search)
+
+    # - START A SEARCH, CANCELLING THE ONE IT SUPERSEDES -
+    def search(self):
+        self.timer = None
+        text   = self.text_var.get().strip()
+        tables = None if self.table_var.get() == "All" else [self.table_var.get()]
+        if (text, tables) == self.last_search:
+            return                                  # - - Nothing changed (e.g. a trailing space)
+        self.last_search = (text, tables)
+        self.cancel_search()
+        if not text:
+            self.show({})
+            return
+        limit = self.limit
+
+        def work(job):
+            results = {}
+            for table in tables or r.by_table:
+                job.check_cancelled()               # - - Stop between tables once superseded
+                results[table] = r.by_table[table].search(text, limit)
+            return results
+
+        def done(results):
+            if self.pending is job:                 # - - Ignore a result that raced its cancellation
+                self.show(results)
+
+        def failed(error):
+            if self.pending is job:
+                messagebox.showerror("Error", f"Search failed: {error}")
+
+        def finished():
+            if self.pending is job:
+                self.pending = None
+                self.progress.stop()
+                self.progress.pack_forget()
+
+        self.progress.pack(side="right", padx=5)
+        self.progress.start(10)
+        job = self.pending = self.executor.submit(work, on_done=done, on_error=failed, on_finally=finished)
+
+    def cancel_search(self):
+        if self.pending is not None:
+            self.pending.cancel()                   # - - Interrupts the statement if it is already running
+            self.pending = None
+            self.progress.stop()
+            self.progress.pack_forget()
+
+    # - RENDER RESULTS A BATCH AT A TIME -
+    def show(self, results):
+        if self.render_id is not None:
+            self.after_cancel(self.render_id)
+            self.render_id = None
+        self.tree.delete(*self.tree.get_children())
+        rows = [(table, record) for table, records in results.items() for record in records]
+        self.status.config(text=f"{len(rows)} matches." if rows else
+                           ("No matches." if self.last_search and self.last_search[0] else "Type a name or the start of one."))
+        self.render_batch(rows, 0)
+
+    def render_batch(self, rows, start):
+        self.render_id = None
+        for table, record in rows[start:start + RENDER_BATCH]:
+            key, name, *details = record                                    # - - ID, name, remaining columns
+            self.tree.insert("", "end", values=[table, key, name, ", ".join(map(str, details))])
+        if start + RENDER_BATCH < len(rows):
+            self.render_id = self.after_idle(self.render_batch, rows, start + RENDER_BATCH)
+
+    # - WINDOW CLOSED: DROP TIMERS AND ANY SEARCH STILL RUNNING -
+    def on_destroy(self, event):
+        if event.widget is not self:
+            return
+        if self.timer is not None:
+            self.after_cancel(self.timer)
+        if self.render_id is not None:
+            self.after_cancel(self.render_id)
+        if self.pending is not None:
+            self.pending.cancel()
+            self.pending = None
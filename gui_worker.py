@@ -0,0 +1,127 @@
+# Hogwarts Database Manager - GUI Worker
+# --------------------------------------
+# This script runs database work for the GUI on background threads.
+# Features: Jobs run off the Tk main thread; results, errors and progress are posted to a
+#           queue that the main thread drains with root.after polling. Jobs can be cancelled,
+#           which also interrupts any SQL statement they are running.
+
+
+# - MODULES -
+import queue
+import threading
+import database_design as d
+
+
+class JobCancelled(Exception):
+    # - RAISED INSIDE A JOB (BY check_cancelled) ONCE IT HAS BEEN CANCELLED -
+    pass
+
+
+class Job:
+    # - ONE UNIT OF BACKGROUND WORK -
+    def __init__(self, executor, work, on_done, on_error, on_progress, on_finally):
+        self.executor    = executor
+        self.work        = work                 # - - Called as work(job) on a worker thread
+        self.on_done     = on_done              # - - on_done(result), on the Tk thread
+        self.on_error    = on_error             # - - on_error(exception), on the Tk thread
+        self.on_progress = on_progress          # - - on_progress(done, total), on the Tk thread
+        self.on_finally  = on_finally           # - - on_finally(), on the Tk thread, always last
+        self.connection  = None                 # - - Worker's connection while the job runs
+        self._cancelled  = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        # - - Stops the job: a running statement is interrupted and callbacks other than on_finally are skipped
+        self._cancelled.set()
+        connection = self.connection
+        if connection is not None:
+            connection.interrupt()
+
+    def check_cancelled(self):
+        if self.cancelled:
+            raise JobCancelled()
+
+    def report_progress(self, done, total=None):
+        # - - Safe to call from the worker; delivered to on_progress on the Tk thread
+        self.executor.results.put((self, "progress", (done, total)))
+
+
+class DbExecutor:
+    # - INITIALIZE WORKER THREADS AND START POLLING -
+    def __init__(self, root, workers=2, poll_ms=50):
+        self.root    = root
+        self.poll_ms = poll_ms
+        self.tasks   = queue.Queue()            # - - Jobs waiting for a worker
+        self.results = queue.Queue()            # - - (job, kind, payload) waiting for the Tk thread
+        self.closed  = False
+        self.threads = [threading.Thread(target=self._worker, name=f"hogwarts-gui-db-{i}", daemon=True)
+                        for i in range(workers)]
+        for thread in self.threads:
+            thread.start()
+        self.root.after(self.poll_ms, self._poll)
+
+    # - QUEUE A JOB -
+    def submit(self, work, on_done=None, on_error=None, on_progress=None, on_finally=None):
+        job = Job(self, work, on_done, on_error, on_progress, on_finally)
+        self.tasks.put(job)
+        return job
+
+    # - STOP WORKERS (JOBS ALREADY QUEUED STILL RUN) -
+    def shutdown(self, wait=True):
+        if self.closed:
+            return
+        self.closed = True
+        for _ in self.threads:
+            self.tasks.put(None)
+        if wait:
+            for thread in self.threads:
+                thread.join()
+
+    # - WORKER THREAD LOOP -
+    def _worker(self):
+        while True:
+            job = self.tasks.get()
+            if job is None:
+                d.close_connection()            # - - Each worker has its own connection
+                return
+            if job.cancelled:
+                self.results.put((job, "cancelled", None))
+                continue
+            try:
+                job.connection = d.get_connection()
+                result = job.work(job)
+            except Exception as e:
+                try:
+                    job.connection.rollback()       # - - Don't leave a half-finished write open
+                except Exception:
+                    pass
+                self.results.put((job, "cancelled" if job.cancelled else "error", e))
+            else:
+                self.results.put((job, "cancelled" if job.cancelled else "done", result))
+            finally:
+                job.connection = None
+
+    # - DELIVER RESULTS ON THE TK MAIN THREAD -
+    def _poll(self):
+        if not self.closed:
+            self.root.after(self.poll_ms, self._poll)   # - - Reschedule first so a failing callback can't stop polling
+        while True:
+            try:
+                job, kind, payload = self.results.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                if kind == "progress":
+                    if job.on_progress and not job.cancelled:
+                        job.on_progress(*payload)
+                    continue
+                if kind == "done" and job.on_done:
+                    job.on_done(payload)
+                elif kind == "error" and job.on_error:
+                    job.on_error(payload)
+            finally:
+                if kind != "progress" and job.on_finally:
+                    job.on_finally()
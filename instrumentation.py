@@ -0,0 +1,238 @@
+# Hogwarts SQL Instrumentation
+# --------------------------
+# This script measures every SQL statement and commit run through database_design connections.
+# Features: Latency histograms per statement template, row counts, commit durations, a slow-query
+# log, and stats saved at shutdown for `python main.py sql-stats`. When disabled (the default),
+# connections are plain sqlite3.Connection objects, so there is no overhead at all.
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import logger as l
+
+STATS_FILE = "hogwarts_sql_stats.json"
+
+# --- Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended ---
+BUCKETS_MS = [0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000]
+
+enabled = os.environ.get("HOGWARTS_SQL_STATS", "") not in ("", "0")
+slow_query_ms = float(os.environ.get("HOGWARTS_SLOW_QUERY_MS", "100"))
+
+_lock = threading.Lock()
+_stats = {}                 # Template -> StatementStats
+
+
+class StatementStats:
+    # --- Aggregates for one statement template ---
+    def __init__(self):
+        self.calls = 0
+        self.rows = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, seconds, rows=0, calls=1):
+        self.calls += calls
+        self.rows += rows
+        self.total_s += seconds
+        self.max_s = max(self.max_s, seconds)
+        ms = seconds * 1000
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms < bound:
+                self.buckets[i] += calls
+                break
+        else:
+            self.buckets[-1] += calls
+
+    def percentile_ms(self, fraction):
+        # --- Upper bound of the bucket holding the given fraction of calls ---
+        target = fraction * self.calls
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                return BUCKETS_MS[i] if i < len(BUCKETS_MS) else round(self.max_s * 1000, 3)
+        return 0.0
+
+    def as_dict(self):
+        return {"calls": self.calls, "rows": self.rows, "total_ms": round(self.total_s * 1000, 3),
+                "mean_ms": round(self.total_s * 1000 / self.calls, 4) if self.calls else 0.0,
+                "max_ms": round(self.max_s * 1000, 3), "p50_ms": self.percentile_ms(0.5),
+                "p95_ms": self.percentile_ms(0.95), "p99_ms": self.percentile_ms(0.99),
+                "buckets": self.buckets}
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.calls = data["calls"]
+        stats.rows = data["rows"]
+        stats.total_s = data["total_ms"] / 1000
+        stats.max_s = data["max_ms"] / 1000
+        stats.buckets = list(data["buckets"])
+        return stats
+
+    def merge(self, other):
+        self.calls += other.calls
+        self.rows += other.rows
+        self.total_s += other.total_s
+        self.max_s = max(self.max_s, other.max_s)
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+
+
+# --- Recording ---
+
+def template(sql):
+    # --- Statements are parameterized, so the normalized SQL text is the template ---
+    return " ".join(sql.split())
+
+def record(sql, seconds, rows=0, calls=1):
+    key = template(sql)
+    with _lock:
+        stats = _stats.get(key)
+        if stats is None:
+            stats = _stats[key] = StatementStats()
+        stats.add(seconds, rows, calls)
+    if seconds * 1000 >= slow_query_ms:
+        l.log_slow_query(key, seconds, rows)
+
+def _record_rows(sql, seconds, rows):
+    # --- Rows fetched after execute() add to the template's row count and time, not its call count ---
+    key = template(sql)
+    with _lock:
+        stats = _stats.get(key)
+        if stats is not None:
+            stats.rows += rows
+            stats.total_s += seconds
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    # --- Times execute/executemany and counts rows as they are fetched ---
+    _sql = None
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._sql = sql
+            record(sql, time.perf_counter() - started, max(self.rowcount, 0))
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._sql = None
+            record(sql, time.perf_counter() - started, max(self.rowcount, 0))
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        if self._sql and row is not None:
+            _record_rows(self._sql, time.perf_counter() - started, 1)
+        return row
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        if self._sql and rows:
+            _record_rows(self._sql, time.perf_counter() - started, len(rows))
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        if self._sql and rows:
+            _record_rows(self._sql, time.perf_counter() - started, len(rows))
+        return rows
+
+    def __next__(self):
+        row = super().__next__()
+        if self._sql:
+            _record_rows(self._sql, 0.0, 1)
+        return row
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    # --- Routes every cursor through InstrumentedCursor and times commits ---
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        started = time.perf_counter()
+        try:
+            return super().commit()
+        finally:
+            record("COMMIT", time.perf_counter() - started)
+
+
+def connection_factory():
+    # --- Class database_design passes to sqlite3.connect ---
+    return InstrumentedConnection if enabled else sqlite3.Connection
+
+def enable(slow_ms=None):
+    # --- Turns instrumentation on for connections opened from now on ---
+    global enabled, slow_query_ms
+    enabled = True
+    if slow_ms is not None:
+        slow_query_ms = slow_ms
+
+def disable():
+    global enabled
+    enabled = False
+
+
+# --- Reporting ---
+
+def snapshot():
+    # --- Current in-process stats: {template: dict} ---
+    with _lock:
+        return {key: stats.as_dict() for key, stats in _stats.items()}
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+def save(path=STATS_FILE):
+    # --- Merges this process's stats into the stats file and clears them; no-op when nothing was recorded ---
+    with _lock:
+        current = dict(_stats)
+        _stats.clear()
+    if not current:
+        return
+    merged = {key: StatementStats.from_dict(data) for key, data in load(path).items()}
+    for key, stats in current.items():
+        if key in merged:
+            merged[key].merge(stats)
+        else:
+            merged[key] = stats
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({key: stats.as_dict() for key, stats in merged.items()}, f, indent=2)
+    os.replace(tmp_path, path)
+
+def load(path=STATS_FILE):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def report(stats, limit=20, sort_by="total_ms"):
+    # --- Prints the busiest statement templates ---
+    if not stats:
+        print("No SQL statistics recorded. Run with --profile-sql or HOGWARTS_SQL_STATS=1 first.")
+        return
+    print(f"{'calls':>8} {'rows':>10} {'total ms':>11} {'mean ms':>9} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>9}  statement")
+    for key, data in sorted(stats.items(), key=lambda item: item[1][sort_by], reverse=True)[:limit]:
+        text = key if len(key) <= 70 else key[:67] + "..."
+        print(f"{data['calls']:>8} {data['rows']:>10} {data['total_ms']:>11.2f} {data['mean_ms']:>9.3f} "
+              f"{data['p95_ms']:>8} {data['p99_ms']:>8} {data['max_ms']:>9.2f}  {text}")
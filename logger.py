@@ -1,13 +1,255 @@
 # Hogwarts Logger
 # --------------------------
 # This script logs events and errors for the Hogwarts Management System.
-# Features: Logs student, teacher, and course actions; tracks errors in JSON format.
+# Features: Logs student, teacher, and course actions; tracks errors in JSON Lines format.
+# Each entry is appended as one line, so a write costs the same no matter how big the history is.
+# Log files are rotated by size and age, and old JSON array logs are migrated once on first use.
+# Optionally, entries are queued and written in batches by a background writer thread, and
+# every batch can be forwarded to sinks such as the SQLite audit store (audit.py).
 
+import atexit
+import glob
 import json
 import os
-from datetime import datetime
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
 
-LOG_FILE = "hogwarts_log.json"
+LOG_FILE = "hogwarts_log.jsonl"
+ERROR_LOG_FILE = "hogwarts_error_log.jsonl"
+SLOW_QUERY_LOG_FILE = "hogwarts_slow_queries.jsonl"
+
+# --- Pre-JSONL log files (one JSON array per file) ---
+LEGACY_LOG_FILE = "hogwarts_log.json"
+LEGACY_ERROR_LOG_FILE = "hogwarts_error_log.json"
+
+# --- Rotation settings ---
+MAX_LOG_BYTES = 10 * 1024 * 1024        # Rotate once the active file would grow past this size
+MAX_LOG_AGE = timedelta(days=7)         # Rotate once the active file's first entry is older than this
+LOG_BACKUP_COUNT = 0                    # Rotated files to keep per log (0 keeps all of them)
+
+_lock = threading.Lock()
+_segment_started = {}                   # Active log path -> timestamp of its first entry
+_migrated = set()                       # Active log paths already checked for a legacy file
+
+# --- Background writer settings ---
+WRITER_BATCH_SIZE = 500                 # Flush once this many entries are queued
+WRITER_FLUSH_INTERVAL = 0.5             # Flush at least this often (seconds) while entries are queued
+
+_writer = None                          # Running _BackgroundWriter, or None for synchronous writes
+_writer_lock = threading.Lock()
+
+_sinks = []                             # Functions called with (path, entries) after each write, e.g. the audit store
+
+
+# --- Helpers ---
+
+def _first_timestamp(path):
+    # --- Reads the timestamp of the first entry in a log file (only the first line is read) ---
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return datetime.fromisoformat(json.loads(f.readline())["Timestamp"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def rotated_files(path):
+    # --- Lists the rotated segments of a log, oldest first ---
+    return sorted(p for p in glob.glob(glob.escape(path) + ".*") if not p.endswith(".tmp"))
+
+def _rotate(path):
+    # --- Moves the active log aside under a timestamped name and prunes old segments ---
+    os.replace(path, f"{path}.{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}")
+    _segment_started.pop(path, None)
+    if LOG_BACKUP_COUNT > 0:
+        for old in rotated_files(path)[:-LOG_BACKUP_COUNT]:
+            os.remove(old)
+
+def _should_rotate(path, incoming_bytes, now):
+    # --- Size check is one stat call; age check uses the cached start time of the segment ---
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return False
+    if size == 0:
+        return False
+    if size + incoming_bytes > MAX_LOG_BYTES:
+        return True
+    if path not in _segment_started:
+        _segment_started[path] = _first_timestamp(path) or now
+    return now - _segment_started[path] > MAX_LOG_AGE
+
+def migrate_legacy_log(legacy_path, path):
+    # --- One-time conversion of a JSON array log into JSON Lines; returns the number of entries moved ---
+    if legacy_path is None or not os.path.exists(legacy_path):
+        return 0
+    try:
+        with open(legacy_path, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+    except json.JSONDecodeError:
+        entries = []
+    if not isinstance(entries, list):
+        entries = [entries]
+
+    # --- Legacy entries are older than anything already in the JSONL file, so they go first ---
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as out:
+        for entry in entries:
+            out.write(json.dumps(entry) + "\n")
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as current:
+                for line in current:
+                    out.write(line)
+    os.replace(tmp_path, path)
+    os.replace(legacy_path, legacy_path + ".migrated")
+    _segment_started.pop(path, None)
+    return len(entries)
+
+def migrate_legacy_logs():
+    # --- Migrates both the event and error logs ---
+    return {
+        LOG_FILE: migrate_legacy_log(LEGACY_LOG_FILE, LOG_FILE),
+        ERROR_LOG_FILE: migrate_legacy_log(LEGACY_ERROR_LOG_FILE, ERROR_LOG_FILE),
+    }
+
+def _write_entries(path, legacy_path, entries):
+    # --- Appends entries as one line each, rotating first if needed ---
+    data = "".join(json.dumps(entry) + "\n" for entry in entries)
+    with _lock:
+        if path not in _migrated:
+            migrate_legacy_log(legacy_path, path)
+            _migrated.add(path)
+        now = datetime.now()
+        if _should_rotate(path, len(data), now):
+            _rotate(path)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(data)
+        _segment_started.setdefault(path, now)
+    for sink in list(_sinks):
+        try:
+            sink(path, entries)
+        except Exception as e:          # --- A failing sink must never lose the file log ---
+            print(f"Failed to forward log entries: {e}")
+
+def add_sink(sink):
+    # --- Registers sink(path, entries) to receive every batch written to any log ---
+    if sink not in _sinks:
+        _sinks.append(sink)
+
+def remove_sink(sink):
+    if sink in _sinks:
+        _sinks.remove(sink)
+
+def _append(path, legacy_path, entry):
+    # --- Hands the entry to the background writer when running, otherwise writes it now ---
+    writer = _writer
+    if writer is None or not writer.put((path, legacy_path, entry)):
+        _write_entries(path, legacy_path, [entry])      # --- Also once the writer is stopping, so nothing is lost ---
+
+
+# --- Background writer ---
+
+class _BackgroundWriter:
+    # --- Drains queued entries on a dedicated thread and writes them in batches ---
+    _STOP = object()
+
+    def __init__(self, batch_size, flush_interval):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.closed = False                 # --- Set by stop(); later entries are written by the caller instead ---
+        self.thread = threading.Thread(target=self._run, name="hogwarts-log-writer", daemon=True)
+        self.thread.start()
+
+    def put(self, item):
+        # --- False once stopped: every accepted item is queued ahead of _STOP, so the thread writes it ---
+        with self.lock:
+            if self.closed:
+                return False
+            self.queue.put(item)
+            return True
+
+    def flush(self, timeout=None):
+        # --- Blocks until everything queued before this call has been written ---
+        done = threading.Event()
+        if not self.put(done):
+            self.thread.join(timeout)       # --- Stopping: the thread writes what is left, then exits ---
+            return not self.thread.is_alive()
+        return done.wait(timeout)
+
+    def stop(self, timeout=None):
+        with self.lock:
+            if not self.closed:
+                self.closed = True
+                self.queue.put(self._STOP)
+        self.thread.join(timeout)
+
+    def _write_batch(self, batch):
+        # --- Groups the batch by file so each file is opened once ---
+        grouped = {}
+        for path, legacy_path, entry in batch:
+            grouped.setdefault((path, legacy_path), []).append(entry)
+        for (path, legacy_path), entries in grouped.items():
+            try:
+                _write_entries(path, legacy_path, entries)
+            except Exception as e:
+                print(f"Failed to write {len(entries)} log entries to {path}: {e}")
+
+    def _run(self):
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is self._STOP:
+                self._write_batch(batch)
+                return
+            if isinstance(item, threading.Event):
+                self._write_batch(batch)
+                batch, deadline = [], None
+                item.set()
+                continue
+            if item is not None:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._write_batch(batch)
+                batch, deadline = [], None
+
+def start_background_writer(batch_size=None, flush_interval=None):
+    # --- Switches logging to queued, batched writes; safe to call more than once ---
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = _BackgroundWriter(batch_size or WRITER_BATCH_SIZE,
+                                        flush_interval or WRITER_FLUSH_INTERVAL)
+            atexit.register(shutdown)
+    return _writer
+
+def flush(timeout=None):
+    # --- Waits until every queued entry is on disk (no-op for synchronous writes) ---
+    writer = _writer
+    if writer is not None:
+        return writer.flush(timeout)
+    return True
+
+def shutdown(timeout=None):
+    # --- Writes out the queue, stops the writer thread and returns to synchronous writes ---
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.stop(timeout)
+
+
+# --- Writers ---
 
 def log_event(event_type, details):
     log_entry = {
@@ -15,18 +257,8 @@ def log_event(event_type, details):
         "Event_Type": event_type,
         "Details": details
     }
-    if not os.path.exists(LOG_FILE):
-        with open(LOG_FILE, 'w') as f:
-            json.dump([log_entry], f, indent=4)
-    else:
-        with open(LOG_FILE, 'r+') as f:
-            data = json.load(f)
-            data.append(log_entry)
-            f.seek(0)
-            json.dump(data, f, indent=4)
-
+    _append(LOG_FILE, LEGACY_LOG_FILE, log_entry)
 
-ERROR_LOG_FILE = "hogwarts_error_log.json"
 
 def log_error(error_message, details=None):
     error_entry = {
@@ -35,17 +267,69 @@ def log_error(error_message, details=None):
         "Details": details if details else {}
     }
     try:
-        if not os.path.exists(ERROR_LOG_FILE):
-            with open(ERROR_LOG_FILE, 'w') as f:
-                json.dump([error_entry], f, indent=4)
-        else:
-            with open(ERROR_LOG_FILE, 'r+') as f:
-                try:
-                    data = json.load(f)
-                except json.JSONDecodeError:
-                    data = []
-                data.append(error_entry)
-                f.seek(0)
-                json.dump(data, f, indent=4)
+        _append(ERROR_LOG_FILE, LEGACY_ERROR_LOG_FILE, error_entry)
     except Exception as e:
         print(f"Failed to log error: {e}")
+
+
+def log_slow_query(statement, seconds, rows=0):
+    # --- Records a statement that ran longer than the instrumentation threshold ---
+    slow_entry = {
+        "Timestamp": datetime.now().isoformat(),
+        "Statement": statement,
+        "Milliseconds": round(seconds * 1000, 3),
+        "Rows": rows
+    }
+    try:
+        _append(SLOW_QUERY_LOG_FILE, None, slow_entry)
+    except Exception as e:
+        print(f"Failed to log slow query: {e}")
+
+
+# --- Readers ---
+
+def read_log(path, since=None, until=None):
+    # --- Streams entries from every segment of a log, oldest first, one line at a time ---
+    # --- since/until are datetimes; malformed lines are skipped ---
+    flush()
+    legacy_path = {LOG_FILE: LEGACY_LOG_FILE, ERROR_LOG_FILE: LEGACY_ERROR_LOG_FILE}.get(path)
+    if legacy_path and path not in _migrated:
+        with _lock:
+            migrate_legacy_log(legacy_path, path)
+            _migrated.add(path)
+
+    for segment in rotated_files(path) + [path]:
+        try:
+            f = open(segment, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            continue
+        with f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if since or until:
+                    try:
+                        stamp = datetime.fromisoformat(entry["Timestamp"])
+                    except (KeyError, TypeError, ValueError):
+                        continue
+                    if since and stamp < since:
+                        continue
+                    if until and stamp >= until:
+                        continue
+                yield entry
+
+def read_events(event_type=None, since=None, until=None):
+    # --- Streams logged events, optionally filtered by event type and time range ---
+    for entry in read_log(LOG_FILE, since, until):
+        if event_type is None or entry.get("Event_Type") == event_type:
+            yield entry
+
+def read_errors(since=None, until=None):
+    # --- Streams logged errors, optionally filtered by time range ---
+    yield from read_log(ERROR_LOG_FILE, since, until)
+
+def read_slow_queries(since=None, until=None):
+    # --- Streams slow-query entries, optionally filtered by time range ---
+    yield from read_log(SLOW_QUERY_LOG_FILE, since, until)
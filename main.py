@@ -2,11 +2,22 @@
 # --------------------------
 # This script launches the Hogwarts Management System GUI.
 # Features: Access to add, view, and delete students, teachers, and courses.
+# Subcommands (e.g. `python main.py import students enrollees.csv`) run without the menu.
 
 
+import argparse
+import json
+import os
+import audit
+import backup
+import cache
+import instrumentation
 import database_design as d
-from gui import HogwartsGUI
+import bulk_import
+import export
+import group_commit
 import logger as l
+import terminal as t
 
 
 def run_terminal():
@@ -21,27 +32,36 @@ def run_terminal():
     print("5. View all Admins")
     print("6. View all Courses")
     print("7. Delete a Record")
-    print("8. Exit")
+    print("8. Student Dashboard")
+    print("9. Search by Name")
+    print("10. Enrollments and Rosters")
+    print("11. Exit")
 
     try:
         validation = True
         while validation:
-            start = input("Enter your choice (1-8): ")
+            start = input("Enter your choice (1-11): ")
             if start   == "1":
-                d.insert_student()
+                t.insert_student()
             elif start == "2":
-                d.insert_admin()
+                t.insert_admin()
             elif start == "3":
-                d.add_course()
+                t.add_course()
             elif start == "4":
-                d.student_list()
+                t.student_list()
             elif start == "5":
-                d.admin_list()
+                t.admin_list()
             elif start == "6":
-                d.course_list()
+                t.course_list()
             elif start == "7":
-                d.delete_record()
+                t.delete_record()
             elif start == "8":
+                t.student_dashboard()
+            elif start == "9":
+                t.search_records()
+            elif start == "10":
+                t.enrollment_menu()
+            elif start == "11":
                 validation = False
                 print("Exiting the program.")
             else:
@@ -52,6 +72,8 @@ def run_terminal():
         l.log_error("Failed to access terminal menu", details={"Exception": str(e)})
 
 def main():
+    l.start_background_writer()     # --- Log writes are queued and flushed in batches off the request path ---
+    audit.enable()                  # --- ...and each batch is mirrored into the indexed audit store ---
     print("\nWelcome to Hogwarts Management System")
     print("=========================================")
     print("Choose an interface:")
@@ -63,6 +85,7 @@ def main():
         if choice == "1":
             run_terminal()
         elif choice == "2":
+            from gui import HogwartsGUI     # --- Tkinter is only loaded when the GUI is chosen ---
             app = HogwartsGUI()
             app.run()
         else:
@@ -71,6 +94,192 @@ def main():
     except Exception as e:    
         print("An error occurred while accessing visual menu. Please check the hogwarts_error_log file for more information.")
         l.log_error("Failed to access visual menu", details={"Exception": str(e)})
+    finally:
+        l.log_event("Reference Cache Stats", cache.stats())   # --- Hit/miss counters for this session ---
+        instrumentation.save()      # --- Merge this session's SQL timings into the stats file ---
+        d.close_all()               # --- Close every thread's database connection ---
+        l.shutdown()                # --- Flush queued log entries before exiting ---
+        audit.close()
+
+# --- Command-line subcommands ---
+cli_tables = {"students": "Students", "teachers": "HogwartAdmin", "courses": "Courses"}    # --- CLI name -> table ---
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Hogwarts Management System. Run without a command for the interactive menu.")
+    parser.add_argument("--db", help="Path to the SQLite database (default: $HOGWARTS_DB or Hogwarts.db)")
+    parser.add_argument("--profile-sql", action="store_true", help="Record SQL timings (also HOGWARTS_SQL_STATS=1); see the sql-stats command")
+    parser.add_argument("--slow-query-ms", type=float, help="Log statements slower than this to the slow-query log (default: 100)")
+    parser.add_argument("--init-db", action="store_true", help="Create or upgrade the database schema and exit")
+    commands = parser.add_subparsers(dest="command")
+
+    import_cmd = commands.add_parser("import", help="Bulk import students, teachers, courses, or enrollments from a CSV or JSONL file")
+    import_cmd.add_argument("table", choices=["students", "teachers", "courses", "enrollments"])
+    import_cmd.add_argument("path", help="CSV file with a header row, or JSONL file with one object per line")
+    import_cmd.add_argument("--format", choices=["csv", "jsonl"], help="File format (default: from the file extension)")
+    import_cmd.add_argument("--chunk-size", type=int, default=5000, help="Rows per transaction (default: 5000)")
+    import_cmd.add_argument("--rejects", help="Write every rejected row to this JSONL file")
+
+    export_cmd = commands.add_parser("export", help="Stream students, teachers, or courses to a CSV, JSONL or Parquet file")
+    export_cmd.add_argument("table", choices=list(export.TABLES))
+    export_cmd.add_argument("path", help="Output file; the format and gzip are taken from the extension (e.g. students.csv.gz)")
+    export_cmd.add_argument("--format", choices=export.FORMATS, help="File format (default: from the file extension)")
+    export_cmd.add_argument("--gzip", action="store_true", default=None, help="Compress the output (default: if the path ends in .gz)")
+    export_cmd.add_argument("--batch-size", type=int, default=export.DEFAULT_BATCH_SIZE, help="Rows per fetch/write (default: 10000)")
+    export_cmd.add_argument("--house", choices=d.VALID_HOUSES, help="Students only: filter by house")
+    export_cmd.add_argument("--year", choices=d.VALID_YEARS, help="Students only: filter by year")
+    export_cmd.add_argument("--course", help="Students: enrolled in this course (by name); teachers: teaching this CourseID")
+
+    stats_cmd = commands.add_parser("stats", help="Show the house/year student dashboard")
+    stats_cmd.add_argument("--check", action="store_true", help="Verify the StudentStats summary against Students")
+    stats_cmd.add_argument("--rebuild", action="store_true", help="Recompute StudentStats from Students")
+
+    sql_stats_cmd = commands.add_parser("sql-stats", help="Show SQL timings recorded by --profile-sql sessions")
+    sql_stats_cmd.add_argument("--limit", type=int, default=20, help="Statements to show (default: 20)")
+    sql_stats_cmd.add_argument("--sort", choices=["total_ms", "calls", "mean_ms", "max_ms", "rows"], default="total_ms")
+    sql_stats_cmd.add_argument("--json", action="store_true", help="Print the raw stats as JSON")
+    sql_stats_cmd.add_argument("--reset", action="store_true", help="Delete the recorded stats")
+
+    search_cmd = commands.add_parser("search", help="Find students, teachers, and courses by name or name prefix")
+    search_cmd.add_argument("text", nargs="+", help="Words to match; each matches the start of a word in the name")
+    search_cmd.add_argument("--table", choices=["students", "teachers", "courses"], action="append",
+                            help="Only search this table (repeatable; default: all)")
+    search_cmd.add_argument("--limit", type=int, default=50, help="Matches shown per table (default: 50)")
+
+    delete_cmd = commands.add_parser("delete", help="Delete students in bulk by WizardID or by house/year/course, in one transaction")
+    delete_cmd.add_argument("--ids", type=lambda value: [int(v) for v in value.replace(",", " ").split()],
+                            help="Comma-separated WizardIDs")
+    delete_cmd.add_argument("--house", choices=d.VALID_HOUSES)
+    delete_cmd.add_argument("--year", choices=d.VALID_YEARS)
+    delete_cmd.add_argument("--course", help="Only students enrolled in this course (by name)")
+    delete_cmd.add_argument("--dry-run", action="store_true", help="Only count the students that would be deleted")
+    delete_cmd.add_argument("--yes", action="store_true", help="Don't ask for confirmation")
+
+    audit_cmd = commands.add_parser("audit", help="Query logged events and errors from the indexed audit store")
+    audit_cmd.add_argument("action", choices=["query", "import", "types"], nargs="?", default="query",
+                           help="query (default), import the existing JSON logs, or list event types")
+    audit_cmd.add_argument("--type", help="Exact event type, e.g. 'Students Bulk Deleted!' (or error message with --errors)")
+    audit_cmd.add_argument("--errors", action="store_true", help="Query logged errors instead of events")
+    audit_cmd.add_argument("--since", help="ISO date/time or age such as 7d, 12h, 30m")
+    audit_cmd.add_argument("--until", help="ISO date/time or age such as 1d (exclusive)")
+    audit_cmd.add_argument("--detail", action="append", default=[], metavar="KEY=VALUE",
+                           help="Match a detail field, e.g. House=Ravenclaw or Filter.House=Ravenclaw (repeatable)")
+    audit_cmd.add_argument("--limit", type=int, default=audit.DEFAULT_PAGE_SIZE, help="Entries per page (default: 50)")
+    audit_cmd.add_argument("--page", help="Token printed at the end of the previous page")
+
+    serve_cmd = commands.add_parser("serve", help="Serve students, courses and admins as a local HTTP/JSON API")
+    serve_cmd.add_argument("--host", default="127.0.0.1")     # --- Literals keep asyncio out of every other command's startup ---
+    serve_cmd.add_argument("--port", type=int, default=8312)
+    serve_cmd.add_argument("--read-workers", type=int, default=4, help="Read-only connections (default: 4)")
+    serve_cmd.add_argument("--batch-delay-ms", type=float, default=group_commit.MAX_BATCH_DELAY_MS,
+                           help="Longest a write waits to share a commit (default: 5)")
+    serve_cmd.add_argument("--batch-size", type=int, default=group_commit.MAX_BATCH_OPS, help="Writes per commit at most (default: 256)")
+
+    backup_cmd = commands.add_parser("backup", help="Snapshot the live database with the online backup API (users are not blocked)")
+    backup_cmd.add_argument("--dir", help="Snapshot directory (default: $HOGWARTS_BACKUP_DIR or backups)")
+    backup_cmd.add_argument("--gzip", action="store_true", help="Compress the snapshot")
+    backup_cmd.add_argument("--keep", type=int, default=backup.KEEP_SNAPSHOTS, help="Newest snapshots to keep; 0 keeps all (default: 7)")
+    backup_cmd.add_argument("--pages-per-step", type=int, default=backup.PAGES_PER_STEP, help="Pages copied per step (default: 1024)")
+    backup_cmd.add_argument("--step-sleep-ms", type=float, default=backup.STEP_SLEEP_MS, help="Pause between steps (default: 5)")
+    backup_cmd.add_argument("--no-verify", action="store_true", help="Skip PRAGMA integrity_check on the snapshot")
+    backup_cmd.add_argument("--check", metavar="SNAPSHOT", help="Only verify an existing snapshot (.db or .db.gz)")
+    backup_cmd.add_argument("--list", action="store_true", help="List the snapshots in the directory")
+
+    report_cmd = commands.add_parser("report", help="House/year, cohort, course ratio and enrollment reports computed with NumPy")
+    report_cmd.add_argument("reports", nargs="*", metavar="REPORT",     # --- Names are checked by analytics.build_reports ---
+                            help="Reports to show: houses, cohorts, courses, enrollments (default: all)")
+    report_cmd.add_argument("--limit", type=int, default=25, help="Courses shown in the courses report; 0 shows all (default: 25)")
+    report_cmd.add_argument("--chunk-size", type=int, default=100_000, help="IDs loaded per chunk (default: 100000)")
+
+    diagnose_cmd = commands.add_parser("diagnose", help="Show EXPLAIN QUERY PLAN for every predefined query and flag full table scans")
+    diagnose_cmd.add_argument("--optimize", action="store_true", help="Refresh planner statistics (PRAGMA optimize) first")
+    return parser
+
+def run_command(args):
+    l.start_background_writer()
+    audit.enable()
+    try:
+        if args.command == "import":
+            bulk_import.run_import(args.path, args.table, fmt=args.format,
+                                   chunk_size=args.chunk_size, reject_file=args.rejects)
+        elif args.command == "export":
+            filters = {"House": args.house, "Year": args.year, "Course": args.course} if args.table == "students" else \
+                      {"CourseID": args.course} if args.table == "teachers" else {}
+            if args.table != "students" and (args.house or args.year) or args.table == "courses" and args.course:
+                print(f"Those filters don't apply to {args.table}.")
+                return 2
+            return 0 if export.run_export(args.path, args.table, fmt=args.format, compress=args.gzip,
+                                          batch_size=args.batch_size, **filters) else 1
+        elif args.command == "stats":
+            mismatches = t.check_stats(rebuild=args.rebuild) if args.check or args.rebuild else 0
+            t.student_dashboard()
+            return 1 if mismatches and not args.rebuild else 0
+        elif args.command == "sql-stats":
+            if args.reset:
+                if os.path.exists(instrumentation.STATS_FILE):
+                    os.remove(instrumentation.STATS_FILE)
+                print("SQL statistics cleared.")
+            elif args.json:
+                print(json.dumps(instrumentation.load(), indent=2))
+            else:
+                instrumentation.report(instrumentation.load(), limit=args.limit, sort_by=args.sort)
+        elif args.command == "search":
+            tables = [cli_tables[table] for table in args.table] if args.table else None
+            return 0 if t.search_records(" ".join(args.text), tables=tables, limit=args.limit) else 1
+        elif args.command == "delete":
+            if args.ids and (args.house or args.year or args.course):
+                print("Use either --ids or --house/--year/--course, not both.")
+                return 2
+            deleted = t.bulk_delete_students(ids=args.ids, house=args.house, year=args.year, course=args.course,
+                                             dry_run=args.dry_run, assume_yes=args.yes)
+            return 1 if deleted < 0 else 0
+        elif args.command == "audit":
+            kind = "error" if args.errors else "event"
+            if args.action == "import":
+                l.flush()
+                added = audit.import_logs()
+                print(f"Imported {added['event']} events and {added['error']} errors into {audit.AUDIT_DB}.")
+            elif args.action == "types":
+                for event_type, count in audit.event_types(kind):
+                    print(f"{count:>10}  {event_type}")
+            else:
+                details = dict(detail.split("=", 1) for detail in args.detail if "=" in detail)
+                audit.run_query(kind, args.type, args.since, args.until, details, args.limit, args.page)
+        elif args.command == "serve":
+            import service                  # --- asyncio is only loaded when the service is started ---
+            service.run_service(args.host, args.port, args.read_workers, args.batch_delay_ms, args.batch_size)
+        elif args.command == "backup":
+            if args.check:
+                return 0 if backup.run_verify(args.check) else 1
+            if args.list:
+                for path in backup.list_snapshots(args.dir):
+                    print(f"{os.path.getsize(path):>14,}  {path}")
+                return 0
+            return 0 if backup.run_backup(args.dir, args.gzip, not args.no_verify, args.keep,
+                                          args.pages_per_step, args.step_sleep_ms) else 1
+        elif args.command == "report":
+            import analytics                # --- NumPy is only loaded when a report is asked for ---
+            return 0 if analytics.run_reports(args.reports or None, args.chunk_size, args.limit) else 1
+        elif args.command == "diagnose":
+            if args.optimize:
+                d.optimize_database()
+            return 1 if t.query_plan_report() else 0
+    finally:
+        instrumentation.save()
+        d.close_all()
+        l.shutdown()
+        audit.close()
 
 if __name__ == "__main__":
-    main()
+    args = build_parser().parse_args()
+    if args.db:
+        d.configure(db_path=args.db)
+    if args.profile_sql or args.slow_query_ms is not None:
+        instrumentation.enable(slow_ms=args.slow_query_ms)
+    if args.init_db:
+        applied = d.init_db()
+        print(f"Applied schema migrations: {', '.join(map(str, applied))}." if applied
+              else f"Database is already at schema version {d.SCHEMA_VERSION}.")
+    elif args.command:
+        raise SystemExit(run_command(args))
+    else:
+        main()
@@ -0,0 +1,495 @@
+# Hogwarts Repositories
+# --------------------------
+# This script is the headless data-access layer for Students, Courses, and Admins.
+# Features: Single and batch add/delete/find methods with no input() or print(), shared by the
+# terminal menu, the GUI, bulk import and benchmarks. SQL text is fixed per operation, so
+# SQLite's per-connection statement cache reuses the prepared statements. Reads of the small
+# reference tables (Courses, HogwartAdmin) go through cache.py and every write invalidates it.
+# search() ranks prefix matches from the FTS5 name indexes. delete_ids/delete_where remove any
+# number of rows with one statement and log a single summary entry. While group commit is
+# running, single-row add/delete calls share batched transactions instead of committing alone.
+# page() lists records a keyset page at a time with an opaque token for the next page.
+
+from collections import namedtuple
+import base64
+import json
+import zlib
+import cache
+import database_design as d
+import group_commit
+import logger as l
+
+# --- Record types returned by find_by/get ---
+Student = namedtuple("Student", ["WizardID", "Name", "House", "Year"])
+Course = namedtuple("Course", ["CourseID", "CourseName"])
+Admin = namedtuple("Admin", ["WizardID", "Name", "CourseID"])
+StudentCourse = namedtuple("StudentCourse", ["WizardID", "Name", "CourseID", "CourseName"])
+TeacherLoad = namedtuple("TeacherLoad", ["WizardID", "Name", "CourseID", "CourseName", "Students"])
+
+DEFAULT_CHUNK_SIZE = 5000       # Rows per executemany in add_many/delete_many
+DEFAULT_SEARCH_LIMIT = 50       # Matches returned per table by search()
+MAX_PAGE_SIZE = 1000            # Largest page page() returns; bigger limits are capped
+
+
+# --- Page tokens: opaque to callers; they carry the last key of a page and which listing it belongs to ---
+
+def _filters_tag(table, filters):
+    return zlib.crc32(json.dumps([table, sorted((column, str(value)) for column, value in filters.items())]).encode())
+
+def encode_page_token(table, filters, last_key):
+    data = json.dumps([last_key, _filters_tag(table, filters)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+def decode_page_token(token, table, filters):
+    # --- Returns the last key from a token; ValueError if it is malformed or from a different listing ---
+    try:
+        last_key, tag = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid page token.")
+    if tag != _filters_tag(table, filters) or not isinstance(last_key, int):
+        raise ValueError("This page token belongs to a different listing.")
+    return last_key
+
+
+class Repository:
+    # --- Shared single/batch operations; subclasses fill in the table details below ---
+    table = None
+    key = None                  # Primary key column
+    name_column = None          # Column matched by delete()/find_by_name()
+    record = None               # namedtuple type for rows
+    insert_query = None
+    find_by_name_query = None
+    delete_by_name_query = None
+    added_event = None          # Logger event names
+    deleted_event = None
+    name_detail = "Name"        # Logger detail key for the name
+
+    def __init__(self, connect=None):
+        # --- connect() returns the connection to use; defaults to the calling thread's connection ---
+        self.connect = connect or d.get_connection
+        columns = ", ".join(self.record._fields)
+        self.select_query = f"SELECT {columns} FROM {self.table}"
+        self.get_query = f"SELECT {columns} FROM {self.table} WHERE {self.key} = ?;"
+        self.delete_by_id_query = f"DELETE FROM {self.table} WHERE {self.key} = ?;"
+        self.search_query = d.search_query(self.table, self.record._fields)
+
+    # --- Validation and logging hooks ---
+    def validate(self, values):
+        # --- Returns the parameter tuple for the insert, or raises ValueError ---
+        return tuple(values)
+
+    def added_details(self, values):
+        return {self.name_detail: values[0]}
+
+    # --- Writes ---
+    def add(self, *values, log=True):
+        # --- Inserts one row and returns its new ID ---
+        if group_commit.active():
+            return self.submit_add(*values, log=log).result()
+        params = self.validate(values)
+        con = self.connect()
+        try:
+            new_id = con.execute(self.insert_query, params).lastrowid
+            con.commit()
+        except Exception:
+            con.rollback()
+            raise
+        finally:
+            cache.invalidate(self.table)
+        if log:
+            l.log_event(self.added_event, self.added_details(params))
+        return new_id
+
+    def add_many(self, rows, chunk_size=DEFAULT_CHUNK_SIZE, log=True):
+        # --- Inserts an iterable of value tuples in chunked transactions; returns the number inserted ---
+        # --- Rows are validated before their chunk is written, so an invalid row stops the batch there ---
+        con = self.connect()
+        inserted = 0
+        chunk = []
+        try:
+            for values in rows:
+                chunk.append(self.validate(values))
+                if len(chunk) >= chunk_size:
+                    self._insert_chunk(con, chunk)
+                    con.commit()
+                    inserted += len(chunk)
+                    chunk.clear()
+            if chunk:
+                self._insert_chunk(con, chunk)
+                con.commit()
+                inserted += len(chunk)
+        except Exception:
+            con.rollback()
+            raise
+        finally:
+            cache.invalidate(self.table)
+        if log and inserted:
+            l.log_event(f"{self.table} Added!", {"Count": inserted})
+        return inserted
+
+    def _insert_chunk(self, con, chunk):
+        # --- One chunk of add_many; a searchable table's FTS index is filled by one INSERT ... SELECT ---
+        # --- instead of its per-row trigger (see database_design.create_search_pause_table) ---
+        if self.table not in d.search_indexes:
+            con.executemany(self.insert_query, chunk)
+            return
+        con.execute(d.pause_search_query, (self.table,))      # --- Also opens the write transaction ---
+        last_key = con.execute(f"SELECT COALESCE(MAX({self.key}), 0) FROM {self.table};").fetchone()[0]
+        con.executemany(self.insert_query, chunk)
+        con.execute(d.search_catch_up_query(self.table), (last_key,))
+        con.execute(d.resume_search_query, (self.table,))
+
+    def delete(self, name, log=True):
+        # --- Deletes every row with this name; returns the number deleted ---
+        if group_commit.active():
+            return self.submit_delete(name, log=log).result()
+        con = self.connect()
+        try:
+            deleted = con.execute(self.delete_by_name_query, (name,)).rowcount
+            con.commit()
+        except Exception:
+            con.rollback()
+            raise
+        finally:
+            cache.invalidate(self.table)
+        if log and deleted:
+            l.log_event(self.deleted_event, {self.name_detail: name})
+        return deleted
+
+    def delete_many(self, names, log=True):
+        # --- Deletes every row matching any of the names in one transaction; returns the number deleted ---
+        con = self.connect()
+        names = list(dict.fromkeys(names))
+        try:
+            before = con.total_changes
+            con.executemany(self.delete_by_name_query, ((name,) for name in names))
+            deleted = con.total_changes - before
+            con.commit()
+        except Exception:
+            con.rollback()
+            raise
+        finally:
+            cache.invalidate(self.table)
+        if log and deleted:
+            l.log_event(f"{self.table} Deleted!", {"Names": len(names), "Count": deleted})
+        return deleted
+
+    def delete_by_id(self, record_id, log=True):
+        if group_commit.active():
+            return self.submit_delete_by_id(record_id, log=log).result()
+        con = self.connect()
+        try:
+            deleted = con.execute(self.delete_by_id_query, (record_id,)).rowcount
+            con.commit()
+        except Exception:
+            con.rollback()
+            raise
+        finally:
+            cache.invalidate(self.table)
+        if log and deleted:
+            l.log_event(self.deleted_event, {self.key: record_id})
+        return deleted
+
+    # --- Group-commit writes: queued to the shared writer (group_commit.py), each returning a Future ---
+    # --- The cache is invalidated and the event logged after the commit, before the Future resolves ---
+    def _after_write(self, event, details, log):
+        def on_commit(changed):
+            cache.invalidate(self.table)
+            if log and changed:
+                l.log_event(event, details)
+        return on_commit
+
+    def submit_add(self, *values, log=True):
+        # --- Future for the new row's ID ---
+        params = self.validate(values)
+        return group_commit.submit(lambda con: con.execute(self.insert_query, params).lastrowid,
+                                   self._after_write(self.added_event, self.added_details(params), log))
+
+    def submit_delete(self, name, log=True):
+        # --- Future for the number of rows deleted ---
+        return group_commit.submit(lambda con: con.execute(self.delete_by_name_query, (name,)).rowcount,
+                                   self._after_write(self.deleted_event, {self.name_detail: name}, log))
+
+    def submit_delete_by_id(self, record_id, log=True):
+        return group_commit.submit(lambda con: con.execute(self.delete_by_id_query, (record_id,)).rowcount,
+                                   self._after_write(self.deleted_event, {self.key: record_id}, log))
+
+    # --- Set-based bulk deletes: one statement, one transaction and one summary log entry ---
+    def where_clause(self, filters):
+        # --- (SQL condition, params) for column-equality filters; subclasses add computed filters ---
+        for column in filters:
+            if column not in self.record._fields:
+                raise ValueError(f"Cannot filter {self.table} by {column}.")
+        return " AND ".join(f"{column} = ?" for column in filters), tuple(filters.values())
+
+    def delete_where(self, dry_run=False, log=True, **filters):
+        # --- Deletes every row matching all the filters, e.g. delete_where(Year=7); returns the number deleted ---
+        # --- dry_run only counts the matches. Filters set to None are ignored, and at least one is required ---
+        filters = {column: value for column, value in filters.items() if value is not None}
+        if not filters:
+            raise ValueError("A bulk delete needs at least one filter.")
+        where, params = self.where_clause(filters)
+        return self._bulk_delete(where, params, dry_run, log, {"Filter": filters})
+
+    def delete_ids(self, record_ids, dry_run=False, log=True):
+        # --- Deletes rows by primary key; the IDs go to SQLite as one JSON array parameter ---
+        record_ids = list(dict.fromkeys(int(record_id) for record_id in record_ids))
+        where = f"{self.key} IN (SELECT value FROM json_each(?))"
+        return self._bulk_delete(where, (json.dumps(record_ids),), dry_run, log, {"IDs": len(record_ids)})
+
+    def _bulk_delete(self, where, params, dry_run, log, details):
+        con = self.connect()
+        if dry_run:
+            return con.execute(f"SELECT COUNT(*) FROM {self.table} WHERE {where};", params).fetchone()[0]
+        try:
+            deleted = con.execute(f"DELETE FROM {self.table} WHERE {where};", params).rowcount
+            con.commit()
+        except Exception:
+            con.rollback()
+            raise
+        finally:
+            cache.invalidate(self.table)
+        if log and deleted:
+            l.log_event(f"{self.table} Bulk Deleted!", {**details, "Count": deleted})
+        return deleted
+
+    # --- Reads ---
+    def get(self, record_id):
+        # --- One record by primary key (read through the cache for reference tables) ---
+        def load():
+            row = self.connect().execute(self.get_query, (record_id,)).fetchone()
+            return self.record(*row) if row else None
+        return cache.cached(self.table, ("get", record_id), load)
+
+    def all(self):
+        # --- Every record as a tuple; only sensible for the small, cached reference tables ---
+        return cache.cached(self.table, ("all",),
+                            lambda: tuple(self.record(*row) for row in self.connect().execute(self.select_query + f" ORDER BY {self.key};")))
+
+    def exists(self, name):
+        return self.connect().execute(self.find_by_name_query, (name,)).fetchone() is not None
+
+    def find_by(self, batch_size=None, **filters):
+        # --- Lazily yields records whose columns equal the given values, e.g. find_by(House="Slytherin") ---
+        query, params = self.select_where(**filters)
+        cursor = self.connect().cursor()
+        try:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size or d.DEFAULT_BATCH_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    yield self.record(*row)
+        finally:
+            cursor.close()
+
+    def select_where(self, **filters):
+        # --- (query, params) selecting whole records that match the filters, in key order ---
+        filters = {column: value for column, value in filters.items() if value is not None}
+        where, params = self.where_clause(filters)
+        return self.select_query + (f" WHERE {where}" if where else "") + f" ORDER BY {self.key};", params
+
+    def page(self, limit, token=None, **filters):
+        # --- One page of records matching the filters in key order, and the token for the next page (None after the last) ---
+        # --- Pages are keyset reads (key > last key seen), so every page is an index seek however deep it is ---
+        if limit < 1:
+            raise ValueError("A page needs a limit of at least 1.")
+        limit = min(limit, MAX_PAGE_SIZE)
+        filters = {column: value for column, value in filters.items() if value is not None}
+        where, params = self.where_clause(filters)
+        query = d.keyset_page_query(self.table, self.record._fields, self.key, where, first=token is None)
+        if token is not None:
+            params += (decode_page_token(token, self.table, filters),)
+        params += (limit + 1,)                      # --- One extra row says whether another page follows ---
+        rows = cache.cached(self.table, ("page", query, params),
+                            lambda: [self.record(*row) for row in self.connect().execute(query, params)])
+        if len(rows) <= limit:
+            return rows, None
+        return rows[:limit], encode_page_token(self.table, filters, getattr(rows[limit - 1], self.key))
+
+    def find_by_name(self, name):
+        return self.find_by(**{self.name_column: name})
+
+    def search(self, text, limit=DEFAULT_SEARCH_LIMIT):
+        # --- Best matches first for names containing words that start with each word of text ---
+        match = d.match_expression(text)
+        if not match:
+            return []
+        return cache.cached(self.table, ("search", match, limit),
+                            lambda: [self.record(*row) for row in self.connect().execute(self.search_query, (match, limit))])
+
+    def invalidate(self):
+        # --- Call after writing to this table outside the repository ---
+        cache.invalidate(self.table)
+
+    def count(self):
+        return self.connect().execute(f"SELECT COUNT(*) FROM {self.table};").fetchone()[0]
+
+
+class StudentRepository(Repository):
+    table = "Students"
+    key = "WizardID"
+    name_column = "Name"
+    record = Student
+    insert_query = d.insert_student_query
+    find_by_name_query = d.find_student_query
+    delete_by_name_query = d.delete_student_query
+    added_event = "Student Added!"
+    deleted_event = "Student Deleted!"
+
+    def validate(self, values):
+        name, house, year = values
+        error = d.validate_student(house, str(year))
+        if error:
+            raise ValueError(error)
+        return (name, house, str(year))
+
+    def added_details(self, values):
+        name, house, year = values
+        return {"Name": name, "House": house, "Year": year}
+
+    def where_clause(self, filters):
+        # --- Adds Course=<course name>: students enrolled in that course ---
+        filters = dict(filters)
+        course = filters.pop("Course", None)
+        where, params = super().where_clause(filters)
+        if course is not None:
+            where = " AND ".join(part for part in (where, d.student_in_course_condition) if part)
+            params += (course,)
+        return where, params
+
+
+class CourseRepository(Repository):
+    table = "Courses"
+    key = "CourseID"
+    name_column = "CourseName"
+    record = Course
+    insert_query = d.insert_course_query
+    find_by_name_query = d.find_course_query
+    delete_by_name_query = d.delete_course_query
+    added_event = "Course Added!"
+    deleted_event = "Course Deleted!"
+    name_detail = "Course Name"
+
+    def validate(self, values):
+        (course_name,) = values
+        return (course_name,)
+
+    def name_of(self, course_id):
+        # --- CourseID -> CourseName, cached; None for unknown IDs ---
+        course = self.get(course_id)
+        return course.CourseName if course else None
+
+
+class AdminRepository(Repository):
+    table = "HogwartAdmin"
+    key = "WizardID"
+    name_column = "Name"
+    record = Admin
+    insert_query = d.insert_admin_query
+    find_by_name_query = d.find_admin_query
+    delete_by_name_query = d.delete_admin_query
+    added_event = "Teacher Added!"
+    deleted_event = "Admin Deleted!"
+
+    def validate(self, values):
+        name, course_id = values
+        return (name, course_id)
+
+    def added_details(self, values):
+        name, course_id = values
+        return {"Name": name, "Course ID": course_id}
+
+
+class EnrollmentRepository:
+    # --- Student <-> course links: bulk enroll/unenroll and the roster queries ---
+    table = "Enrollments"
+
+    def __init__(self, connect=None):
+        self.connect = connect or d.get_connection
+
+    def validate(self, values):
+        wizard_id, course_id = values
+        try:
+            return (int(wizard_id), int(course_id))
+        except (TypeError, ValueError):
+            raise ValueError("Student and course IDs must be whole numbers.")
+
+    # --- Writes ---
+    def _write_many(self, query, pairs, chunk_size):
+        # --- Runs query for every (WizardID, CourseID) pair in chunked transactions; returns rows changed ---
+        con = self.connect()
+        changed = 0
+        chunk = []
+        try:
+            for values in pairs:
+                chunk.append(self.validate(values))
+                if len(chunk) >= chunk_size:
+                    before = con.total_changes
+                    con.executemany(query, chunk)
+                    changed += con.total_changes - before
+                    con.commit()
+                    chunk.clear()
+            if chunk:
+                before = con.total_changes
+                con.executemany(query, chunk)
+                changed += con.total_changes - before
+                con.commit()
+        except Exception:
+            con.rollback()
+            raise
+        return changed
+
+    def add_many(self, pairs, chunk_size=DEFAULT_CHUNK_SIZE, log=True):
+        # --- Enrolls (WizardID, CourseID) pairs; existing enrollments and unknown IDs are skipped ---
+        # --- Returns the number of new enrollments ---
+        inserted = self._write_many(d.enroll_query, pairs, chunk_size)
+        if log and inserted:
+            l.log_event("Enrollments Added!", {"Count": inserted})
+        return inserted
+
+    def delete_many(self, pairs, chunk_size=DEFAULT_CHUNK_SIZE, log=True):
+        # --- Unenrolls (WizardID, CourseID) pairs; returns the number removed ---
+        deleted = self._write_many(d.unenroll_query, pairs, chunk_size)
+        if log and deleted:
+            l.log_event("Enrollments Removed!", {"Count": deleted})
+        return deleted
+
+    def enroll(self, wizard_id, course_ids, log=True):
+        # --- One student into several courses ---
+        return self.add_many(((wizard_id, course_id) for course_id in course_ids), log=log)
+
+    def unenroll(self, wizard_id, course_ids, log=True):
+        return self.delete_many(((wizard_id, course_id) for course_id in course_ids), log=log)
+
+    # --- Reads ---
+    def roster(self, course_name, house=None, year=None, batch_size=None):
+        # --- Lazily yields the Students enrolled in a course, e.g. roster("Potions", house="Slytherin", year=5) ---
+        return (Student(*row) for row in d.iter_roster(course_name, house, year, batch_size))
+
+    def courses_for(self, student_name):
+        # --- Courses of every student with this name, as StudentCourse records ---
+        return [StudentCourse(*row) for row in self.connect().execute(d.courses_for_student_query, (student_name,))]
+
+    def teacher_load(self):
+        # --- Every teacher with the number of students in their course, busiest first ---
+        return [TeacherLoad(*row) for row in self.connect().execute(d.teacher_load_query)]
+
+    def count(self):
+        return self.connect().execute("SELECT COUNT(*) FROM Enrollments;").fetchone()[0]
+
+
+# --- Shared instances ---
+students = StudentRepository()
+courses = CourseRepository()
+admins = AdminRepository()
+enrollments = EnrollmentRepository()
+
+# --- Lookup by the table names used in the GUI and CLI ---
+by_table = {"Students": students, "Courses": courses, "HogwartAdmin": admins}
+
+def search(text, limit=DEFAULT_SEARCH_LIMIT, tables=None):
+    # --- Searches several tables at once; returns {table: [records]} in by_table order ---
+    return {table: repository.search(text, limit) for table, repository in by_table.items()
+            if tables is None or table in tables}
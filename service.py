@@ -0,0 +1,230 @@
+# Hogwarts HTTP Service
+# --------------------------
+# This script serves the student, course and admin operations as a local HTTP/JSON API.
+# Features: An asyncio server (standard library only, HTTP/1.1 keep-alive) that hands blocking
+# SQLite work to a bounded pool of read-only connections, while writes are coalesced by the
+# group-commit writer (group_commit.py) so many clients' inserts and deletes share one commit.
+#
+# Usage: python main.py serve --port 8312
+#   GET    /students?house=Ravenclaw&year=5&course=Potions&limit=50   (then &page=<the "next" token>)
+#   GET    /students/<id>       POST /students {"Name": ..., "House": ..., "Year": ...}
+#   DELETE /students/<id>       DELETE /students?name=<name>
+#   (the same for /courses and /admins), GET /search?q=herm, GET /stats, GET /health
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+import database_design as d
+import group_commit
+import logger as l
+import repository as r
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8312
+READ_WORKERS = 4                    # Threads (and read connections) for queries
+MAX_PAGE_SIZE = 500                 # Largest ?limit= a list request may ask for
+MAX_BODY_BYTES = 1024 * 1024
+
+# --- URL collection -> repository, and the query parameters each list endpoint filters on ---
+RESOURCES = {"students": r.students, "courses": r.courses, "admins": r.admins}
+LIST_FILTERS = {
+    "students": {"house": "House", "year": "Year", "course": "Course", "name": "Name"},
+    "courses":  {"name": "CourseName"},
+    "admins":   {"course_id": "CourseID", "name": "Name"},
+}
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _read_only_connection():
+    # --- Read pool thread initializer: this thread's connection may only read ---
+    d.set_read_only()
+
+
+class HogwartsService:
+    # --- Routes requests; reads run on the read pool, writes are batched by the group-commit writer ---
+    def __init__(self, read_workers=READ_WORKERS, batch_delay_ms=None, batch_ops=None):
+        self.readers = ThreadPoolExecutor(read_workers, thread_name_prefix="hogwarts-read",
+                                          initializer=_read_only_connection)
+        group_commit.start(batch_delay_ms, batch_ops)         # --- One writer, so writes never contend ---
+        self.requests = 0
+
+    async def read(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.readers, function, *args)
+
+    async def write(self, future):
+        # --- Waits for a group-commit Future without blocking the event loop ---
+        return await asyncio.wrap_future(future)
+
+    def close(self):
+        self.readers.shutdown(wait=True)
+        group_commit.stop()                         # --- Commits any queued writes first ---
+        d.close_all()                               # --- Closes the pool threads' connections ---
+
+    # --- Routing ---
+    async def handle(self, method, path, query, body):
+        # --- Returns (status, JSON-serialisable payload) ---
+        parts = [part for part in path.split("/") if part]
+        if parts == ["health"]:
+            return 200, {"status": "ok", "requests": self.requests, "group_commit": group_commit.stats()}
+        if parts == ["stats"] and method == "GET":
+            stats = await self.read(d.student_stats)
+            return 200, [{"House": house, "Year": year, "Students": count} for house, year, count in stats]
+        if parts == ["search"] and method == "GET":
+            text = _param(query, "q")
+            limit = _int_param(query, "limit", r.DEFAULT_SEARCH_LIMIT, MAX_PAGE_SIZE)
+            results = await self.read(r.search, text, limit)
+            return 200, {table: [record._asdict() for record in records] for table, records in results.items()}
+        if not parts or parts[0] not in RESOURCES or len(parts) > 2:
+            raise HttpError(404, f"No such resource: {path}")
+
+        collection, repository = parts[0], RESOURCES[parts[0]]
+        record_id = _parse_id(parts[1]) if len(parts) == 2 else None
+        if method == "GET" and record_id is not None:
+            record = await self.read(repository.get, record_id)
+            if record is None:
+                raise HttpError(404, f"No {collection} record with ID {record_id}.")
+            return 200, record._asdict()
+        if method == "GET":
+            filters = {column: query[name][0] for name, column in LIST_FILTERS[collection].items() if name in query}
+            limit = max(1, _int_param(query, "limit", 50, MAX_PAGE_SIZE))
+            token = query["page"][0] if "page" in query else None
+            records, next_token = await self.read(lambda: repository.page(limit, token, **filters))
+            return 200, {"items": [record._asdict() for record in records], "limit": limit, "next": next_token}
+        if method == "POST" and record_id is None:
+            values = _record_values(repository, body)
+            new_id = await self.write(repository.submit_add(*values))
+            return 201, {repository.key: new_id}
+        if method == "DELETE" and record_id is not None:
+            deleted = await self.write(repository.submit_delete_by_id(record_id))
+            if not deleted:
+                raise HttpError(404, f"No {collection} record with ID {record_id}.")
+            return 200, {"deleted": deleted}
+        if method == "DELETE" and "name" in query:
+            deleted = await self.write(repository.submit_delete(_param(query, "name")))
+            return 200, {"deleted": deleted}
+        raise HttpError(405, f"{method} is not supported on {path}.")
+
+    # --- Connection handling (HTTP/1.1 with keep-alive) ---
+    async def serve_client(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length") or 0) if (headers.get("content-length") or "0").isdigit() else -1
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+                if length < 0:
+                    status, payload, keep_alive = 400, {"error": "Invalid Content-Length."}, False
+                elif length > MAX_BODY_BYTES:
+                    status, payload, keep_alive = 413, {"error": "Request body too large."}, False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self.respond(method, target, body)
+                data = json.dumps(payload).encode("utf-8")
+                writer.write(f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(data)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                             .encode("latin-1") + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, method, target, body):
+        self.requests += 1
+        url = urlsplit(target)
+        try:
+            return await self.handle(method.upper(), url.path, parse_qs(url.query), body)
+        except HttpError as e:
+            return e.status, {"error": str(e)}
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            l.log_error("Service request failed", details={"Method": method, "Target": target, "Exception": str(e)})
+            return 500, {"error": "Internal error; see the hogwarts_error_log file."}
+
+
+# --- Request helpers ---
+
+def _param(query, name):
+    values = query.get(name)
+    if not values or not values[0].strip():
+        raise HttpError(400, f"Missing query parameter '{name}'.")
+    return values[0].strip()
+
+def _int_param(query, name, default, maximum=None):
+    try:
+        value = int(query[name][0]) if name in query else default
+    except ValueError:
+        raise HttpError(400, f"Query parameter '{name}' must be a whole number.")
+    if value < 0:
+        raise HttpError(400, f"Query parameter '{name}' must not be negative.")
+    return min(value, maximum) if maximum else value
+
+def _parse_id(text):
+    if not text.isdigit():
+        raise HttpError(404, f"No such record: {text}")
+    return int(text)
+
+def _record_values(repository, body):
+    # --- JSON object -> insert values in column order (the primary key is assigned by SQLite) ---
+    try:
+        data = json.loads(body or b"{}")
+    except json.JSONDecodeError as e:
+        raise HttpError(400, f"Invalid JSON: {e.msg}")
+    if not isinstance(data, dict):
+        raise HttpError(400, "Expected a JSON object.")
+    columns = [column for column in repository.record._fields if column != repository.key]
+    missing = [column for column in columns if data.get(column) in (None, "")]
+    if missing:
+        raise HttpError(400, f"Missing field(s): {', '.join(missing)}.")
+    return [data[column] for column in columns]
+
+
+# --- Entry point ---
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, read_workers=READ_WORKERS, ready=None,
+                batch_delay_ms=None, batch_ops=None):
+    # --- Runs until cancelled; ready(server) is called once the socket is listening ---
+    service = HogwartsService(read_workers, batch_delay_ms, batch_ops)
+    server = await asyncio.start_server(service.serve_client, host, port)
+    l.log_event("Service Started!", {"Host": host, "Port": port, "Read Workers": read_workers,
+                                     "Batch Delay (ms)": group_commit.MAX_BATCH_DELAY_MS if batch_delay_ms is None else batch_delay_ms})
+    try:
+        async with server:
+            if ready:
+                ready(server)
+            await server.serve_forever()
+    finally:
+        service.close()
+
+def run_service(host=DEFAULT_HOST, port=DEFAULT_PORT, read_workers=READ_WORKERS, batch_delay_ms=None, batch_ops=None):
+    # --- Terminal front end for serve: blocks until Ctrl+C ---
+    print(f"Serving the Hogwarts API on http://{host}:{port} ({read_workers} read workers, 1 group-commit writer). Press Ctrl+C to stop.")
+    try:
+        asyncio.run(serve(host, port, read_workers, batch_delay_ms=batch_delay_ms, batch_ops=batch_ops))
+    except KeyboardInterrupt:
+        print("Service stopped.")
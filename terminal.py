@@ -0,0 +1,450 @@
+# Hogwarts Terminal Menu
+# --------------------------
+# This script holds the prompt-driven terminal screens for the Hogwarts Management System.
+# Features: Add, View, Search, Enroll, and Delete records through input()/print(); the data work goes through repository.py.
+
+import database_design as d
+import logger as l
+import repository as r
+
+
+PAGE_SIZE = 50          # Rows per page in the terminal listings
+
+
+# --- Output helpers ---
+
+def print_rows(rows, heading, empty_message, row_format):
+    # --- Prints rows as they arrive; the heading is printed before the first row ---
+    count = 0
+    for row in rows:
+        if count == 0:
+            print(heading)
+        print(row_format.format(*row))
+        count += 1
+    if count == 0:
+        print(empty_message)
+    return count
+
+def print_pages(repository, heading, empty_message, row_format, page_size=None, **filters):
+    # --- Prints repository.page() a page at a time, asking before each further page; returns the rows printed ---
+    page_size = page_size or PAGE_SIZE
+    count = 0
+    token = None
+    while True:
+        records, token = repository.page(page_size, token, **filters)
+        if count == 0 and records:
+            print(heading)
+        for record in records:
+            print(row_format.format(*record))
+        count += len(records)
+        if token is None:
+            break
+        if input(f"Shown {count}. Press Enter for the next page, or q to stop: ").strip().lower() == "q":
+            break
+    if count == 0:
+        print(empty_message)
+    return count
+
+student_record_format = "WizardID: {0}, Name: {1}, House: {2}, Year: {3}"
+admin_row_format = "WizardID: {0}, Name: {1}, CourseID: {2}"
+course_row_format = "CourseID: {0}, CourseName: {1}"
+
+# --- Search results print whole records, so students include their WizardID ---
+search_sections = {
+    "Students":     ("Matching students:", student_record_format),
+    "Courses":      ("Matching courses:", course_row_format),
+    "HogwartAdmin": ("Matching admins:", admin_row_format),
+}
+
+# --- Functions ---
+
+def insert_student():
+    # --- Adds a new student to the Students table ---
+    try:
+        name = input("Enter the student's name: ")
+        year = input("Enter the student's year (1-7): ")
+        house = input("Enter the student's house (Gryffindor, Slytherin, Hufflepuff, Ravenclaw): ")
+
+        error = d.validate_student(house, year)
+        if error:
+            print(error)
+            return
+        else:
+            r.students.add(name, house, year)
+            print(f"Student {name} added successfully!")
+    except Exception as e:
+        print("An error occurred while adding student data. Please check the hogwarts_error_log file for more information.")
+        l.log_error("Failed to add student data", details={"Exception": str(e)})
+
+def add_course():
+    # --- Adds a new course to the Courses table ---
+    try:
+        course_name = input("Enter the course name: ")
+        r.courses.add(course_name)
+        print(f"Course {course_name} added successfully!")
+    except Exception as e:
+        print("An error occurred while adding course data. Please check the hogwarts_error_log file for more information.")
+        l.log_error("Failed to add course data", details={"Exception": str(e)})
+
+def insert_admin():
+    # --- Adds a new admin/teacher to the HogwartAdmin table ---
+    try:
+        name = input("Enter the admin's name: ")
+        course_id = input("Enter the course/occupation ID: ")
+        r.admins.add(name, course_id)
+        print(f"Admin {name} added successfully!")
+    except Exception as e:
+        print("An error occurred while adding admin data. Please check the hogwarts_error_log file for more information.")
+        l.log_error("Failed to add admin data", details={"Exception": str(e)})
+
+def all_students():
+    # --- Lists all students in the database ---
+    try:
+        print_pages(r.students, "List of all students:", "No students found.", student_record_format)
+    except Exception as e:
+        print("An error occurred while iterating student data. Please check the hogwarts_error_log file for more information.")
+        l.log_error("Failed to iterate student data", details={"Exception": str(e)})
+
+def student_by_year():
+    # --- Lists students filtered by year ---
+    try:
+        year = input("Enter the year (1-7): ")
+        print_pages(r.students, f"Students in Year {year}:", f"No students found in Year {year}.", student_record_format, Year=year)
+    except Exception as e:
+        print("An error occurred while searching student data by year. Please check the hogwarts_error_log file for more information.")
+        l.log_error("Failed to search student data by year", details={"Exception": str(e)})
+
+def student_by_house():
+    # --- Lists students filtered by house ---
+    try:
+        house = input("Enter the house name: ")
+        print_pages(r.students, f"Students in House {house}:", "No students found in that house.", student_record_format, House=house)
+    except Exception as e:
+        print("An error occurred while searching student data by house. Please check the hogwarts_error_log file for more information.")
+        l.log_error("Failed to search student data by house", details={"Exception": str(e)})
+
+def student_list():
+    # --- Menu for listing students by different filters ---
+    try:
+        while True:
+            print("1. View all students")
+            print("2. View students by year")
+            print("3. View students by house")
+            print("4. Exit")
+
+            student_choice = input("Enter your choice (1-4): ")
+            if student_choice == "1":
+                all_students()
+            elif student_choice == "2":
+                student_by_year()
+            elif student_choice == "3":
+                student_by_house()
+            elif student_choice == "4":
+                print("Exiting student list.")
+                break
+            else:
+                print("Invalid choice. Please try again.")
+                student_list()
+    except Exception as e:
+        print("An error occurred while accessing the student sorting menu. Please check the hogwarts_error_log file for more information.")
+        l.log_error("Failed to access student sorting menu", details={"Exception": str(e)})
+
+def admin_list():
+    # --- Lists all admins/teachers ---
+    try:
+        print_pages(r.admins, "List of all admins:", "No admins found.", admin_row_format)
+    except Exception as e:
+        print("An error occurred while accessing admin data. Please check the hogwarts_error_log file for more information.")
+        l.log_error("Failed to access admin list", details={"Exception": str(e)})
+
+def course_list():
+    # --- Lists all courses ---
+    try:
+        print_pages(r.courses, "List of all courses:", "No courses found.", course_row_format)
+    except Exception as e:
+        print("An error occurred while accessing course data. Please check the hogwarts_error_log file for more information.")
+        l.log_error("Failed to access course list", details={"Exception": str(e)})
+
+def _delete_by_name(repository, label, name):
+    # --- Deletes the record with this name; when several share it, lists them and asks which to delete ---
+    matches = list(repository.find_by_name(name))
+    if not matches:
+        print(f"No {label} found with the name '{name}'.")
+        return
+    if len(matches) == 1:
+        confirm = input(f"Are you sure you want to delete {label} '{name}'? (Y/N): ").strip().lower()
+        if confirm == 'y':
+            repository.delete(name)
+            print(f"{label.capitalize()} '{name}' deleted successfully!")
+        else:
+            print("Deletion cancelled.")
+        return
+
+    print(f"{len(matches)} {label} records are named '{name}':")
+    for record in matches:
+        print("  " + ", ".join(f"{field}: {value}" for field, value in record._asdict().items()))
+    choice = input(f"Enter 'all' to delete all {len(matches)}, the {repository.key}s to delete (comma-separated), "
+                   "or nothing to cancel: ").strip().lower()
+    if choice == "all":
+        deleted = repository.delete(name)
+    elif choice:
+        try:
+            chosen = set(_parse_ids(choice))
+        except ValueError:
+            print(f"{repository.key}s must be whole numbers. Deletion cancelled.")
+            return
+        # --- Only IDs from the list above, so a typo can't delete someone with a different name ---
+        deleted = repository.delete_ids([getattr(record, repository.key) for record in matches
+                                         if getattr(record, repository.key) in chosen])
+    else:
+        print("Deletion cancelled.")
+        return
+    print(f"{deleted} {label} records named '{name}' deleted.")
+
+def delete_record():
+    # --- Allows the user to delete a record from Students, Courses, or HogwartAdmin ---
+    print("Which table would you like to delete from?")
+    print("1. Students")
+    print("2. Courses")
+    print("3. HogwartAdmin")
+    print("4. Students in bulk (by WizardID or house/year/course)")
+    choice = input("Enter the number corresponding to the table: ").strip()
+    try:
+        if choice == "1":
+            # --- Delete student ---
+            name = input("Enter the student's name you want to delete: ").strip()
+            if not name:
+                print("No name entered. Deletion cancelled.")
+                return
+            _delete_by_name(r.students, "student", name)
+
+        elif choice == "2":
+            # --- Delete course ---
+            course_name = input("Enter the course name you want to delete: ").strip()
+            if not course_name:
+                print("No course name entered. Deletion cancelled.")
+                return
+            _delete_by_name(r.courses, "course", course_name)
+
+        elif choice == "3":
+            # --- Delete admin ---
+            name = input("Enter the admin's name you want to delete: ").strip()
+            if not name:
+                print("No admin name entered. Deletion cancelled.")
+                return
+            _delete_by_name(r.admins, "admin", name)
+
+        elif choice == "4":
+            # --- Bulk delete students ---
+            ids = input("Enter the WizardIDs to delete (comma-separated), or leave blank to delete by filter: ").strip()
+            if ids:
+                try:
+                    bulk_delete_students(ids=_parse_ids(ids))
+                except ValueError:
+                    print("WizardIDs must be whole numbers. Deletion cancelled.")
+            else:
+                bulk_delete_students(house=input("House (leave blank for any): ").strip() or None,
+                                     year=input("Year (leave blank for any): ").strip() or None,
+                                     course=input("Enrolled in course (leave blank for any): ").strip() or None)
+        else:
+            print("Invalid choice. No records deleted.")
+    except Exception as e:
+        print("An error occurred while removing data. Please check the hogwarts_error_log file for more information.")
+        l.log_error("Failed to remove data", details={"Exception": str(e)})
+
+def bulk_delete_students(ids=None, house=None, year=None, course=None, dry_run=False, assume_yes=False):
+    # --- Deletes students by WizardID list or by house/year/course in one transaction, after a dry-run count ---
+    # --- Returns the number deleted (or that would be deleted on a dry run), or -1 on error ---
+    try:
+        if ids:
+            described = f"{len(set(ids))} listed WizardIDs"
+            delete = lambda dry: r.students.delete_ids(ids, dry_run=dry)
+        else:
+            filters = {"House": house, "Year": year, "Course": course}
+            if all(value is None for value in filters.values()):
+                print("No IDs or filters given. Deletion cancelled.")
+                return 0
+            described = ", ".join(f"{column} = {value}" for column, value in filters.items() if value is not None)
+            delete = lambda dry: r.students.delete_where(dry_run=dry, **filters)
+
+        matches = delete(True)
+        print(f"{matches} students match {described}.")
+        if dry_run or not matches:
+            return matches
+        if not assume_yes:
+            confirm = input(f"Are you sure you want to delete these {matches} students? (Y/N): ").strip().lower()
+            if confirm != 'y':
+                print("Deletion cancelled.")
+                return 0
+        deleted = delete(False)
+        print(f"{deleted} students deleted.")
+        return deleted
+    except Exception as e:
+        print("An error occurred while bulk deleting students. Please check the hogwarts_error_log file for more information.")
+        l.log_error("Failed to bulk delete students", details={"Exception": str(e)})
+        return -1
+
+def search_records(text=None, tables=None, limit=r.DEFAULT_SEARCH_LIMIT):
+    # --- Prints ranked name matches from each table; returns the number of matches ---
+    try:
+        if text is None:
+            text = input("Enter a name or the start of one to search for: ").strip()
+        if not text:
+            print("No search text entered.")
+            return 0
+        found = 0
+        for table, records in r.search(text, limit=limit, tables=tables).items():
+            if records:
+                heading, row_format = search_sections[table]
+                found += print_rows(records, heading, "", row_format)
+        if not found:
+            print(f"No names matching '{text}'.")
+        return found
+    except Exception as e:
+        print("An error occurred while searching records. Please check the hogwarts_error_log file for more information.")
+        l.log_error("Failed to search records", details={"Exception": str(e)})
+        return 0
+
+def _parse_ids(text):
+    # --- "3, 7 12" -> [3, 7, 12]; raises ValueError on anything else ---
+    return [int(part) for part in text.replace(",", " ").split()]
+
+def enroll_students(unenroll=False):
+    # --- Enrolls (or unenrolls) a list of student IDs in one course ---
+    action = "unenroll" if unenroll else "enroll"
+    try:
+        course_id = input("Enter the course ID: ").strip()
+        course_name = r.courses.name_of(int(course_id)) if course_id.isdigit() else None
+        if course_name is None:
+            print(f"No course found with ID '{course_id}'.")
+            return
+        try:
+            student_ids = _parse_ids(input(f"Enter the student IDs to {action} (comma-separated): "))
+        except ValueError:
+            print("Student IDs must be whole numbers.")
+            return
+        pairs = [(student_id, int(course_id)) for student_id in student_ids]
+        if unenroll:
+            changed = r.enrollments.delete_many(pairs)
+            print(f"{changed} of {len(pairs)} students unenrolled from {course_name}.")
+        else:
+            changed = r.enrollments.add_many(pairs)
+            print(f"{changed} of {len(pairs)} students enrolled in {course_name} (unknown IDs and existing enrollments are skipped).")
+    except Exception as e:
+        print(f"An error occurred while trying to {action} students. Please check the hogwarts_error_log file for more information.")
+        l.log_error(f"Failed to {action} students", details={"Exception": str(e)})
+
+def course_roster():
+    # --- Lists the students in a course, optionally narrowed by house and/or year ---
+    try:
+        course_name = input("Enter the course name: ").strip()
+        house = input("Filter by house (leave blank for all): ").strip() or None
+        year = input("Filter by year (leave blank for all): ").strip() or None
+        print_rows(r.enrollments.roster(course_name, house=house, year=year), f"Students in {course_name}:",
+                   f"No matching students enrolled in {course_name}.", "WizardID: {0}, Name: {1}, House: {2}, Year: {3}")
+    except Exception as e:
+        print("An error occurred while loading the course roster. Please check the hogwarts_error_log file for more information.")
+        l.log_error("Failed to load course roster", details={"Exception": str(e)})
+
+def student_courses():
+    # --- Lists the courses of every student with the given name ---
+    try:
+        name = input("Enter the student's name: ").strip()
+        print_rows(r.enrollments.courses_for(name), f"Courses for {name}:", f"No enrollments found for '{name}'.",
+                   "WizardID: {0}, Name: {1}, CourseID: {2}, CourseName: {3}")
+    except Exception as e:
+        print("An error occurred while loading student courses. Please check the hogwarts_error_log file for more information.")
+        l.log_error("Failed to load student courses", details={"Exception": str(e)})
+
+def teacher_load():
+    # --- Lists every teacher with the number of students enrolled in their course ---
+    try:
+        print_rows(r.enrollments.teacher_load(), "Teacher load:", "No teachers found.",
+                   "WizardID: {0}, Name: {1}, CourseID: {2}, CourseName: {3}, Students: {4}")
+    except Exception as e:
+        print("An error occurred while loading teacher load. Please check the hogwarts_error_log file for more information.")
+        l.log_error("Failed to load teacher load", details={"Exception": str(e)})
+
+def enrollment_menu():
+    # --- Menu for enrollments and roster reports ---
+    try:
+        while True:
+            print("1. Enroll students in a course")
+            print("2. Unenroll students from a course")
+            print("3. View a course roster")
+            print("4. View a student's courses")
+            print("5. View teacher load")
+            print("6. Exit")
+
+            choice = input("Enter your choice (1-6): ")
+            if choice == "1":
+                enroll_students()
+            elif choice == "2":
+                enroll_students(unenroll=True)
+            elif choice == "3":
+                course_roster()
+            elif choice == "4":
+                student_courses()
+            elif choice == "5":
+                teacher_load()
+            elif choice == "6":
+                print("Exiting enrollments.")
+                break
+            else:
+                print("Invalid choice. Please try again.")
+    except Exception as e:
+        print("An error occurred while accessing the enrollment menu. Please check the hogwarts_error_log file for more information.")
+        l.log_error("Failed to access enrollment menu", details={"Exception": str(e)})
+
+def student_dashboard():
+    # --- Prints student counts per house and year from the StudentStats summary table ---
+    try:
+        counts = {(house, year): count for house, year, count in d.student_stats()}
+        years = [int(year) for year in d.VALID_YEARS]
+        print("Student Dashboard")
+        print(f"{'House':<12}" + "".join(f"{'Y' + str(year):>7}" for year in years) + f"{'Total':>8}")
+        for house in d.VALID_HOUSES:
+            row = [counts.get((house, year), 0) for year in years]
+            print(f"{house:<12}" + "".join(f"{count:>7}" for count in row) + f"{sum(row):>8}")
+        totals = [sum(counts.get((house, year), 0) for house in d.VALID_HOUSES) for year in years]
+        print(f"{'Total':<12}" + "".join(f"{count:>7}" for count in totals) + f"{d.student_total():>8}")
+    except Exception as e:
+        print("An error occurred while loading the student dashboard. Please check the hogwarts_error_log file for more information.")
+        l.log_error("Failed to load student dashboard", details={"Exception": str(e)})
+
+def check_stats(rebuild=False):
+    # --- Verifies StudentStats against Students and optionally rebuilds it; returns the number of mismatches ---
+    try:
+        mismatches = d.check_student_stats()
+        for house, year, stored, actual in mismatches:
+            print(f"Mismatch: {house} Year {year}: stored {stored}, actual {actual}")
+        if not mismatches:
+            print("StudentStats matches the Students table.")
+        if rebuild:
+            d.rebuild_student_stats()
+            l.log_event("Student Stats Rebuilt!", {"Mismatches": len(mismatches)})
+            print("StudentStats rebuilt from the Students table.")
+        return len(mismatches)
+    except Exception as e:
+        print("An error occurred while checking student statistics. Please check the hogwarts_error_log file for more information.")
+        l.log_error("Failed to check student statistics", details={"Exception": str(e)})
+        return -1
+
+def query_plan_report():
+    # --- Prints the plan for each predefined query and flags any filter that still scans a table ---
+    # --- Returns the number of flagged queries ---
+    flagged = 0
+    try:
+        for name, plan, flag in d.explain_queries():
+            status = "FULL SCAN" if flag else ("scan (expected)" if name in d.full_scan_expected else "ok")
+            print(f"{name:<28} {status:<16} {' | '.join(plan)}")
+            flagged += flag
+        if flagged:
+            print(f"{flagged} queries still scan a whole table. Run with indexes created (ensure_indexes) and check the plans above.")
+        else:
+            print("All filter and delete queries use an index.")
+    except Exception as e:
+        print("An error occurred while checking query plans. Please check the hogwarts_error_log file for more information.")
+        l.log_error("Failed to check query plans", details={"Exception": str(e)})
+        return -1
+    return flagged